@@ -1,16 +1,22 @@
 import json
 import logging
+import operator
 import re
-from collections.abc import Collection, Iterable
+from collections import defaultdict
+from collections.abc import Collection, Iterable, Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
 from datetime import time as datetime_time
+from functools import reduce
+from itertools import batched
+from time import perf_counter
 from typing import Any, NotRequired
 
 from django.conf import settings
 from django.core.mail import EmailMultiAlternatives
-from django.db import transaction
-from django.db.models import Min
+from django.db import connection, transaction
+from django.db.models import Q
 from django.utils.timezone import now
 from pydantic import TypeAdapter
 from typing_extensions import TypedDict
@@ -30,8 +36,11 @@ from evap.evaluation.models import (
     Semester,
     UserProfile,
 )
+from evap.evaluation.models_logging import FieldActionType, LoggedModel
 from evap.evaluation.tools import clean_email
-from evap.staff.tools import update_or_create_with_changes, update_with_changes
+from evap.results.tools import update_grade_summary_counts
+from evap.rewards.tools import grant_reward_points_after_participation_removal
+from evap.staff.tools import update_with_changes
 
 logger = logging.getLogger(__name__)
 
@@ -95,6 +104,119 @@ class ImportDict(TypedDict):
 
 
 import_dict_adapter = TypeAdapter(ImportDict)
+import_student_adapter = TypeAdapter(ImportStudent)
+import_lecturer_adapter = TypeAdapter(ImportLecturer)
+import_event_adapter = TypeAdapter(ImportEvent)
+
+
+class _JSONStreamReader:
+    """Decodes a JSON document from text chunks, keeping only the not yet decoded part in memory."""
+
+    WHITESPACE = " \t\n\r"
+    DELIMITERS = WHITESPACE + ",:]}"
+
+    def __init__(self, chunks: Iterable[str]) -> None:
+        self.chunks = iter(chunks)
+        self.buffer = ""
+        self.position = 0
+        self.decoder = json.JSONDecoder()
+
+    def _read_chunk(self) -> bool:
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            return False
+        self.buffer = self.buffer[self.position :] + chunk
+        self.position = 0
+        return True
+
+    def _skip_whitespace(self) -> bool:
+        """Skip whitespace and return whether there is more data."""
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in self.WHITESPACE:
+                self.position += 1
+            if self.position < len(self.buffer):
+                return True
+            if not self._read_chunk():
+                return False
+
+    def peek(self) -> str:
+        if not self._skip_whitespace():
+            raise ValueError("Unexpected end of JSON data")
+        return self.buffer[self.position]
+
+    def expect(self, character: str) -> None:
+        if self.peek() != character:
+            raise ValueError(f"Expected '{character}' in JSON data, found '{self.buffer[self.position]}'")
+        self.position += 1
+
+    def decode_value(self) -> Any:
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if not self._read_chunk():
+                    raise
+                continue
+            # numbers and literals are only complete if they are followed by a delimiter, e.g. "1.5" split into "1." and "5"
+            if (
+                not isinstance(value, dict | list | str)
+                and (end == len(self.buffer) or self.buffer[end] not in self.DELIMITERS)
+                and self._read_chunk()
+            ):
+                continue
+            self.position = end
+            return value
+
+    def is_at_end(self) -> bool:
+        return not self._skip_whitespace()
+
+
+def iter_json_array_sections(chunks: Iterable[str]) -> Iterator[tuple[str, Iterator[Any]]]:
+    """
+    Parses a JSON object from text chunks and yields the keys of its array values together with an iterator over the
+    array elements, which are decoded one at a time. Each iterator must be used before the next section is requested.
+    Values that are not arrays are skipped.
+    """
+    reader = _JSONStreamReader(chunks)
+
+    def iter_array() -> Iterator[Any]:
+        reader.expect("[")
+        if reader.peek() == "]":
+            reader.position += 1
+            return
+        while True:
+            yield reader.decode_value()
+            separator = reader.peek()
+            reader.position += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON array, found '{separator}'")
+
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.position += 1
+    else:
+        while True:
+            key = reader.decode_value()
+            reader.expect(":")
+            if reader.peek() == "[":
+                items = iter_array()
+                yield key, items
+                # skip the elements that were not used
+                for __ in items:
+                    pass
+            else:
+                reader.decode_value()
+
+            if reader.peek() == "}":
+                reader.position += 1
+                break
+            reader.expect(",")
+
+    if not reader.is_at_end():
+        raise ValueError("Unexpected data after the end of the JSON object")
 
 
 @dataclass
@@ -126,6 +248,8 @@ class ImportStatistics:
     attempted_evaluation_changes: list[Evaluation] = field(default_factory=list)
     attempted_participant_changes: list[Evaluation] = field(default_factory=list)
     warnings: list[WarningMessage] = field(default_factory=list)
+    query_count: int = 0
+    phase_durations: dict[str, float] = field(default_factory=dict)
 
     @staticmethod
     def _make_heading(heading: str, separator: str = "-") -> str:
@@ -167,6 +291,12 @@ class ImportStatistics:
         log += self._make_total(len(self.warnings))
         for warning in self.warnings:
             log += f"- {warning.obj}: {warning.message}\n"
+        log += "\n"
+
+        log += self._make_heading("Performance")
+        log += f"{self.query_count} database queries\n"
+        for phase, duration in self.phase_durations.items():
+            log += f"- {phase}: {duration:.2f} seconds\n"
 
         return log
 
@@ -232,6 +362,7 @@ class ImportCache[T: (CourseType, ExamType, Program)]:
 class JSONImporter:
     DATETIME_FORMAT = "%d.%m.%Y %H:%M:%S"
     MIDNIGHT = datetime_time()
+    BULK_BATCH_SIZE = 1000
 
     def __init__(self, semester: Semester, default_course_end: date) -> None:
         self.semester = semester
@@ -247,6 +378,20 @@ class JSONImporter:
         # events already parsed as courses
         self.courses_by_gguid: dict[str, Course] = {}
 
+        # indexes of the existing data that is relevant for the imported events, see _load_indexes
+        self.course_links_by_cms_id: dict[str, CourseLink] = {}
+        self.ignored_cms_ids: set[str] = set()
+        self.inactive_evaluation_cms_ids: set[str] = set()
+        self.evaluations_by_cms_id: dict[str, Evaluation] = {}
+        self.cms_ids_by_evaluation_id: defaultdict[int, list[str]] = defaultdict(list)
+        self.evaluations_by_course_id: defaultdict[int, list[Evaluation]] = defaultdict(list)
+        self.program_ids_by_course_id: defaultdict[int, set[int]] = defaultdict(set)
+        self.participant_ids_by_evaluation_id: defaultdict[int, set[int]] = defaultdict(set)
+        self.contributor_ids_by_evaluation_id: defaultdict[int, set[int]] = defaultdict(set)
+        self.unused_exam_course_types: dict[str, CourseType | None] = {}
+        # evaluations with changed participants and their participant ids before the import, see _update_participants
+        self.participant_changes: dict[int, tuple[Evaluation, set[int]]] = {}
+
     def get_main_evaluation_data(self, exam_event: ImportEvent) -> ImportEvent:
         # Exam events have the non-exam event (its main evaluation) as a single entry in the relatedevents list
 
@@ -309,7 +454,45 @@ class JSONImporter:
         )
         self.statistics.name_changes.append(change)
 
+    def _import_user_profiles(self, entries: list[tuple[str, str, dict[str, str]]]) -> None:
+        """
+        Creates or updates the user profiles of the (gguid, email, fields) entries. All existing profiles are loaded
+        in one query, compared in memory and written with bulk operations.
+        """
+        user_profiles_by_email = {
+            user_profile.email: user_profile
+            for user_profile in UserProfile.objects.filter(email__in={email for __, email, __ in entries})
+        }
+        new_user_profiles: list[UserProfile] = []
+        changed_user_profiles: dict[int, UserProfile] = {}
+        changed_fields: set[str] = set()
+
+        for gguid, email, fields in entries:
+            user_profile = user_profiles_by_email.get(email)
+            if user_profile is None:
+                user_profile = UserProfile(email=email, **fields)
+                user_profiles_by_email[email] = user_profile
+                new_user_profiles.append(user_profile)
+            else:
+                changes = update_with_changes(user_profile, fields, dry_run=True)
+                if changes:
+                    for field_name, (__, new_value) in changes.items():
+                        setattr(user_profile, field_name, new_value)
+                    changed_fields.update(changes)
+                    if user_profile.pk is not None:
+                        changed_user_profiles[user_profile.pk] = user_profile
+                    self._create_name_change_from_changes(user_profile, changes)
+
+            self.users_by_gguid[gguid] = user_profile
+
+        UserProfile.objects.bulk_create(new_user_profiles, batch_size=self.BULK_BATCH_SIZE)
+        if changed_user_profiles:
+            UserProfile.objects.bulk_update(
+                changed_user_profiles.values(), sorted(changed_fields), batch_size=self.BULK_BATCH_SIZE
+            )
+
     def _import_students(self, data: list[ImportStudent]) -> None:
+        entries = []
         for entry in data:
             email = clean_email(entry["email"])
             first_name_given = _clean_whitespaces_and_hyphens(self._get_first_name_given(entry))
@@ -318,21 +501,13 @@ class JSONImporter:
                 self.statistics.warnings.append(
                     WarningMessage(obj=f"Student {first_name_given} {last_name}", message="No email defined")
                 )
-            else:
-                if email in settings.IGNORE_USERS:
-                    continue
-
-                user_profile, __, changes = update_or_create_with_changes(
-                    UserProfile,
-                    email=email,
-                    defaults={"last_name": last_name, "first_name_given": first_name_given},
-                )
-                if changes:
-                    self._create_name_change_from_changes(user_profile, changes)
+            elif email not in settings.IGNORE_USERS:
+                entries.append((entry["gguid"], email, {"last_name": last_name, "first_name_given": first_name_given}))
 
-                self.users_by_gguid[entry["gguid"]] = user_profile
+        self._import_user_profiles(entries)
 
     def _import_lecturers(self, data: list[ImportLecturer]) -> None:
+        entries = []
         for entry in data:
             email = clean_email(entry["email"])
             first_name_given = _clean_whitespaces_and_hyphens(entry["christianname"])
@@ -344,23 +519,60 @@ class JSONImporter:
                         message="No email defined",
                     )
                 )
-            else:
-                if email in settings.IGNORE_USERS:
-                    continue
-
-                user_profile, __, changes = update_or_create_with_changes(
-                    UserProfile,
-                    email=email,
-                    defaults={
-                        "last_name": last_name,
-                        "first_name_given": first_name_given,
-                        "title": _clean_whitespaces_and_hyphens(entry["titlefront"]),
-                    },
-                )
-                if changes:
-                    self._create_name_change_from_changes(user_profile, changes)
+            elif email not in settings.IGNORE_USERS:
+                fields = {
+                    "last_name": last_name,
+                    "first_name_given": first_name_given,
+                    "title": _clean_whitespaces_and_hyphens(entry["titlefront"]),
+                }
+                entries.append((entry["gguid"], email, fields))
+
+        self._import_user_profiles(entries)
+
+    def _load_indexes(self, events: list[ImportEvent]) -> None:
+        """
+        Loads the links, ignored evaluations, evaluations, programs, participants and contributors that the import of
+        the events refers to, so that the import itself only needs to query the database for changes.
+        """
+        cms_ids = [event["gguid"] for event in events]
+        self.ignored_cms_ids = set(
+            IgnoredEvaluation.objects.filter(cms_id__in=cms_ids).values_list("cms_id", flat=True)
+        )
 
-                self.users_by_gguid[entry["gguid"]] = user_profile
+        course_links = CourseLink.objects.filter(cms_id__in=cms_ids).select_related("course")
+        self.course_links_by_cms_id = {course_link.cms_id: course_link for course_link in course_links}
+        courses_by_id = {course_link.course_id: course_link.course for course_link in course_links}
+
+        # evaluations might have been moved to courses that are not linked to an event
+        courses = Course.objects.filter(
+            Q(pk__in=CourseLink.objects.filter(cms_id__in=cms_ids).values("course"))
+            | Q(pk__in=EvaluationLink.objects.filter(cms_id__in=cms_ids).values("evaluation__course"))
+        )
+        evaluations_by_id = {}
+        for evaluation in Evaluation.objects.filter(course__in=courses).select_related("course").order_by("pk"):
+            evaluation.course = courses_by_id.setdefault(evaluation.course_id, evaluation.course)
+            evaluations_by_id[evaluation.pk] = evaluation
+            self.evaluations_by_course_id[evaluation.course_id].append(evaluation)
+
+        evaluation_links = EvaluationLink.objects.filter(evaluation__course__in=courses).order_by("pk")
+        for cms_id, evaluation_id, is_active in evaluation_links.values_list("cms_id", "evaluation_id", "is_active"):
+            self.evaluations_by_cms_id[cms_id] = evaluations_by_id[evaluation_id]
+            self.cms_ids_by_evaluation_id[evaluation_id].append(cms_id)
+            if not is_active:
+                self.inactive_evaluation_cms_ids.add(cms_id)
+
+        for course_id, program_id in Course.programs.through.objects.filter(course__in=courses).values_list(
+            "course_id", "program_id"
+        ):
+            self.program_ids_by_course_id[course_id].add(program_id)
+        for evaluation_id, user_profile_id in Evaluation.participants.through.objects.filter(
+            evaluation__course__in=courses
+        ).values_list("evaluation_id", "userprofile_id"):
+            self.participant_ids_by_evaluation_id[evaluation_id].add(user_profile_id)
+        for evaluation_id, contributor_id in Contribution.objects.filter(
+            evaluation__course__in=courses, contributor__isnull=False
+        ).values_list("evaluation_id", "contributor_id"):
+            self.contributor_ids_by_evaluation_id[evaluation_id].add(contributor_id)
 
     def _import_course(self, data: ImportEvent, course_type: CourseType | None = None) -> Course | None:
         course_type = self.course_type_cache.get(data["type"]) if course_type is None else course_type
@@ -377,8 +589,8 @@ class JSONImporter:
         if not data["title_en"]:
             data["title_en"] = data["title"]
 
-        try:
-            cms_course_link = CourseLink.objects.get(cms_id=data["gguid"])
+        cms_course_link = self.course_links_by_cms_id.get(data["gguid"])
+        if cms_course_link is not None:
             if not cms_course_link.is_active:
                 return None
 
@@ -392,7 +604,7 @@ class JSONImporter:
             )
             if changes:
                 self.statistics.updated_courses.append(course)
-        except CourseLink.DoesNotExist:
+        else:
             course = Course.objects.create(
                 semester=self.semester,
                 name_de=_clean_whitespaces_and_hyphens(data["title"]),
@@ -405,7 +617,7 @@ class JSONImporter:
             responsibles = self._get_users_with_longest_title(responsibles)
             course.responsibles.set(responsibles)
 
-            CourseLink.objects.create(course=course, cms_id=data["gguid"])
+            self.course_links_by_cms_id[data["gguid"]] = CourseLink.objects.create(course=course, cms_id=data["gguid"])
             self.statistics.new_courses.append(course)
 
         self.courses_by_gguid[data["gguid"]] = course
@@ -424,12 +636,21 @@ class JSONImporter:
 
             programs = [self.program_cache.get(c) for c in program_import_names]
 
-            course.programs.add(*programs)
+            program_ids = self.program_ids_by_course_id[course.pk]
+            new_programs = [program for program in programs if program.pk not in program_ids]
+            if new_programs:
+                course.programs.add(*new_programs)
+                program_ids.update(program.pk for program in new_programs)
 
     def _import_course_from_unused_exam(self, data: ImportEvent) -> Course | None:
-        try:
-            course_type = CourseType.objects.get(import_names__contains=[data["type"]])
-        except CourseType.DoesNotExist:
+        if data["type"] not in self.unused_exam_course_types:
+            try:
+                course_type = CourseType.objects.get(import_names__contains=[data["type"]])
+            except CourseType.DoesNotExist:
+                course_type = None
+            self.unused_exam_course_types[data["type"]] = course_type
+        course_type = self.unused_exam_course_types[data["type"]]
+        if course_type is None:
             return None
 
         return self._import_course(data, course_type)
@@ -439,20 +660,19 @@ class JSONImporter:
         self, cms_course: Course, data: ImportEvent, earliest_exam_date: date | None = None
     ) -> Evaluation | None:
         # Don't import ignored evaluations again
-        if IgnoredEvaluation.objects.filter(cms_id=data["gguid"]).exists():
+        if data["gguid"] in self.ignored_cms_ids:
             return None
 
         # Skip evaluations with inactive link
-        if EvaluationLink.objects.filter(cms_id=data["gguid"], is_active=False).exists():
+        if data["gguid"] in self.inactive_evaluation_cms_ids:
             return None
 
         course = cms_course  # by default, we use the course listed in the cms as the evaluation's course
-        try:
-            evaluation = Evaluation.objects.get(cms_evaluation_links__cms_id=data["gguid"])
+        evaluation = self.evaluations_by_cms_id.get(data["gguid"])
+        if evaluation is not None:
             # if the evaluation already exists, we use its course in case it was merged into a different course
             course = evaluation.course
-        except Evaluation.DoesNotExist:
-            evaluation = None
+        course_evaluations = self.evaluations_by_course_id[course.pk]
 
         if "appointments" not in data or not data["appointments"]:
             course_info = f"{course.name} ({course.type})"
@@ -482,10 +702,10 @@ class JSONImporter:
                 name_de = data["title"].split(" - ")[-1] if " - " in data["title"] else exam_type.name_de
                 name_en = data["title_en"].split(" - ")[-1] if " - " in data["title_en"] else exam_type.name_en
                 name_de = self._disambiguate_name(
-                    _clean_whitespaces_and_hyphens(name_de), course.evaluations.values_list("name_de", flat=True)
+                    _clean_whitespaces_and_hyphens(name_de), [other.name_de for other in course_evaluations]
                 )
                 name_en = self._disambiguate_name(
-                    _clean_whitespaces_and_hyphens(name_en), course.evaluations.values_list("name_en", flat=True)
+                    _clean_whitespaces_and_hyphens(name_en), [other.name_en for other in course_evaluations]
                 )
 
             weight = settings.EXAM_EVALUATION_DEFAULT_WEIGHT
@@ -497,12 +717,17 @@ class JSONImporter:
             else:
                 wait_for_grade_upload_before_publishing = any(grade["scale"] for grade in data["courses"])
 
-            if course.evaluations.exclude(
-                wait_for_grade_upload_before_publishing=wait_for_grade_upload_before_publishing
-            ).exists():
+            if any(
+                other.wait_for_grade_upload_before_publishing != wait_for_grade_upload_before_publishing
+                for other in course_evaluations
+            ):
                 course.evaluations.all().update(
                     wait_for_grade_upload_before_publishing=wait_for_grade_upload_before_publishing
                 )
+                # the change of this evaluation itself is tracked below
+                for other in course_evaluations:
+                    if other is not evaluation:
+                        other.wait_for_grade_upload_before_publishing = wait_for_grade_upload_before_publishing
 
             is_rewarded = False
         else:
@@ -562,10 +787,9 @@ class JSONImporter:
             )
 
         # Collect participants from all linked evaluations
-        if evaluation and evaluation.cms_evaluation_links.count() > 1:
-            cms_ids = [cms_evaluation_link.cms_id for cms_evaluation_link in evaluation.cms_evaluation_links.all()]
+        if evaluation and len(self.cms_ids_by_evaluation_id[evaluation.pk]) > 1:
             student_data = []
-            for cms_id in cms_ids:
+            for cms_id in self.cms_ids_by_evaluation_id[evaluation.pk]:
                 event = self.events_by_gguid[cms_id]
                 if "students" in event:
                     student_data.extend(event["students"])
@@ -593,11 +817,14 @@ class JSONImporter:
                 **defaults,
             )
             EvaluationLink.objects.create(evaluation=evaluation, cms_id=data["gguid"])
+            self.evaluations_by_cms_id[data["gguid"]] = evaluation
+            self.cms_ids_by_evaluation_id[evaluation.pk].append(data["gguid"])
+            course_evaluations.append(evaluation)
 
         # Only allow changes for new evaluations and if they have not more than one evaluation link
         # Otherwise, data may already have been changed or be ambiguous
         allow_evaluation_changes = (
-            evaluation.state == Evaluation.State.NEW and evaluation.cms_evaluation_links.count() == 1
+            evaluation.state == Evaluation.State.NEW and len(self.cms_ids_by_evaluation_id[evaluation.pk]) == 1
         )
         direct_changes = update_with_changes(evaluation, defaults, dry_run=not allow_evaluation_changes)
         assert not direct_changes or not created
@@ -608,9 +835,13 @@ class JSONImporter:
 
         # Only allow participant changes for evaluations that have not yet started
         allow_participant_changes = evaluation.state < Evaluation.State.IN_EVALUATION
-        participant_changes = set(evaluation.participants.all()) != set(participants)
+        participant_ids = {participant.pk for participant in participants}
+        participant_changes = self.participant_ids_by_evaluation_id[evaluation.pk] != participant_ids
         if participant_changes and allow_participant_changes:
-            evaluation.participants.set(participants)
+            self.participant_changes.setdefault(
+                evaluation.pk, (evaluation, self.participant_ids_by_evaluation_id[evaluation.pk])
+            )
+            self.participant_ids_by_evaluation_id[evaluation.pk] = participant_ids
             self.statistics.updated_participants.append(evaluation)
         elif participant_changes:
             self.statistics.attempted_participant_changes.append(evaluation)
@@ -618,15 +849,14 @@ class JSONImporter:
         # Only allow changes for new evaluations and if they have not more than one evaluation link
         # Otherwise, data may already have been changed or be ambiguous
         allow_contributor_changes = (
-            evaluation.state == Evaluation.State.NEW and evaluation.cms_evaluation_links.count() == 1
+            evaluation.state == Evaluation.State.NEW and len(self.cms_ids_by_evaluation_id[evaluation.pk]) == 1
         )
         any_lecturers_changed = False
         if allow_contributor_changes and "lecturers" not in data:
             self.statistics.warnings.append(WarningMessage(obj=evaluation.full_name, message="No contributors defined"))
         elif allow_contributor_changes:
             for lecturer in data["lecturers"]:
-                __, lecturer_created = self._import_contribution(evaluation, lecturer)
-                any_lecturers_changed |= lecturer_created
+                any_lecturers_changed |= self._import_contribution(evaluation, lecturer)
         if any_lecturers_changed and not created:
             self.statistics.updated_evaluations.add(evaluation)
 
@@ -635,24 +865,28 @@ class JSONImporter:
 
         return evaluation
 
-    def _import_contribution(self, evaluation: Evaluation, data: ImportRelated) -> tuple[Contribution | None, bool]:
+    def _import_contribution(self, evaluation: Evaluation, data: ImportRelated) -> bool:
+        """Creates the contribution of the lecturer if it does not exist yet and returns whether it was created."""
         if data["gguid"] not in self.users_by_gguid:
-            return None, False
+            return False
 
         user_profile = self.users_by_gguid[data["gguid"]]
 
         if user_profile.email in settings.NON_RESPONSIBLE_USERS:
-            return None, False
+            return False
 
-        contribution, created = Contribution.objects.get_or_create(
+        contributor_ids = self.contributor_ids_by_evaluation_id[evaluation.pk]
+        if user_profile.pk in contributor_ids:
+            return False
+
+        Contribution.objects.create(
             evaluation=evaluation,
             contributor=user_profile,
-            defaults={
-                "role": Contribution.Role.EDITOR,
-                "textanswer_visibility": Contribution.TextAnswerVisibility.GENERAL_TEXTANSWERS,
-            },
+            role=Contribution.Role.EDITOR,
+            textanswer_visibility=Contribution.TextAnswerVisibility.GENERAL_TEXTANSWERS,
         )
-        return contribution, created
+        contributor_ids.add(user_profile.pk)
+        return True
 
     def _import_events(self, data: list[ImportEvent]) -> None:  # noqa:PLR0912
         # Divide in multiple lists to handle individually
@@ -685,9 +919,14 @@ class JSONImporter:
         for event in non_exam_events:
             course = self.courses_by_gguid.get(event["gguid"])
             if course is not None:
-                min_vote_start_datetime = course.evaluations.filter(exam_type__isnull=False).aggregate(
-                    Min("vote_start_datetime")
-                )["vote_start_datetime__min"]
+                min_vote_start_datetime = min(
+                    (
+                        evaluation.vote_start_datetime
+                        for evaluation in self.evaluations_by_course_id[course.pk]
+                        if evaluation.exam_type_id is not None
+                    ),
+                    default=None,
+                )
                 earliest_exam_date = (
                     min_vote_start_datetime.date() - timedelta(days=1) if min_vote_start_datetime else None
                 )
@@ -707,14 +946,115 @@ class JSONImporter:
             self._import_course_programs(course_from_unused_exam, event)
             self._import_evaluation(course_from_unused_exam, event)
 
+    def _update_participants(self) -> None:
+        """
+        Writes the participant changes of all evaluations to the through table with bulk operations. As this bypasses
+        the m2m_changed signals, the log entries, reward points and grade summaries are updated here.
+        """
+        through_model = Evaluation.participants.through
+        additions = []
+        removals = []
+        log_changes = []
+        removed_user_ids_by_semester_id: defaultdict[int, set[int]] = defaultdict(set)
+        for evaluation, old_participant_ids in self.participant_changes.values():
+            new_participant_ids = self.participant_ids_by_evaluation_id[evaluation.pk]
+            added_ids = new_participant_ids - old_participant_ids
+            removed_ids = old_participant_ids - new_participant_ids
+
+            additions += [through_model(evaluation=evaluation, userprofile_id=user_id) for user_id in added_ids]
+            if removed_ids:
+                removals.append(Q(evaluation=evaluation, userprofile_id__in=removed_ids))
+                removed_user_ids_by_semester_id[evaluation.course.semester_id].update(removed_ids)
+            log_changes += [
+                (evaluation, FieldActionType.M2M_REMOVE, sorted(removed_ids)),
+                (evaluation, FieldActionType.M2M_ADD, sorted(added_ids)),
+            ]
+
+        if removals:
+            through_model.objects.filter(reduce(operator.or_, removals)).delete()
+        through_model.objects.bulk_create(additions, batch_size=self.BULK_BATCH_SIZE)
+        LoggedModel.update_log_after_m2m_bulk_changes("participants", log_changes)
+        update_grade_summary_counts(
+            evaluation.pk
+            for evaluation, old_participant_ids in self.participant_changes.values()
+            if old_participant_ids != self.participant_ids_by_evaluation_id[evaluation.pk]
+        )
+
+        semesters = Semester.objects.in_bulk(list(removed_user_ids_by_semester_id))
+        grant_reward_points_after_participation_removal(
+            {semesters[semester_id]: user_ids for semester_id, user_ids in removed_user_ids_by_semester_id.items()}
+        )
+
+    def _count_query(self, execute, sql, params, many, context):
+        self.statistics.query_count += 1
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def _phase(self, name: str) -> Iterator[None]:
+        start = perf_counter()
+        yield
+        self.statistics.phase_durations[name] = perf_counter() - start
+
+    def _import_events_and_participants(self, events: list[ImportEvent]) -> None:
+        with self._phase("Indexes"):
+            self._load_indexes(events)
+        with self._phase("Events"):
+            self._import_events(events)
+        with self._phase("Participants"):
+            self._update_participants()
+
     @transaction.atomic
     def import_dict(self, data: dict) -> None:
         validated_data = import_dict_adapter.validate_python(data, strict=True)
 
-        self._import_students(validated_data["students"])
-        self._import_lecturers(validated_data["lecturers"])
-        self._import_events(validated_data["events"])
+        with connection.execute_wrapper(self._count_query):
+            with self._phase("Students"):
+                self._import_students(validated_data["students"])
+            with self._phase("Lecturers"):
+                self._import_lecturers(validated_data["lecturers"])
+            self._import_events_and_participants(validated_data["events"])
         self.statistics.send_mail()
 
     def import_json(self, data: str) -> None:
         self.import_dict(json.loads(data))
+
+    @transaction.atomic
+    def import_stream(self, chunks: Iterable[str]) -> None:
+        """
+        Like import_json, but parses the data while reading it, so that only the events have to be held in memory.
+        Students and lecturers are validated and imported in batches, the events once all users are imported.
+        If the data is invalid, the import is rolled back.
+        """
+        lecturers: list[ImportLecturer] = []
+        events: list[ImportEvent] = []
+        sections = set()
+
+        with connection.execute_wrapper(self._count_query):
+            for key, items in iter_json_array_sections(chunks):
+                sections.add(key)
+                match key:
+                    case "students":
+                        with self._phase("Students"):
+                            for batch in batched(items, self.BULK_BATCH_SIZE, strict=False):
+                                self._import_students(
+                                    [import_student_adapter.validate_python(item, strict=True) for item in batch]
+                                )
+                    case "lecturers":
+                        lecturers.extend(import_lecturer_adapter.validate_python(item, strict=True) for item in items)
+                        # as in import_dict, lecturers are imported after students, whose data they take precedence over
+                        if "students" in sections:
+                            with self._phase("Lecturers"):
+                                self._import_lecturers(lecturers)
+                            lecturers = []
+                    case "events":
+                        events.extend(import_event_adapter.validate_python(item, strict=True) for item in items)
+
+            missing_sections = {"students", "lecturers", "events"} - sections
+            if missing_sections:
+                raise ValueError(f"Missing sections in import data: {', '.join(sorted(missing_sections))}")
+            if lecturers:
+                with self._phase("Lecturers"):
+                    self._import_lecturers(lecturers)
+
+            self._import_events_and_participants(events)
+        self.statistics.send_mail()
@@ -1,8 +1,13 @@
 import argparse
 import logging
+import tempfile
+import time
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 from pathlib import Path
+from typing import TextIO
 
 import requests
 from django.core.management.base import BaseCommand, CommandError
@@ -10,6 +15,7 @@ from django.core.management.base import BaseCommand, CommandError
 from evap.cms.json_importer import JSONImporter
 from evap.evaluation.management.commands.tools import log_exceptions
 from evap.evaluation.models import Semester
+from evap.evaluation.tools import STREAMING_CHUNK_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -21,30 +27,66 @@ def parse_course_end_date(date_str) -> datetime:
     return datetime.strptime(date_str, "%Y-%m-%d")
 
 
+def download_to_file(url: str, path: Path) -> float | None:
+    """Streams the response to path and returns the duration of the download, or None if the download failed."""
+    start = time.perf_counter()
+    for _ in range(RETRIES):
+        try:
+            with requests.get(url, timeout=TIMEOUT, stream=True) as response:
+                response.raise_for_status()
+                with open(path, "wb") as file:
+                    for chunk in response.iter_content(STREAMING_CHUNK_SIZE):
+                        file.write(chunk)
+            return time.perf_counter() - start
+        except requests.exceptions.HTTPError as error:
+            logger.warning("Download failed: %s", error)
+            return None
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            # a timeout while reading the streamed body surfaces as a ConnectionError
+            logger.warning("Download timed out: %s", url)
+    logger.warning("Giving up.")
+    return None
+
+
 @log_exceptions
 class Command(BaseCommand):
     def add_arguments(self, parser: argparse.ArgumentParser):
         mode = parser.add_subparsers(help="import mode", required=True, dest="mode")
+        stream_help = "Parse and import the data while reading it instead of loading it into memory first."
 
         download_mode = mode.add_parser("download")
         download_mode.add_argument("url", type=str)
+        download_mode.add_argument("--stream", action="store_true", help=stream_help)
+        download_mode.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            help=(
+                "Download the data of up to this many semesters at the same time into temporary files. "
+                "Each semester is imported in its own transaction once its download has finished."
+            ),
+        )
 
         file_mode = mode.add_parser("file")
         file_mode.add_argument("path-to-json", type=Path)
         file_mode.add_argument("--semester-id", type=int, required=True)
         file_mode.add_argument("--default-course-end-date", type=parse_course_end_date, default=argparse.SUPPRESS)
+        file_mode.add_argument("--stream", action="store_true", help=stream_help)
 
     def handle(self, *args, **options):
         logger.info("import_cms_data called.")
 
         match options["mode"]:
+            case "download" if options["concurrency"] > 1:
+                self.download_and_import_concurrently(options["url"], options["concurrency"], options["stream"])
             case "download":
+                request_options = {"stream": True} if options["stream"] else {}
                 for semester in Semester.objects.exclude(default_course_end_date__isnull=True).exclude(cms_name=""):
                     logger.info("Downloading data for %s.", semester.name_en)
                     url = options["url"].format(urllib.parse.quote(semester.cms_name))
                     for _ in range(RETRIES):
                         try:
-                            json_contents = requests.get(url, timeout=TIMEOUT).text
+                            response = requests.get(url, timeout=TIMEOUT, **request_options)
                             break
                         except requests.exceptions.Timeout:
                             logger.warning("Download timed out: %s", url)
@@ -53,7 +95,14 @@ class Command(BaseCommand):
                         continue
 
                     logger.info("Importing downloaded data for %s.", semester.name_en)
-                    JSONImporter(semester, semester.default_course_end_date).import_json(json_contents)
+                    importer = JSONImporter(semester, semester.default_course_end_date)
+                    if options["stream"]:
+                        # JSON is UTF-8 encoded unless the server says otherwise
+                        response.encoding = response.encoding or "utf-8"
+                        with response:
+                            importer.import_stream(response.iter_content(STREAMING_CHUNK_SIZE, decode_unicode=True))
+                    else:
+                        importer.import_json(response.text)
                     logger.info("Finished %s.", semester.name_en)
             case "file":
                 try:
@@ -66,5 +115,59 @@ class Command(BaseCommand):
                 if not default_course_end:
                     raise CommandError("Semester has no default course end date, please specify one as an argument.")
                 with open(options["path-to-json"], encoding="utf-8") as file:
-                    JSONImporter(semester, default_course_end).import_json(file.read())
+                    self.import_file(JSONImporter(semester, default_course_end), file, options["stream"])
                 logger.info("Finished %s.", semester.name_en)
+
+    @staticmethod
+    def import_file(importer: JSONImporter, file: TextIO, stream: bool) -> None:
+        if stream:
+            importer.import_stream(iter(partial(file.read, STREAMING_CHUNK_SIZE), ""))
+        else:
+            importer.import_json(file.read())
+
+    def download_and_import_concurrently(self, url_template: str, concurrency: int, stream: bool) -> None:
+        semesters = list(Semester.objects.exclude(default_course_end_date__isnull=True).exclude(cms_name=""))
+        failed_semesters = []
+        with (
+            tempfile.TemporaryDirectory() as temp_dir,
+            ThreadPoolExecutor(max_workers=concurrency) as executor,
+        ):
+            # the threads only download, all database access happens in this thread
+            paths = {semester.pk: Path(temp_dir, f"{semester.pk}.json") for semester in semesters}
+            downloads = {
+                semester.pk: executor.submit(
+                    download_to_file, url_template.format(urllib.parse.quote(semester.cms_name)), paths[semester.pk]
+                )
+                for semester in semesters
+            }
+            logger.info("Downloading data for %d semesters.", len(semesters))
+
+            # semesters are imported in order while the downloads of the later ones continue
+            for semester in semesters:
+                download_duration = downloads[semester.pk].result()
+                if download_duration is None:
+                    failed_semesters.append(semester.name_en)
+                    continue
+
+                logger.info("Importing downloaded data for %s.", semester.name_en)
+                start = time.perf_counter()
+                try:
+                    with open(paths[semester.pk], encoding="utf-8") as file:
+                        self.import_file(JSONImporter(semester, semester.default_course_end_date), file, stream)
+                except Exception:
+                    # the import of each semester is atomic, so the other semesters can still be imported
+                    logger.exception("Importing data for %s failed.", semester.name_en)
+                    failed_semesters.append(semester.name_en)
+                    continue
+                finally:
+                    paths[semester.pk].unlink(missing_ok=True)
+                import_duration = time.perf_counter() - start
+
+                logger.info("Finished %s.", semester.name_en)
+                self.stdout.write(
+                    f"{semester.name_en}: downloaded in {download_duration:.1f} seconds, "
+                    f"imported in {import_duration:.1f} seconds"
+                )
+
+        if failed_semesters:
+            raise CommandError("Importing data failed for: " + ", ".join(failed_semesters))
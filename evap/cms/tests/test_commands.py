@@ -1,16 +1,28 @@
 import os
+import shutil
+import threading
 from datetime import date
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from io import StringIO
+from pathlib import Path
 from tempfile import TemporaryDirectory
 from unittest.mock import patch
 
 from django.core.management import CommandError, call_command
 from model_bakery import baker
 
+import evap.cms.fixtures
+from evap.cms.models import CourseLink
 from evap.evaluation.models import Semester
 from evap.evaluation.tests.tools import TestCase
 
 
+class QuietHTTPRequestHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
 class TestImportCMSData(TestCase):
     @patch("requests.get")
     @patch("evap.cms.management.commands.import_cms_data.JSONImporter")
@@ -25,6 +37,39 @@ class TestImportCMSData(TestCase):
         mock_get.assert_called_once_with("https://example.com/download?semester=WS%2025/26", timeout=120)
         mock_json_importer.assert_called_once_with(semester, semester.default_course_end_date)
 
+    def test_concurrent_download_import(self):
+        semester = baker.make(Semester, cms_name="semester-a", default_course_end_date=date(2026, 2, 28))
+        invalid_semester = baker.make(Semester, cms_name="semester-b", default_course_end_date=date(2026, 2, 28))
+        missing_semester = baker.make(Semester, cms_name="semester-c", default_course_end_date=date(2026, 2, 28))
+
+        with TemporaryDirectory() as temp_dir:
+            shutil.copy(
+                Path(evap.cms.fixtures.__file__).with_name("import_example_data.json"),
+                Path(temp_dir, "semester-a.json"),
+            )
+            Path(temp_dir, "semester-b.json").write_text("{}", encoding="utf-8")
+
+            server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHTTPRequestHandler, directory=temp_dir))
+            server_thread = threading.Thread(target=server.serve_forever)
+            server_thread.start()
+            try:
+                url_template = f"http://127.0.0.1:{server.server_port}/{{}}.json"
+                stdout = StringIO()
+                with (
+                    self.assertLogs("evap.cms.management.commands.import_cms_data", level="WARNING"),
+                    self.assertRaisesMessage(CommandError, invalid_semester.name_en),
+                ):
+                    call_command("import_cms_data", "download", url_template, "--concurrency", "3", stdout=stdout)
+            finally:
+                server.shutdown()
+                server_thread.join()
+                server.server_close()
+
+        self.assertTrue(CourseLink.objects.filter(course__semester=semester).exists())
+        self.assertIn(f"{semester.name_en}: downloaded in", stdout.getvalue())
+        self.assertNotIn(invalid_semester.name_en, stdout.getvalue())
+        self.assertFalse(CourseLink.objects.filter(course__semester__in=[invalid_semester, missing_semester]).exists())
+
     @patch("evap.cms.management.commands.import_cms_data.JSONImporter.import_json")
     def test_file_import(self, mock_import_json):
         semester = baker.make(Semester)
@@ -58,6 +103,29 @@ class TestImportCMSData(TestCase):
                 )
             self.assertEqual(cm.exception.args, ("Semester does not exist.",))
 
+    @patch("evap.cms.management.commands.import_cms_data.JSONImporter.import_stream")
+    def test_file_import_stream(self, mock_import_stream):
+        semester = baker.make(Semester)
+        imported_contents = []
+        mock_import_stream.side_effect = lambda chunks: imported_contents.append("".join(chunks))
+        with TemporaryDirectory() as temp_dir:
+            test_filename = os.path.join(temp_dir, "test.json")
+            with open(test_filename, "w", encoding="utf-8") as f:
+                f.write("example contents")
+            call_command(
+                "import_cms_data",
+                "file",
+                "--semester-id",
+                semester.id,
+                "--default-course-end-date",
+                "2000-01-01",
+                "--stream",
+                test_filename,
+                stdout=StringIO(),
+            )
+
+        self.assertEqual(imported_contents, ["example contents"])
+
     @patch("evap.cms.management.commands.import_cms_data.JSONImporter")
     def test_uses_semester_default_course_end_date(self, mock_json_importer):
         semester = baker.make(Semester, default_course_end_date=date(2001, 2, 3))
@@ -25,7 +25,8 @@ from evap.evaluation.models import (
     UserProfile,
 )
 from evap.evaluation.models_logging import LogEntry
-from evap.evaluation.tests.tools import assert_no_database_modifications
+from evap.evaluation.tests.tools import FuzzyInt, assert_no_database_modifications
+from evap.rewards.models import RewardPointGranting, SemesterActivation
 
 EXAMPLE_DATA = json.loads(
     Path(evap.cms.fixtures.__file__).with_name("import_example_data.json").read_text(encoding="utf-8")
@@ -311,6 +312,52 @@ class TestImportUserProfiles(TestCase):
             ],
         )
 
+    def test_import_many_students_with_constant_number_of_queries(self):
+        students = [
+            {
+                "gguid": f"0x{i}",
+                "email": f"student{i}@institution.example.com",
+                "name": f"Last {i}",
+                "christianname": f"First {i}",
+                "callingname": "",
+            }
+            for i in range(50)
+        ]
+        baker.make(
+            UserProfile,
+            email=iter(student["email"] for student in students[:10]),
+            last_name="Doe",
+            _quantity=10,
+            _bulk_create=True,
+        )
+
+        importer = JSONImporter(self.semester, date(2000, 1, 1))
+        with self.assertNumQueries(FuzzyInt(3, 6)):
+            importer._import_students(students)
+
+        self.assertEqual(UserProfile.objects.count(), 50)
+        self.assertEqual(len(importer.statistics.name_changes), 10)
+        self.assertEqual(
+            set(UserProfile.objects.values_list("email", "last_name", "first_name_given")),
+            {(student["email"], student["name"], student["christianname"]) for student in students},
+        )
+        self.assertEqual(importer.users_by_gguid["0x3"], UserProfile.objects.get(email=students[3]["email"]))
+
+    def test_import_duplicate_students(self):
+        students = [
+            {**self.students[0], "gguid": "0x1"},
+            {**self.students[0], "gguid": "0x2", "name": "Changed"},
+        ]
+
+        importer = JSONImporter(self.semester, date(2000, 1, 1))
+        importer._import_students(students)
+
+        user_profile = UserProfile.objects.get()
+        self.assertEqual(user_profile.last_name, "Changed")
+        self.assertEqual(importer.users_by_gguid["0x1"], user_profile)
+        self.assertEqual(importer.users_by_gguid["0x2"], user_profile)
+        self.assertEqual(len(importer.statistics.name_changes), 1)
+
 
 class TestImportEvents(TestCase):
     @classmethod
@@ -760,6 +807,79 @@ class TestImportEvents(TestCase):
         self.assertEqual(len(importer.statistics.updated_courses), 1)
         self.assertEqual(len(importer.statistics.new_courses), 0)
 
+    def test_import_removed_participants(self):
+        data = deepcopy(EXAMPLE_DATA)
+        data["students"][1]["email"] = "2@institution.example.com"
+        self._import(data)
+
+        student = UserProfile.objects.get(email="2@institution.example.com")
+        main_evaluation = Evaluation.objects.get(cms_evaluation_links__cms_id="0x5")
+        baker.make(SemesterActivation, semester=self.semester, is_active=True)
+        baker.make(
+            Evaluation, course__semester=self.semester, participants=[student], voters=[student], is_rewarded=True
+        )
+
+        data["events"][0]["students"] = [{"gguid": "0x1"}]
+        importer = self._import(data)
+
+        self.assertEqual(importer.statistics.updated_participants, [main_evaluation])
+        self.assertEqual(
+            set(main_evaluation.participants.values_list("email", flat=True)), {EXAMPLE_DATA["students"][0]["email"]}
+        )
+        logentry = LogEntry.objects.filter(
+            content_type__model="evaluation", content_object_id=main_evaluation.pk
+        ).first()
+        self.assertEqual(logentry.data, {"participants": {"remove": [student.pk]}})
+        self.assertTrue(RewardPointGranting.objects.filter(user_profile=student, semester=self.semester).exists())
+
+    def test_reimport_number_of_queries_does_not_depend_on_number_of_events(self):
+        def example_data_with_copies(count):
+            data = deepcopy(EXAMPLE_DATA)
+            data["events"] = []
+            for i in range(count):
+                for event in deepcopy(EXAMPLE_DATA["events"][:2]):
+                    event["gguid"] += f"-{i}"
+                    event["title"] += f" {i}"
+                    event["title_en"] += f" {i}"
+                    event["relatedevents"] = [
+                        {"gguid": f"{related['gguid']}-{i}"} for related in event["relatedevents"]
+                    ]
+                    data["events"].append(event)
+            return data
+
+        query_counts = []
+        for count in [1, 5]:
+            data = example_data_with_copies(count)
+            self._import(data)
+            importer = self._import(data, assert_nop=True)
+            query_counts.append(importer.statistics.query_count)
+
+        self.assertEqual(Evaluation.objects.count(), 10)
+        self.assertEqual(query_counts[0], query_counts[1])
+        self.assertIn(f"{query_counts[1]} database queries", importer.statistics.get_log())
+
+    def test_import_stream(self):
+        text = json.dumps(EXAMPLE_DATA, indent=2)
+        importer = JSONImporter(self.semester, date(2000, 1, 1))
+        importer.import_stream(text[i : i + 10] for i in range(0, len(text), 10))
+
+        self.assertEqual(UserProfile.objects.count(), 6)
+        self.assertEqual(len(importer.statistics.new_evaluations), 2)
+        self.assertTrue(Evaluation.participants.through.objects.exists())
+        # the streamed import resulted in the same data as import_json
+        self._import(assert_nop=True)
+
+    def test_import_stream_invalid_data(self):
+        importer = JSONImporter(self.semester, date(2000, 1, 1))
+        data = {"students": EXAMPLE_DATA["students"], "events": EXAMPLE_DATA["events"]}
+        with assert_no_database_modifications(), self.assertRaisesMessage(ValueError, "lecturers"):
+            importer.import_stream([json.dumps(data)])
+
+        wrong_data = deepcopy(EXAMPLE_DATA)
+        wrong_data["events"][0]["isexam"] = "false"
+        with assert_no_database_modifications(), self.assertRaises(ValidationError):
+            importer.import_stream([json.dumps(wrong_data)])
+
     @override_settings(JSON_IMPORTER_LOG_RECIPIENTS=["test@example.com"])
     def test_importer_log_email_sent(self):
         self._import()
@@ -5,7 +5,7 @@ from django.db.models import Q
 from django.forms.widgets import CheckboxSelectMultiple
 from django.utils.translation import gettext_lazy as _
 
-from evap.evaluation.forms import UserModelChoiceField, UserModelMultipleChoiceField
+from evap.evaluation.forms import UserModelChoiceField, UserModelMultipleChoiceField, UserSearchSelect
 from evap.evaluation.models import Course, Evaluation, Questionnaire, UserProfile
 from evap.evaluation.tools import vote_end_datetime
 from evap.staff.forms import ContributionForm
@@ -154,6 +154,9 @@ class EditorContributionForm(ContributionForm):
         self.fields["contributor"].queryset = UserProfile.objects.filter(
             (Q(is_active=True) & Q(is_proxy_user=False)) | Q(pk=existing_contributor_pk)
         )
+        contributor_widget = self.fields["contributor"].widget
+        assert isinstance(contributor_widget, UserSearchSelect)
+        contributor_widget.exclude_proxy_users = True
 
 
 class DelegateSelectionForm(forms.Form):
@@ -1,4 +1,6 @@
-import xlrd
+from io import BytesIO
+
+import openpyxl
 from django.conf import settings
 from django.core import mail
 from django.urls import reverse
@@ -344,5 +346,5 @@ class TestContributorResultsExportView(WebTest):
     def test_concise_header(self):
         response = self.app.get(self.url, user=self.user)
 
-        workbook = xlrd.open_workbook(file_contents=response.content)
-        self.assertEqual(workbook.sheets()[0].row_values(0)[0], f"Evaluation\n{self.user.full_name}")
+        workbook = openpyxl.load_workbook(BytesIO(response.content))
+        self.assertEqual(workbook.worksheets[0]["A1"].value, f"Evaluation\n{self.user.full_name}")
@@ -293,9 +293,12 @@ def evaluation_direct_delegation(request, evaluation_id):
 
 
 def export_contributor_results(contributor):
-    filename = f"Evaluation_{contributor.full_name}.xls"
-    response = AttachmentResponse(filename, content_type="application/vnd.ms-excel")
-    ResultsExporter().export(
+    # exports of all semesters can have more columns than .xls files support
+    exporter = ResultsExporter(xlsx=True)
+    response = AttachmentResponse(
+        f"Evaluation_{contributor.full_name}.{exporter.file_extension}", content_type=exporter.content_type
+    )
+    exporter.export(
         response,
         Semester.objects.all(),
         [(Program.objects.all(), CourseType.objects.all())],
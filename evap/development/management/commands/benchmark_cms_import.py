@@ -0,0 +1,133 @@
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+from functools import partial
+from typing import TextIO
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+
+from evap.cms.json_importer import JSONImporter
+from evap.evaluation.models import Semester
+from evap.evaluation.tools import STREAMING_CHUNK_SIZE
+
+
+def write_json_array(file: TextIO, key: str, items) -> None:
+    file.write(f'"{key}": [')
+    for i, item in enumerate(items):
+        if i:
+            file.write(", ")
+        json.dump(item, file)
+    file.write("]")
+
+
+def write_synthetic_dump(file: TextIO, num_students: int, num_lecturers: int, num_events: int, event_size: int):
+    """Writes a dump in the format of the CMS export element by element, so it is never held in memory as a whole."""
+    students = (
+        {
+            "gguid": f"student-{i}",
+            "email": f"student{i}@institution.example.com",
+            "name": f"Student {i}",
+            "christianname": f"First {i}",
+            "callingname": "",
+        }
+        for i in range(num_students)
+    )
+    lecturers = (
+        {
+            "gguid": f"lecturer-{i}",
+            "email": f"lecturer{i}@institution.example.com",
+            "name": f"Lecturer {i}",
+            "christianname": f"First {i}",
+            "titlefront": "Prof. Dr.",
+        }
+        for i in range(num_lecturers)
+    )
+    events = (
+        {
+            "gguid": f"event-{i}",
+            "title": f"Veranstaltung {i}",
+            "title_en": f"Event {i}",
+            "type": "Vorlesung",
+            "isexam": False,
+            "courses": [{"cprid": "BA-Inf", "scale": "GRADE_PARTICIPATION"}],
+            "appointments": [{"begin": "15.07.2024 10:15:00", "end": "15.07.2024 11:45:00"}],
+            "lecturers": [{"gguid": f"lecturer-{random.randrange(num_lecturers)}"}],
+            "students": [
+                {"gguid": f"student-{index}"}
+                for index in random.sample(range(num_students), min(event_size, num_students))
+            ],
+            "language": "Deutsch",
+        }
+        for i in range(num_events)
+    )
+
+    file.write("{")
+    write_json_array(file, "students", students)
+    file.write(", ")
+    write_json_array(file, "lecturers", lecturers)
+    file.write(", ")
+    write_json_array(file, "events", events)
+    file.write("}")
+
+
+class Command(BaseCommand):
+    help = "Compares wall time and peak memory of importing a synthetic CMS dump with import_json and import_stream."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=25000, help="Number of students in the dump.")
+        parser.add_argument("--lecturers", type=int, default=2000, help="Number of lecturers in the dump.")
+        parser.add_argument("--events", type=int, default=3000, help="Number of events in the dump.")
+        parser.add_argument("--event-size", type=int, default=100, help="Number of students per event.")
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryFile("w+", encoding="utf-8") as file:
+            write_synthetic_dump(
+                file, options["students"], options["lecturers"], options["events"], options["event_size"]
+            )
+            self.stdout.write(
+                f"Generated a dump with {options['students']} students, {options['lecturers']} lecturers and "
+                f"{options['events']} events ({file.tell() / 1024**2:.1f} MB)."
+            )
+
+            for name, import_file in [
+                ("import_json", lambda importer: importer.import_json(file.read())),
+                (
+                    "import_stream",
+                    lambda importer: importer.import_stream(iter(partial(file.read, STREAMING_CHUNK_SIZE), "")),
+                ),
+            ]:
+                file.seek(0)
+                duration, peak_memory = self.measure_import(import_file)
+                self.stdout.write(f"{name}: {duration:.1f} seconds, peak memory {peak_memory / 1024**2:.1f} MB")
+
+        self.stdout.write("The durations include the overhead of tracing the memory allocations.")
+
+    @staticmethod
+    def measure_import(import_file) -> tuple[float, int]:
+        # the imported data is rolled back and the importer log is not sent
+        with (
+            override_settings(EMAIL_BACKEND="django.core.mail.backends.dummy.EmailBackend"),
+            transaction.atomic(),
+        ):
+            semester = Semester.objects.create(
+                name_de="CMS-Import-Benchmark",
+                name_en="CMS import benchmark",
+                short_name_de="CMS-Benchmark",
+                short_name_en="CMS benchmark",
+            )
+            importer = JSONImporter(semester, date(2024, 7, 31))
+
+            tracemalloc.start()
+            start = time.perf_counter()
+            import_file(importer)
+            duration = time.perf_counter() - start
+            __, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            transaction.set_rollback(True)
+        return duration, peak_memory
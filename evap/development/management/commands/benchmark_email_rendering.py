@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from evap.evaluation.models import EmailTemplate, Evaluation, UserProfile, compile_email_template
+
+
+class Command(BaseCommand):
+    help = "Measures how long rendering emails takes with and without the cache of compiled email templates."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--template", default=EmailTemplate.EVALUATION_STARTED, help="Name of the email template.")
+        parser.add_argument("--mails", type=int, default=1000, help="Number of emails to render.")
+
+    def handle(self, *args, **options):
+        template = EmailTemplate.objects.get(name=options["template"])
+        users = list(UserProfile.objects.exclude(email=None)[: options["mails"]])
+        if not users:
+            self.stdout.write("There are no users with email addresses.")
+            return
+        evaluations = list(Evaluation.objects.all()[:5])
+
+        def render_mails(use_cache: bool) -> float:
+            start = time.perf_counter()
+            for i in range(options["mails"]):
+                if not use_cache:
+                    compile_email_template.cache_clear()
+                user = users[i % len(users)]
+                body_params = {"user": user, "evaluations": evaluations, "due_evaluations": []}
+                template.construct_mail(user.email, [], {"user": user}, body_params)
+            return time.perf_counter() - start
+
+        uncached_duration = render_mails(use_cache=False)
+        cached_duration = render_mails(use_cache=True)
+
+        per_thousand = 1000 / options["mails"]
+        self.stdout.write(f'Rendered {options["mails"]} emails of the template "{template.name}".')
+        self.stdout.write(f"Without cache: {uncached_duration * per_thousand * 1000:.0f} milliseconds per 1000 emails.")
+        self.stdout.write(f"With cache: {cached_duration * per_thousand * 1000:.0f} milliseconds per 1000 emails.")
+        self.stdout.write(f"Rendering time changed by {cached_duration / uncached_duration - 1:+.0%}.")
@@ -0,0 +1,64 @@
+import pickle  # nosec
+import time
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+
+from evap.evaluation.models import Evaluation
+from evap.results.tools import (
+    STATES_WITH_RESULTS_CACHING,
+    clear_deserialization_cache,
+    deserialize_evaluation_result,
+    get_results_cache_key,
+)
+
+
+class Command(BaseCommand):
+    help = "Compares the size and loading time of pickled result objects and of the compact results format."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--evaluations", type=int, default=100, help="Maximum number of evaluations to use.")
+
+    def handle(self, *args, **options):
+        evaluations = Evaluation.objects.filter(state__in=STATES_WITH_RESULTS_CACHING)[: options["evaluations"]]
+        serialized_results = [
+            serialized_result
+            for serialized_result in caches["results"]
+            .get_many([get_results_cache_key(evaluation) for evaluation in evaluations])
+            .values()
+            if deserialize_evaluation_result(serialized_result) is not None
+        ]
+        if not serialized_results:
+            self.stdout.write("There are no cached results. Run refresh_results_cache first.")
+            return
+
+        pickled_results = [
+            pickle.dumps(deserialize_evaluation_result(serialized_result)) for serialized_result in serialized_results
+        ]
+        compact_results = [pickle.dumps(serialized_result) for serialized_result in serialized_results]
+
+        start = time.perf_counter()
+        for pickled_result in pickled_results:
+            pickle.loads(pickled_result)  # nosec
+        pickled_duration = time.perf_counter() - start
+
+        # include loading the questions and questionnaires into the shared in-process cache
+        clear_deserialization_cache()
+        start = time.perf_counter()
+        for compact_result in compact_results:
+            deserialize_evaluation_result(pickle.loads(compact_result))  # nosec
+        compact_duration = time.perf_counter() - start
+
+        pickled_size = sum(len(pickled_result) for pickled_result in pickled_results)
+        compact_size = sum(len(compact_result) for compact_result in compact_results)
+        self.stdout.write(f"Compared the results of {len(serialized_results)} evaluations.")
+        self.stdout.write(
+            f"Pickled results: {pickled_size / 1024:.1f} KiB, loaded in {pickled_duration * 1000:.1f} milliseconds."
+        )
+        self.stdout.write(
+            f"Compact results: {compact_size / 1024:.1f} KiB, loaded in {compact_duration * 1000:.1f} milliseconds."
+        )
+        self.stdout.write(
+            f"Size reduced by {1 - compact_size / pickled_size:.0%}, "
+            f"loading time changed by {compact_duration / pickled_duration - 1:+.0%}."
+        )
@@ -0,0 +1,105 @@
+import random
+import time
+from datetime import date, datetime
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from evap.evaluation.models import (
+    Contribution,
+    Course,
+    CourseType,
+    Evaluation,
+    Question,
+    QuestionAssignment,
+    Questionnaire,
+    QuestionType,
+    Semester,
+    UserProfile,
+)
+from evap.student.tools import AnswerWriter
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures how many votes per second can be stored for a large evaluation. "
+        "All created data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--votes", type=int, default=200, help="Number of votes to store.")
+        parser.add_argument("--contributors", type=int, default=8, help="Number of contributors to vote on.")
+        parser.add_argument("--questions", type=int, default=15, help="Number of questions per questionnaire.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            evaluation = self.create_evaluation(options["contributors"], options["questions"])
+            contributions = list(
+                evaluation.contributions.prefetch_related("questionnaires__question_assignments__question")
+            )
+            num_answers = sum(
+                len(questionnaire.question_assignments.all())
+                for contribution in contributions
+                for questionnaire in contribution.questionnaires.all()
+            )
+            self.stdout.write(f"Voting on {len(contributions)} contributions with {num_answers} questions in total.")
+
+            start = time.perf_counter()
+            for __ in range(options["votes"]):
+                with transaction.atomic():
+                    answer_writer = AnswerWriter()
+                    for contribution in contributions:
+                        for questionnaire in contribution.questionnaires.all():
+                            for assignment in questionnaire.question_assignments.all():
+                                if assignment.question.is_text_question:
+                                    answer_writer.add_text_answer(contribution, assignment, "Lorem ipsum")
+                                else:
+                                    answer_writer.add_rating_answer(contribution, assignment, random.randint(1, 5))  # nosec
+                    answer_writer.save(evaluation)
+            duration = time.perf_counter() - start
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"Stored {options['votes']} votes in {duration:.2f} seconds ({options['votes'] / duration:.1f} votes/second)."
+        )
+
+    @staticmethod
+    def create_evaluation(num_contributors: int, num_questions: int) -> Evaluation:
+        suffix = datetime.now().isoformat()
+        semester = Semester.objects.create(
+            name_de=f"Benchmark {suffix}",
+            name_en=f"Benchmark {suffix}",
+            short_name_de=f"B {suffix}"[:20],
+            short_name_en=f"B {suffix}"[:20],
+        )
+        course_type = CourseType.objects.create(name_de=f"Benchmark {suffix}", name_en=f"Benchmark {suffix}")
+        course = Course.objects.create(semester=semester, type=course_type, name_de="Benchmark", name_en="Benchmark")
+        evaluation = Evaluation.objects.create(
+            course=course, vote_start_datetime=datetime.now(), vote_end_date=date.today()
+        )
+
+        questionnaires = {}
+        for questionnaire_type in [Questionnaire.Type.TOP, Questionnaire.Type.CONTRIBUTOR]:
+            questionnaire = Questionnaire.objects.create(
+                type=questionnaire_type,
+                name_de=f"Benchmark {questionnaire_type} {suffix}",
+                name_en=f"Benchmark {questionnaire_type} {suffix}",
+                public_name_de="Benchmark",
+                public_name_en="Benchmark",
+            )
+            for order in range(num_questions):
+                question_type = QuestionType.TEXT if order == 0 else QuestionType.GRADE
+                question = Question.objects.create(
+                    type=question_type, text_de=f"Frage {order}", text_en=f"Question {order}"
+                )
+                QuestionAssignment.objects.create(question=question, questionnaire=questionnaire, order=order)
+            questionnaires[questionnaire_type] = questionnaire
+
+        evaluation.general_contribution.questionnaires.set([questionnaires[Questionnaire.Type.TOP]])
+        for index in range(num_contributors):
+            contributor = UserProfile.objects.create(email=f"benchmark.contributor.{index}@example.com")
+            contribution = Contribution.objects.create(evaluation=evaluation, contributor=contributor)
+            contribution.questionnaires.set([questionnaires[Questionnaire.Type.CONTRIBUTOR]])
+
+        return evaluation
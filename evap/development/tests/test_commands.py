@@ -3,8 +3,11 @@ from unittest.mock import patch
 
 from django.conf import settings
 from django.core import management
+from model_bakery import baker
 
+from evap.evaluation.models import Evaluation, RatingAnswerCounter, Semester, TextAnswer, UserProfile
 from evap.evaluation.tests.tools import TestCase
+from evap.results.tools import cache_results
 
 
 class TestDumpTestDataCommand(TestCase):
@@ -68,3 +71,60 @@ class TestRunCommand(TestCase):
             management.call_command("run", stdout=StringIO())
 
         execute_mock.assert_called_once_with(["manage.py", "runserver", "0.0.0.0:8000"])
+
+
+class TestBenchmarkVotesCommand(TestCase):
+    def test_reports_votes_per_second_and_rolls_back(self):
+        output = StringIO()
+        management.call_command("benchmark_votes", "--votes=3", "--contributors=2", "--questions=4", stdout=output)
+
+        self.assertIn("Voting on 3 contributions with 12 questions in total.", output.getvalue())
+        self.assertIn("Stored 3 votes in", output.getvalue())
+        self.assertIn("votes/second", output.getvalue())
+        self.assertFalse(Evaluation.objects.exists())
+        self.assertFalse(RatingAnswerCounter.objects.exists())
+        self.assertFalse(TextAnswer.objects.exists())
+
+
+class TestBenchmarkResultsSerializationCommand(TestCase):
+    def test_compares_formats(self):
+        evaluation = baker.make(Evaluation, state=Evaluation.State.PUBLISHED)
+        cache_results(evaluation)
+
+        output = StringIO()
+        management.call_command("benchmark_results_serialization", stdout=output)
+
+        self.assertIn("Compared the results of 1 evaluations.", output.getvalue())
+        self.assertIn("Pickled results:", output.getvalue())
+        self.assertIn("Compact results:", output.getvalue())
+
+    def test_without_cached_results(self):
+        output = StringIO()
+        management.call_command("benchmark_results_serialization", stdout=output)
+
+        self.assertEqual(output.getvalue(), "There are no cached results. Run refresh_results_cache first.\n")
+
+
+class TestBenchmarkEmailRenderingCommand(TestCase):
+    def test_compares_rendering_times(self):
+        baker.make(UserProfile, email="user@institution.example.com")
+
+        output = StringIO()
+        management.call_command("benchmark_email_rendering", "--mails=3", stdout=output)
+
+        self.assertIn('Rendered 3 emails of the template "Evaluation Started".', output.getvalue())
+        self.assertIn("Without cache:", output.getvalue())
+        self.assertIn("With cache:", output.getvalue())
+
+
+class TestBenchmarkCMSImportCommand(TestCase):
+    def test_compares_import_modes(self):
+        output = StringIO()
+        management.call_command(
+            "benchmark_cms_import", "--students=20", "--lecturers=2", "--events=3", "--event-size=5", stdout=output
+        )
+
+        self.assertIn("Generated a dump with 20 students, 2 lecturers and 3 events", output.getvalue())
+        self.assertIn("import_json:", output.getvalue())
+        self.assertIn("import_stream:", output.getvalue())
+        self.assertFalse(Semester.objects.exists())
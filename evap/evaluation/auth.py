@@ -123,6 +123,11 @@ def editor_or_delegate_required(user):
     return user.is_editor_or_delegate
 
 
+@class_or_function_check_decorator
+def manager_or_editor_or_delegate_required(user):
+    return user.is_manager or user.is_editor_or_delegate
+
+
 @class_or_function_check_decorator
 def participant_required(user):
     return user.is_participant
@@ -1,10 +1,13 @@
 import logging
+from copy import copy
 
 from django import forms
 from django.conf import settings
 from django.contrib.auth import authenticate
 from django.core.exceptions import ValidationError
+from django.forms.models import ModelChoiceIterator
 from django.http import HttpRequest
+from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.debug import sensitive_variables
 
@@ -95,6 +98,41 @@ class NewKeyForm(forms.Form):
         return self.user_cache
 
 
+class UserSearchSelect(forms.Select):
+    """
+    Only renders the options of the selected users, instead of one option for every user in the queryset.
+    Other users are loaded from the user search view while typing.
+    """
+
+    def __init__(self, *args, exclude_proxy_users=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.exclude_proxy_users = exclude_proxy_users
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        url = reverse("evaluation:user_search")
+        if self.exclude_proxy_users:
+            url += "?exclude_proxy_users=1"
+        attrs["data-user-search-url"] = url
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        all_choices = self.choices
+        if isinstance(all_choices, ModelChoiceIterator):
+            selected_choices = copy(all_choices)
+            selected_choices.queryset = all_choices.queryset.filter(pk__in=[pk for pk in value if str(pk).isdigit()])
+            self.choices = selected_choices
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = all_choices
+
+
+class UserSearchSelectMultiple(UserSearchSelect, forms.SelectMultiple):
+    def __init__(self, attrs=None, **kwargs):
+        super().__init__({"data-tomselect-fullwidth": "", **(attrs or {})}, **kwargs)
+
+
 class UserModelChoiceField(forms.ModelChoiceField):
     def label_from_instance(self, obj: UserProfile) -> str:
         return obj.full_name_with_additional_info
@@ -0,0 +1,183 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from itertools import repeat
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection as db_connection
+from django.db import transaction
+from django.db.models import Count, Min, Q
+
+from evap.evaluation.management.commands.tools import log_exceptions
+from evap.evaluation.models import QueuedEmail
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Spaces out the emails sent by all threads so that at most `rate` emails are sent per second"""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0
+        self.next_time = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self.lock:
+            current_time = time.monotonic()
+            wait_time = self.next_time - current_time
+            self.next_time = max(self.next_time, current_time) + self.interval
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+def claim_queued_emails(batch_size: int, max_attempts: int, lease: timedelta) -> list[QueuedEmail]:
+    """
+    Claims up to batch_size due emails of the outbox by postponing them by the lease duration. Concurrent calls claim
+    different emails. If the claiming worker dies, the emails become due again once the lease has expired.
+    """
+    with transaction.atomic():
+        queued_emails = list(
+            QueuedEmail.objects.select_for_update(skip_locked=True)
+            .filter(next_attempt_at__lte=datetime.now(), attempts__lt=max_attempts)
+            .order_by("next_attempt_at", "pk")[:batch_size]
+        )
+        QueuedEmail.objects.filter(pk__in=[queued_email.pk for queued_email in queued_emails]).update(
+            next_attempt_at=datetime.now() + lease
+        )
+    return queued_emails
+
+
+def send_queued_emails(
+    batch_size: int, rate_limiter: RateLimiter, max_attempts: int, backoff: timedelta, lease: timedelta
+) -> int:
+    """
+    Sends up to batch_size due emails of the outbox over one connection and returns the number of handled emails.
+    Failed emails are retried after an exponentially growing delay. Concurrent calls handle different emails.
+    No transaction is held while sending: every email is deleted or rescheduled right after it was handed to the mail
+    server, so a crashing worker sends at most one email twice.
+    """
+    queued_emails = claim_queued_emails(batch_size, max_attempts, lease)
+
+    connection = get_connection()
+    try:
+        for queued_email in queued_emails:
+            rate_limiter.wait()
+            try:
+                connection.send_messages([queued_email.to_mail()])
+            except Exception as error:  # noqa: BLE001 - the email is retried later
+                # the next email opens a new connection in case this one is broken
+                connection.close()
+                queued_email.attempts += 1
+                queued_email.last_error = str(error)
+                queued_email.next_attempt_at = datetime.now() + backoff * 2 ** (queued_email.attempts - 1)
+                queued_email.save(update_fields=["attempts", "last_error", "next_attempt_at"])
+                if queued_email.attempts >= max_attempts:
+                    logger.error(
+                        'Giving up sending email "%s" to %s after %d attempts: %s',
+                        queued_email.subject,
+                        ", ".join(queued_email.to),
+                        queued_email.attempts,
+                        error,
+                    )
+                else:
+                    logger.warning(
+                        'Sending email "%s" to %s failed, retrying at %s: %s',
+                        queued_email.subject,
+                        ", ".join(queued_email.to),
+                        queued_email.next_attempt_at,
+                        error,
+                    )
+            else:
+                QueuedEmail.objects.filter(pk=queued_email.pk).delete()
+                logger.info('Sent email "%s" to %s.', queued_email.subject, ", ".join(queued_email.to))
+    finally:
+        connection.close()
+
+    return len(queued_emails)
+
+
+def send_queued_emails_in_thread(*args) -> int:
+    try:
+        return send_queued_emails(*args)
+    finally:
+        # each thread has its own database connection
+        db_connection.close()
+
+
+@log_exceptions
+class Command(BaseCommand):
+    help = "Sends the emails in the outbox, see settings.EMAIL_OUTBOX."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100, help="Number of emails sent over one connection.")
+        parser.add_argument("--connections", type=int, default=1, help="Number of concurrent mail server connections.")
+        parser.add_argument(
+            "--rate", type=float, default=0, help="Maximum number of emails per second, 0 for no limit."
+        )
+        parser.add_argument(
+            "--max-attempts", type=int, default=5, help="Number of attempts before giving up on an email."
+        )
+        parser.add_argument("--backoff", type=float, default=60, help="Seconds to wait before the first retry.")
+        parser.add_argument(
+            "--lease",
+            type=float,
+            default=600,
+            help="Seconds after which emails claimed by a worker that died are sent again. Must exceed the time needed "
+            "for sending a batch.",
+        )
+        parser.add_argument(
+            "--worker",
+            action="store_true",
+            help="Keep running and send new emails as they are queued instead of stopping once the outbox is empty.",
+        )
+        parser.add_argument("--interval", type=float, default=5, help="Seconds to wait for new emails as a worker.")
+        parser.add_argument("--stats", action="store_true", help="Only print the outbox size and lag.")
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            self.write_stats(options["max_attempts"])
+            return
+
+        if options["rate"] > 0 and options["batch_size"] / options["rate"] >= options["lease"]:
+            raise CommandError("The lease must exceed the time needed for sending a batch at the given rate.")
+
+        num_connections = options["connections"]
+        arguments = (
+            options["batch_size"],
+            RateLimiter(options["rate"]),
+            options["max_attempts"],
+            timedelta(seconds=options["backoff"]),
+            timedelta(seconds=options["lease"]),
+        )
+        with ThreadPoolExecutor(max_workers=num_connections) as executor:
+            while True:
+                if num_connections > 1:
+                    num_handled = sum(
+                        executor.map(
+                            send_queued_emails_in_thread,
+                            *(repeat(argument, num_connections) for argument in arguments),
+                        )
+                    )
+                else:
+                    num_handled = send_queued_emails(*arguments)
+                if not num_handled:
+                    if not options["worker"]:
+                        break
+                    time.sleep(options["interval"])
+
+        self.write_stats(options["max_attempts"])
+
+    def write_stats(self, max_attempts: int):
+        stats = QueuedEmail.objects.aggregate(
+            pending=Count("pk", filter=Q(attempts__lt=max_attempts)),
+            failed=Count("pk", filter=Q(attempts__gte=max_attempts)),
+            oldest=Min("queued_at", filter=Q(attempts__lt=max_attempts)),
+        )
+        lag = f"{(datetime.now() - stats['oldest']).total_seconds():.0f} seconds" if stats["oldest"] else "none"
+        self.stdout.write(f"Outbox: {stats['pending']} pending emails, {stats['failed']} failed emails, lag: {lag}")
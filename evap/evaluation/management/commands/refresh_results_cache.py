@@ -1,14 +1,70 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import django
+from django.core.cache import caches
 from django.core.management.base import BaseCommand
 from django.core.serializers.base import ProgressBar
+from django.db import connections
 
 from evap.evaluation.models import Evaluation
+from evap.results.models import EvaluationGradeSummary
 from evap.results.tools import (
     GET_RESULTS_PREFETCH_LOOKUPS,
     STATES_WITH_RESULT_TEMPLATE_CACHING,
     STATES_WITH_RESULTS_CACHING,
-    cache_results,
+    cache_results_many,
+    get_results_cache_key,
 )
-from evap.results.views import update_template_cache
+from evap.results.views import get_evaluation_result_template_fragment_cache_key, update_template_cache
+
+
+def refresh_results_cache_of_courses(course_ids: list[int], only_missing: bool) -> int:
+    """
+    Caches the results, grade summaries and result template fragments of all evaluations of the given courses.
+    All evaluations of a course are handled together, as the course fragments depend on all of them.
+    Returns the number of handled evaluations.
+    """
+    evaluations = list(
+        Evaluation.objects.filter(course_id__in=course_ids, state__in=STATES_WITH_RESULTS_CACHING).only(
+            "id", "course_id", "state"
+        )
+    )
+    results_evaluation_ids = [evaluation.id for evaluation in evaluations]
+    template_course_ids = {
+        evaluation.course_id for evaluation in evaluations if evaluation.state in STATES_WITH_RESULT_TEMPLATE_CACHING
+    }
+
+    if only_missing:
+        cache = caches["results"]
+        summarized_evaluation_ids = set(
+            EvaluationGradeSummary.objects.filter(evaluation_id__in=results_evaluation_ids).values_list(
+                "evaluation_id", flat=True
+            )
+        )
+        results_evaluation_ids = [
+            evaluation.id
+            for evaluation in evaluations
+            if evaluation.id not in summarized_evaluation_ids or not cache.has_key(get_results_cache_key(evaluation))
+        ]
+        template_course_ids = {
+            evaluation.course_id
+            for evaluation in evaluations
+            if evaluation.state in STATES_WITH_RESULT_TEMPLATE_CACHING
+            and not cache.has_key(get_evaluation_result_template_fragment_cache_key(evaluation.id, "en", True))
+        }
+
+    cache_results_many(
+        Evaluation.objects.filter(id__in=results_evaluation_ids).prefetch_related(*GET_RESULTS_PREFETCH_LOOKUPS),
+        refetch_related_objects=False,
+    )
+    if template_course_ids:
+        # the results of all evaluations need to be cached before the templates can be rendered
+        update_template_cache(
+            Evaluation.objects.filter(course_id__in=template_course_ids, state__in=STATES_WITH_RESULT_TEMPLATE_CACHING)
+        )
+
+    return len(evaluations)
 
 
 class Command(BaseCommand):
@@ -16,20 +72,63 @@ class Command(BaseCommand):
     help = "Clears the cache and pre-warms it with the results of all evaluations"
     requires_migrations_checks = True
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--jobs", type=int, default=1, help="Number of worker processes that calculate results in parallel."
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=100, help="Approximate number of evaluations handled at once."
+        )
+        parser.add_argument(
+            "--only-missing", action="store_true", help="Skip evaluations whose results are already cached."
+        )
+
     def handle(self, *args, **options):
         self.stdout.write("Calculating results for all evaluations...")
 
         self.stdout.ending = None
-        evaluations = Evaluation.objects.filter(state__in=STATES_WITH_RESULTS_CACHING).prefetch_related(
-            *GET_RESULTS_PREFETCH_LOOKUPS,
-        )
-        progress_bar = ProgressBar(self.stdout, evaluations.count())
+        chunks = self.get_course_chunks(options["chunk_size"])
+        progress_bar = ProgressBar(self.stdout, sum(num_evaluations for __, num_evaluations in chunks))
+        done = 0
 
-        for counter, evaluation in enumerate(evaluations):
-            progress_bar.update(counter + 1)
-            cache_results(evaluation, refetch_related_objects=False)
-
-        self.stdout.write("Prerendering result index page...\n")
-        update_template_cache(Evaluation.objects.filter(state__in=STATES_WITH_RESULT_TEMPLATE_CACHING))
+        if options["jobs"] > 1:
+            # the worker processes must not share the database connections of this process
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=options["jobs"], initializer=django.setup) as executor:
+                chunk_results = executor.map(
+                    refresh_results_cache_of_courses,
+                    [course_ids for course_ids, __ in chunks],
+                    repeat(options["only_missing"]),
+                )
+                for num_evaluations in chunk_results:
+                    done += num_evaluations
+                    progress_bar.update(done)
+        else:
+            for course_ids, __ in chunks:
+                done += refresh_results_cache_of_courses(course_ids, options["only_missing"])
+                progress_bar.update(done)
 
         self.stdout.write("Results cache has been refreshed.\n")
+
+    @staticmethod
+    def get_course_chunks(chunk_size: int) -> list[tuple[list[int], int]]:
+        """Splits the courses with cached results into chunks of about chunk_size evaluations"""
+        course_ids = (
+            Evaluation.objects.filter(state__in=STATES_WITH_RESULTS_CACHING)
+            .order_by("course_id")
+            .values_list("course_id", flat=True)
+        )
+
+        chunks: list[tuple[list[int], int]] = []
+        current_course_ids: list[int] = []
+        current_count = 0
+        for course_id in course_ids:
+            if current_count >= chunk_size and course_id != current_course_ids[-1]:
+                chunks.append((current_course_ids, current_count))
+                current_course_ids, current_count = [], 0
+            if not current_course_ids or current_course_ids[-1] != course_id:
+                current_course_ids.append(course_id)
+            current_count += 1
+        if current_course_ids:
+            chunks.append((current_course_ids, current_count))
+        return chunks
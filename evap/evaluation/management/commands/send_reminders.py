@@ -1,20 +1,49 @@
 import datetime
 import logging
+import time
 
 from django.conf import settings
 from django.contrib.auth.models import Group
 from django.core.management.base import BaseCommand
-from django.db.models import Exists, OuterRef, Prefetch
+from django.db.models import BooleanField, Exists, ExpressionWrapper, OuterRef, Prefetch, Q, prefetch_related_objects
 from django.urls import reverse
 
 from evap.evaluation.management.commands.tools import log_exceptions
-from evap.evaluation.models import Course, EmailTemplate, Evaluation, Semester
+from evap.evaluation.models import Course, EmailTemplate, Evaluation, Semester, TextAnswer, UserProfile
 from evap.tools import MonthAndDay, unordered_groupby
 
 logger = logging.getLogger(__name__)
 
 
 def get_sorted_evaluation_url_tuples_with_urgent_review() -> list[tuple[Evaluation, str]]:
+    """The evaluations whose text answer review is urgent, see Evaluation.textanswer_review_state"""
+    from evap.grades.models import GradeDocument  # noqa: PLC0415
+
+    evaluations = list(
+        Evaluation.objects.filter(state=Evaluation.State.EVALUATED, can_publish_text_results=True)
+        .filter(
+            Exists(
+                TextAnswer.objects.filter(
+                    contribution__evaluation=OuterRef("pk"), review_decision=TextAnswer.ReviewDecision.UNDECIDED
+                )
+            )
+        )
+        .annotate(
+            grading_process_is_finished_without_participants=ExpressionWrapper(
+                Q(wait_for_grade_upload_before_publishing=False)
+                | Q(course__gets_no_grade_documents=True)
+                | Exists(GradeDocument.objects.filter(course=OuterRef("course"), type=GradeDocument.Type.FINAL_GRADES)),
+                output_field=BooleanField(),
+            )
+        )
+        .select_related("course")
+    )
+    # whether all participants are external can only be checked on the participants themselves
+    prefetch_related_objects(
+        [evaluation for evaluation in evaluations if not evaluation.grading_process_is_finished_without_participants],
+        "participants",
+    )
+
     evaluation_url_tuples: list[tuple[Evaluation, str]] = [
         (
             evaluation,
@@ -24,8 +53,8 @@ def get_sorted_evaluation_url_tuples_with_urgent_review() -> list[tuple[Evaluati
                 kwargs={"evaluation_id": evaluation.id},
             ),
         )
-        for evaluation in Evaluation.objects.filter(state=Evaluation.State.EVALUATED)
-        if evaluation.textanswer_review_state == Evaluation.TextAnswerReviewState.REVIEW_URGENT
+        for evaluation in evaluations
+        if evaluation.grading_process_is_finished_without_participants or evaluation.all_participants_are_external
     ]
     return sorted(evaluation_url_tuples, key=lambda evaluation_url_tuple: evaluation_url_tuple[0].full_name)
 
@@ -34,59 +63,76 @@ def get_sorted_evaluation_url_tuples_with_urgent_review() -> list[tuple[Evaluati
 class Command(BaseCommand):
     help = "Sends email reminders X days before evaluation ends and reminds managers to review text answers."
 
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only determine the recipients, send no emails.")
+        parser.add_argument("--stats", action="store_true", help="Print the number of recipients and the durations.")
+
     def handle(self, *args, **options):
         logger.info("send_reminders called.")
-        self.send_student_reminders()
-        self.send_textanswer_reminders()
-        self.send_grade_reminders()
+        for name, send_reminders in [
+            ("Student reminders", self.send_student_reminders),
+            ("Text answer review reminders", self.send_textanswer_reminders),
+            ("Grade reminders", self.send_grade_reminders),
+        ]:
+            start = time.perf_counter()
+            num_recipients = send_reminders(dry_run=options["dry_run"])
+            if options["stats"]:
+                self.stdout.write(f"{name}: {num_recipients} recipients in {time.perf_counter() - start:.2f} seconds")
         logger.info("send_reminders finished.")
 
     @staticmethod
-    def send_student_reminders():
+    def send_student_reminders(*, dry_run: bool) -> int:
         today = datetime.date.today()
         check_dates = [
             today + datetime.timedelta(days=number_of_days)
             for number_of_days in settings.REMIND_X_DAYS_AHEAD_OF_END_DATE
         ]
 
-        recipients = set()
-        for evaluation in Evaluation.objects.filter(
-            state=Evaluation.State.IN_EVALUATION,
-            vote_end_date__in=check_dates,
+        reminder_participations = Evaluation.participants.through.objects.filter(
+            userprofile=OuterRef("pk"),
+            evaluation__state=Evaluation.State.IN_EVALUATION,
+            evaluation__vote_end_date__in=check_dates,
             # only want evaluation which started before yesterday, see Issue#2400
-            vote_start_datetime__date__lt=today - datetime.timedelta(days=1),
-        ):
-            recipients.update(evaluation.due_participants)
-
-        for recipient in recipients:
-            due_evaluations = recipient.get_sorted_due_evaluations()
-
-            # entry 0 is first due evaluation, entry 1 in tuple is number of days
-            first_due_in_days = due_evaluations[0][1]
-
-            EmailTemplate.send_reminder_to_user(
-                recipient, first_due_in_days=first_due_in_days, due_evaluations=due_evaluations
+            evaluation__vote_start_datetime__date__lt=today - datetime.timedelta(days=1),
+        ).filter(
+            ~Exists(
+                Evaluation.voters.through.objects.filter(
+                    userprofile=OuterRef("userprofile"), evaluation=OuterRef("evaluation")
+                )
             )
-        logger.info("Sent due evaluation reminder emails to %d people.", len(recipients))
+        )
+        due_evaluations_by_user = UserProfile.get_sorted_due_evaluations_by_user(
+            UserProfile.objects.filter(Exists(reminder_participations))
+        )
+
+        if not dry_run:
+            if due_evaluations_by_user:
+                EmailTemplate.send_reminders_to_users(list(due_evaluations_by_user.items()))
+            logger.info("Sent due evaluation reminder emails to %d people.", len(due_evaluations_by_user))
+        return len(due_evaluations_by_user)
 
     @staticmethod
-    def send_textanswer_reminders():
-        if datetime.date.today().weekday() in settings.TEXTANSWER_REVIEW_REMINDER_WEEKDAYS:
-            evaluation_url_tuples = get_sorted_evaluation_url_tuples_with_urgent_review()
-            if not evaluation_url_tuples:
-                logger.info("no evaluations require a reminder about text answer review.")
-                return
-
-            for manager in Group.objects.get(name="Manager").user_set.all():
+    def send_textanswer_reminders(*, dry_run: bool) -> int:
+        if datetime.date.today().weekday() not in settings.TEXTANSWER_REVIEW_REMINDER_WEEKDAYS:
+            return 0
+
+        evaluation_url_tuples = get_sorted_evaluation_url_tuples_with_urgent_review()
+        if not evaluation_url_tuples:
+            logger.info("no evaluations require a reminder about text answer review.")
+            return 0
+
+        managers = Group.objects.get(name="Manager").user_set.all()
+        if not dry_run:
+            for manager in managers:
                 EmailTemplate.send_textanswer_reminder_to_user(manager, evaluation_url_tuples)
-
             logger.info("sent text answer review reminders.")
+        return len(managers)
 
     @staticmethod
-    def send_grade_reminders():
+    def send_grade_reminders(*, dry_run: bool) -> int:
         today = MonthAndDay(day=datetime.date.today().day, month=datetime.date.today().month)
         if today not in settings.GRADE_REMINDER_EMAIL_DATES:
-            return
+            return 0
 
         courses_without_final_grades = Course.objects_with_missing_final_grades().order_by("name_en")
         semesters = (
@@ -104,13 +150,17 @@ class Command(BaseCommand):
                 for responsible in course.responsibles.all()
             )
 
+            if dry_run:
+                continue
             for recipient in settings.GRADE_REMINDER_EMAIL_RECIPIENTS:
                 EmailTemplate.send_grade_reminder(
                     recipient, semester, responsibles_and_courses_without_final_grades.items()
                 )
 
-        logger.info(
-            "sent grade document reminders for %d semesters to %d people.",
-            len(semesters),
-            len(settings.GRADE_REMINDER_EMAIL_RECIPIENTS),
-        )
+        if not dry_run:
+            logger.info(
+                "sent grade document reminders for %d semesters to %d people.",
+                len(semesters),
+                len(settings.GRADE_REMINDER_EMAIL_RECIPIENTS),
+            )
+        return len(settings.GRADE_REMINDER_EMAIL_RECIPIENTS) if semesters else 0
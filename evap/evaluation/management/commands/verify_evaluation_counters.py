@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef
+
+from evap.evaluation.management.commands.tools import log_exceptions
+from evap.evaluation.models import Evaluation, EvaluationCounters
+
+
+@log_exceptions
+class Command(BaseCommand):
+    help = "Compares the stored counters of all evaluations with the actual numbers and optionally repairs them."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repair", action="store_true", help="Create missing and fix drifted counters.")
+
+    def handle(self, *args, **options):
+        fields = EvaluationCounters.COUNTER_FIELDS
+        evaluations = (
+            Evaluation.objects.annotate(
+                **{
+                    f"current_{name}": count
+                    for name, count in EvaluationCounters.current_counts(OuterRef("pk")).items()
+                }
+            )
+            .values(
+                "pk", "counters", *(f"counters__{name}" for name in fields), *(f"current_{name}" for name in fields)
+            )
+            .order_by("pk")
+        )
+
+        missing = []
+        drifted = []
+        for values in evaluations:
+            if values["counters"] is None:
+                missing.append(values["pk"])
+                continue
+            differences = [
+                f"{name} {values[f'counters__{name}']} instead of {values[f'current_{name}']}"
+                for name in fields
+                if values[f"counters__{name}"] != values[f"current_{name}"]
+            ]
+            if differences:
+                drifted.append(values["pk"])
+                self.stdout.write(f"Evaluation {values['pk']}: " + ", ".join(differences))
+
+        self.stdout.write(
+            f"{len(missing)} evaluations without counters, {len(drifted)} evaluations with drifted counters."
+        )
+
+        if options["repair"]:
+            EvaluationCounters.create_for(missing)
+            EvaluationCounters.update_for(drifted)
+            self.stdout.write("Counters have been repaired.")
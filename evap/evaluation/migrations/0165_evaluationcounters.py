@@ -0,0 +1,82 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def create_evaluation_counters(apps, _schema_editor):
+    Evaluation = apps.get_model("evaluation", "Evaluation")
+    EvaluationCounters = apps.get_model("evaluation", "EvaluationCounters")
+    TextAnswer = apps.get_model("evaluation", "TextAnswer")
+    Contribution = apps.get_model("evaluation", "Contribution")
+    GradeDocument = apps.get_model("grades", "GradeDocument")
+
+    def count(queryset, group_by):
+        return Coalesce(Subquery(queryset.order_by().values(group_by).annotate(count=Count("pk")).values("count")), 0)
+
+    EvaluationCounters.objects.bulk_create(
+        [EvaluationCounters(evaluation_id=pk) for pk in Evaluation.objects.values_list("pk", flat=True)],
+        batch_size=1000,
+    )
+    textanswers = TextAnswer.objects.filter(contribution__evaluation=OuterRef("evaluation"))
+    grade_documents = GradeDocument.objects.filter(course__evaluations=OuterRef("evaluation"))
+    EvaluationCounters.objects.update(
+        textanswer_count=count(textanswers, "contribution__evaluation"),
+        reviewed_textanswer_count=count(textanswers.exclude(review_decision="UN"), "contribution__evaluation"),
+        contributor_count=count(
+            Contribution.objects.filter(evaluation=OuterRef("evaluation"), contributor__isnull=False), "evaluation"
+        ),
+        midterm_grade_document_count=count(grade_documents.filter(type="MID"), "course"),
+        final_grade_document_count=count(grade_documents.filter(type="FIN"), "course"),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("evaluation", "0164_remove_questionnaire_questionnaire_visibility_choices_and_more"),
+        ("grades", "0018_choices_constraints"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EvaluationCounters",
+            fields=[
+                (
+                    "evaluation",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="counters",
+                        serialize=False,
+                        to="evaluation.evaluation",
+                        verbose_name="evaluation",
+                    ),
+                ),
+                (
+                    "textanswer_count",
+                    models.PositiveIntegerField(default=0, verbose_name="number of text answers"),
+                ),
+                (
+                    "reviewed_textanswer_count",
+                    models.PositiveIntegerField(default=0, verbose_name="number of reviewed text answers"),
+                ),
+                (
+                    "contributor_count",
+                    models.PositiveIntegerField(default=0, verbose_name="number of contributors"),
+                ),
+                (
+                    "midterm_grade_document_count",
+                    models.PositiveIntegerField(default=0, verbose_name="number of midterm grade documents"),
+                ),
+                (
+                    "final_grade_document_count",
+                    models.PositiveIntegerField(default=0, verbose_name="number of final grade documents"),
+                ),
+            ],
+            options={
+                "verbose_name": "evaluation counters",
+                "verbose_name_plural": "evaluation counters",
+            },
+        ),
+        migrations.RunPython(create_evaluation_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("evaluation", "0166_queuedemail"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="evaluation",
+            index=models.Index(fields=["state", "vote_start_datetime"], name="evaluation_state_vote_start"),
+        ),
+        migrations.AddIndex(
+            model_name="evaluation",
+            index=models.Index(fields=["state", "vote_end_date"], name="evaluation_state_vote_end"),
+        ),
+    ]
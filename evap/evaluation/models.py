@@ -7,8 +7,10 @@ from collections.abc import Collection, Container, Iterable, Sequence
 from dataclasses import dataclass
 from datetime import date, datetime, time, timedelta
 from enum import Enum, auto
-from functools import partial
+from functools import lru_cache, partial
+from itertools import batched
 from numbers import Real
+from time import perf_counter
 from typing import Any, cast
 
 from django.conf import settings
@@ -17,13 +19,25 @@ from django.contrib.auth.hashers import check_password, is_password_usable, make
 from django.contrib.auth.models import BaseUserManager, Group, PermissionsMixin
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.postgres.fields import ArrayField
-from django.core.cache import caches
 from django.core.exceptions import ValidationError
-from django.core.mail import EmailMessage, EmailMultiAlternatives
+from django.core.mail import EmailMessage, EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
 from django.db import IntegrityError, models, transaction
-from django.db.models import CheckConstraint, Count, Exists, F, Manager, OuterRef, Q, QuerySet, Subquery, Value
+from django.db.models import (
+    CheckConstraint,
+    Count,
+    Exists,
+    F,
+    Manager,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+    Value,
+    prefetch_related_objects,
+)
 from django.db.models.functions import Coalesce, Lower, NullIf, TruncDate
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import Signal, receiver
 from django.http import HttpRequest
 from django.template import Context, Template
@@ -585,6 +599,11 @@ class Evaluation(LoggedModel):
         ]
         verbose_name = _("evaluation")
         verbose_name_plural = _("evaluations")
+        indexes = [
+            # used by update_evaluations to find the evaluations that begin or end
+            models.Index(fields=["state", "vote_start_datetime"], name="evaluation_state_vote_start"),
+            models.Index(fields=["state", "vote_end_date"], name="evaluation_state_vote_end"),
+        ]
         constraints = [
             CheckConstraint(
                 condition=Q(vote_end_date__gte=TruncDate(F("vote_start_datetime"))),
@@ -600,51 +619,80 @@ class Evaluation(LoggedModel):
         return self.full_name
 
     def save(self, *args, **kw):
+        is_new = self._state.adding
         super().save(*args, **kw)
 
         self.ensure_general_contribution()
+        if is_new:
+            EvaluationCounters.create_for([self.pk])
 
         if hasattr(self, "state_change_source"):
+            Evaluation.update_caches_after_state_changes([(self, self.state_change_source)])
+            del self.state_change_source
+        elif self.state == Evaluation.State.IN_EVALUATION:
+            # edits can change the structure of the results of running evaluations
+            from evap.results.tools import invalidate_live_results  # noqa: PLC0415
 
-            def state_changed_to(self, state_set):
-                return self.state_change_source not in state_set and self.state in state_set
-
-            def state_changed_from(self, state_set):
-                return self.state_change_source in state_set and self.state not in state_set
-
-            # It's clear that results.models will need to reference evaluation.models' classes in ForeignKeys.
-            # However, this method only makes sense as a method of Evaluation. Thus, we can't get rid of these imports
-            from evap.results.tools import (  # noqa: PLC0415
-                STATES_WITH_RESULT_TEMPLATE_CACHING,
-                STATES_WITH_RESULTS_CACHING,
-            )
-
-            if (
-                state_changed_to(self, STATES_WITH_RESULTS_CACHING)
-                or self.state_change_source == Evaluation.State.EVALUATED
-                and self.state == Evaluation.State.REVIEWED
-            ):  # reviewing changes results -> cache update required
-                from evap.results.tools import cache_results  # noqa: PLC0415
+            invalidate_live_results(self)
 
-                cache_results(self)
-            elif state_changed_from(self, STATES_WITH_RESULTS_CACHING):
-                from evap.results.tools import get_results_cache_key  # noqa: PLC0415
+    @staticmethod
+    def update_caches_after_state_changes(state_changes: "Sequence[tuple[Evaluation, int]]") -> None:
+        """
+        Updates the cached results and result templates of the evaluations, given with the state they were in before.
+        The results of all evaluations and the templates of all their courses are cached together.
+        """
+        # It's clear that results.models will need to reference evaluation.models' classes in ForeignKeys.
+        # However, this method only makes sense as a method of Evaluation. Thus, we can't get rid of these imports
+        from evap.results.tools import (  # noqa: PLC0415
+            STATES_WITH_RESULT_TEMPLATE_CACHING,
+            STATES_WITH_RESULTS_CACHING,
+            cache_results_many,
+            delete_cached_results,
+            delete_grade_summary,
+            invalidate_live_results,
+            update_course_grade_summaries,
+        )
+        from evap.results.views import (  # noqa: PLC0415
+            delete_template_cache,
+            update_template_cache_of_published_evaluations_in_courses,
+        )
 
-                caches["results"].delete(get_results_cache_key(self))
+        def state_changed_to(evaluation, source, state_set):
+            return source not in state_set and evaluation.state in state_set
 
-            if state_changed_to(self, STATES_WITH_RESULT_TEMPLATE_CACHING):
-                from evap.results.views import update_template_cache_of_published_evaluations_in_course  # noqa: PLC0415
+        def state_changed_from(evaluation, source, state_set):
+            return source in state_set and evaluation.state not in state_set
 
-                update_template_cache_of_published_evaluations_in_course(self.course)
-            elif state_changed_from(self, STATES_WITH_RESULT_TEMPLATE_CACHING):
-                from evap.results.views import (  # noqa: PLC0415
-                    delete_template_cache,
-                    update_template_cache_of_published_evaluations_in_course,
-                )
+        evaluations_to_cache = []
+        courses_to_update = {}
+        courses_with_new_templates = set()
+        for evaluation, source in state_changes:
+            invalidate_live_results(evaluation)
 
-                delete_template_cache(self)
-                update_template_cache_of_published_evaluations_in_course(self.course)
-            del self.state_change_source
+            if (
+                state_changed_to(evaluation, source, STATES_WITH_RESULTS_CACHING)
+                or source == Evaluation.State.EVALUATED
+                and evaluation.state == Evaluation.State.REVIEWED
+            ):  # reviewing changes results -> cache update required
+                evaluations_to_cache.append(evaluation)
+            elif state_changed_from(evaluation, source, STATES_WITH_RESULTS_CACHING):
+                delete_cached_results(evaluation)
+                delete_grade_summary(evaluation)
+
+            if state_changed_to(evaluation, source, STATES_WITH_RESULT_TEMPLATE_CACHING):
+                courses_with_new_templates.add(evaluation.course_id)
+                courses_to_update[evaluation.course_id] = evaluation.course
+            elif state_changed_from(evaluation, source, STATES_WITH_RESULT_TEMPLATE_CACHING):
+                delete_template_cache(evaluation)
+                courses_to_update[evaluation.course_id] = evaluation.course
+
+        if evaluations_to_cache:
+            cache_results_many(evaluations_to_cache)
+        if courses_with_new_templates:
+            # the weights of the course's evaluations could have changed since their results were cached
+            update_course_grade_summaries(courses_with_new_templates)
+        if courses_to_update:
+            update_template_cache_of_published_evaluations_in_courses(list(courses_to_update.values()))
 
     @property
     def full_name(self):
@@ -810,10 +858,14 @@ class Evaluation(LoggedModel):
 
     @property
     def can_publish_average_grade(self):
+        return self.can_publish_average_grade_for(self.num_voters, self.num_participants)
+
+    @staticmethod
+    def can_publish_average_grade_for(num_voters: int, num_participants: int) -> bool:
         # the average grade is only published if at least the configured percentage of participants voted during the evaluation for significance reasons
         return (
-            self.can_publish_rating_results
-            and self.num_voters / self.num_participants >= settings.VOTER_PERCENTAGE_NEEDED_FOR_PUBLISHING_AVERAGE_GRADE
+            num_voters >= settings.VOTER_COUNT_NEEDED_FOR_PUBLISHING_RATING_RESULTS
+            and num_voters / num_participants >= settings.VOTER_PERCENTAGE_NEEDED_FOR_PUBLISHING_AVERAGE_GRADE
         )
 
     @property
@@ -853,6 +905,8 @@ class Evaluation(LoggedModel):
         if delete_previous_answers:
             for answer_class in Answer.__subclasses__():
                 answer_class._default_manager.filter(contribution__evaluation=self).delete()
+            EvaluationCounters.update_for([self.pk])
+            self.queued_votes.all().delete()
             self.voters.clear()
 
     @transition(
@@ -875,7 +929,11 @@ class Evaluation(LoggedModel):
 
     @transition(field=state, source=State.IN_EVALUATION, target=State.EVALUATED)
     def end_evaluation(self):
-        pass
+        # all answers must be known for reviewing and publishing the results
+        from evap.student.tools import process_queued_votes  # noqa: PLC0415
+
+        while process_queued_votes(batch_size=1000, evaluation=self):
+            pass
 
     @transition(
         field=state,
@@ -912,6 +970,7 @@ class Evaluation(LoggedModel):
         else:
             self.textanswer_set.filter(review_decision=TextAnswer.ReviewDecision.DELETED).delete()
             self.textanswer_set.update(original_answer=None)
+        EvaluationCounters.update_for([self.pk])
 
     @transition(field=state, source=State.PUBLISHED, target=State.REVIEWED)
     def unpublish(self):
@@ -1080,12 +1139,22 @@ class Evaluation(LoggedModel):
 
         evaluations_new_in_evaluation = []
         evaluation_results_evaluations = []
-
-        for evaluation in cls.objects.all():
+        state_changes = []
+
+        current_datetime = datetime.now()
+        # evaluations end at the vote_end_datetime of their vote_end_date
+        latest_ended_vote_end_date = (
+            current_datetime - timedelta(hours=24 + settings.EVALUATION_END_OFFSET_HOURS)
+        ).date()
+        candidates = cls.objects.filter(
+            Q(state=Evaluation.State.APPROVED, vote_start_datetime__lte=current_datetime)
+            | Q(state=Evaluation.State.IN_EVALUATION, vote_end_date__lte=latest_ended_vote_end_date)
+        ).select_related("course")
+
+        for evaluation in candidates:
             try:
                 if evaluation.state == Evaluation.State.APPROVED and evaluation.vote_start_datetime <= datetime.now():
                     evaluation.begin_evaluation()
-                    evaluation.save()
                     evaluations_new_in_evaluation.append(evaluation)
                 elif (
                     evaluation.state == Evaluation.State.IN_EVALUATION
@@ -1097,7 +1166,13 @@ class Evaluation(LoggedModel):
                         if evaluation.grading_process_is_finished:
                             evaluation.publish()
                             evaluation_results_evaluations.append(evaluation)
-                    evaluation.save()
+                else:
+                    continue
+                # the caches of all changed evaluations are updated together below
+                state_change_source = evaluation.__dict__.pop("state_change_source", None)
+                evaluation.save()
+                if state_change_source is not None:
+                    state_changes.append((evaluation, state_change_source))
             except Exception:  # noqa: PERF203
                 if settings.DEBUG:
                     raise
@@ -1105,6 +1180,13 @@ class Evaluation(LoggedModel):
                     'An error occured when updating the state of evaluation "%s" (id %d).', evaluation, evaluation.id
                 )
 
+        try:
+            cls.update_caches_after_state_changes(state_changes)
+        except Exception:
+            if settings.DEBUG:
+                raise
+            logger.exception("An error occured when updating the caches of %d evaluations.", len(state_changes))
+
         template = EmailTemplate.objects.get(name=EmailTemplate.EVALUATION_STARTED)
         template.send_to_users_in_evaluations(
             evaluations_new_in_evaluation, [EmailTemplate.Recipients.ALL_PARTICIPANTS], use_cc=False, request=None
@@ -1163,6 +1245,90 @@ def log_state_transition(instance, name, source: int, target: int, **_kwargs):
     )
 
 
+class EvaluationCounters(models.Model):
+    """
+    Numbers of the text answers, contributors and grade documents of an evaluation. Lists of many evaluations use these
+    instead of counting the related objects, which needs expensive joins. The code changing these objects updates the
+    counters, and the verify_evaluation_counters command finds and repairs any remaining drift.
+    """
+
+    evaluation = models.OneToOneField(
+        Evaluation, models.CASCADE, primary_key=True, related_name="counters", verbose_name=_("evaluation")
+    )
+    textanswer_count = models.PositiveIntegerField(default=0, verbose_name=_("number of text answers"))
+    reviewed_textanswer_count = models.PositiveIntegerField(
+        default=0, verbose_name=_("number of reviewed text answers")
+    )
+    contributor_count = models.PositiveIntegerField(default=0, verbose_name=_("number of contributors"))
+    midterm_grade_document_count = models.PositiveIntegerField(
+        default=0, verbose_name=_("number of midterm grade documents")
+    )
+    final_grade_document_count = models.PositiveIntegerField(
+        default=0, verbose_name=_("number of final grade documents")
+    )
+
+    COUNTER_FIELDS = [
+        "textanswer_count",
+        "reviewed_textanswer_count",
+        "contributor_count",
+        "midterm_grade_document_count",
+        "final_grade_document_count",
+    ]
+
+    class Meta:
+        verbose_name = _("evaluation counters")
+        verbose_name_plural = _("evaluation counters")
+
+    @staticmethod
+    def current_counts(evaluation: OuterRef) -> dict[str, Coalesce]:
+        """Subqueries counting the objects of the referenced evaluation, keyed by counter field"""
+        from evap.grades.models import GradeDocument  # noqa: PLC0415
+
+        def count(queryset: QuerySet, group_by: str) -> Coalesce:
+            return Coalesce(
+                Subquery(queryset.order_by().values(group_by).annotate(count=Count("pk")).values("count")), 0
+            )
+
+        textanswers = TextAnswer.objects.filter(contribution__evaluation=evaluation)
+        grade_documents = GradeDocument.objects.filter(course__evaluations=evaluation)
+        return {
+            "textanswer_count": count(textanswers, "contribution__evaluation"),
+            "reviewed_textanswer_count": count(
+                textanswers.exclude(review_decision=TextAnswer.ReviewDecision.UNDECIDED), "contribution__evaluation"
+            ),
+            "contributor_count": count(
+                Contribution.objects.filter(evaluation=evaluation, contributor__isnull=False), "evaluation"
+            ),
+            "midterm_grade_document_count": count(
+                grade_documents.filter(type=GradeDocument.Type.MIDTERM_GRADES), "course"
+            ),
+            "final_grade_document_count": count(grade_documents.filter(type=GradeDocument.Type.FINAL_GRADES), "course"),
+        }
+
+    @classmethod
+    def counts(cls) -> dict[str, Coalesce]:
+        """
+        Expressions for annotating evaluations with their counts, keyed by counter field. Evaluations without counters,
+        e.g. because they were bulk created, are counted directly.
+        """
+        return {
+            name: Coalesce(f"counters__{name}", current_count)
+            for name, current_count in cls.current_counts(OuterRef("pk")).items()
+        }
+
+    @classmethod
+    def update_for(cls, evaluations: "Iterable[Evaluation | int] | QuerySet[Evaluation]") -> None:
+        """Recounts the counters of the given evaluations. Evaluations without counters are skipped."""
+        cls.objects.filter(evaluation__in=evaluations).update(**cls.current_counts(OuterRef("evaluation")))
+
+    @classmethod
+    def create_for(cls, evaluation_ids: Collection[int]) -> None:
+        cls.objects.bulk_create(
+            [cls(evaluation_id=evaluation_id) for evaluation_id in evaluation_ids], ignore_conflicts=True
+        )
+        cls.update_for(evaluation_ids)
+
+
 class Contribution(LoggedModel):
     """A contributor who is assigned to an evaluation and their questionnaires."""
 
@@ -1231,6 +1397,14 @@ class Contribution(LoggedModel):
         assert set(Answer.__subclasses__()) == {TextAnswer, RatingAnswerCounter}
         TextAnswer.objects.filter(contribution=self, assignment__questionnaire__in=questionnaires).delete()
         RatingAnswerCounter.objects.filter(contribution=self, assignment__questionnaire__in=questionnaires).delete()
+        EvaluationCounters.update_for([self.evaluation_id])
+
+
+@receiver(post_save, sender=Contribution)
+@receiver(post_delete, sender=Contribution)
+def update_contributor_count(instance: Contribution, **_kwargs):
+    # this only updates existing counters. Creating them could conflict with the deletion of the evaluation.
+    EvaluationCounters.update_for([instance.evaluation_id])
 
 
 class QuestionType:
@@ -2166,13 +2340,36 @@ class UserProfile(EvapBaseUser, PermissionsMixin):
         return self.evaluations_voted_for.order_by("course__semester__created_at", "name_de")
 
     def get_sorted_due_evaluations(self):
-        evaluations_and_days_left = (
-            (evaluation, evaluation.days_left_for_evaluation)
-            for evaluation in Evaluation.objects.filter(
-                participants=self, state=Evaluation.State.IN_EVALUATION
-            ).exclude(voters=self)
+        return UserProfile.get_sorted_due_evaluations_by_user(UserProfile.objects.filter(pk=self.pk)).get(self, [])
+
+    @staticmethod
+    def get_sorted_due_evaluations_by_user(
+        users: "QuerySet[UserProfile]",
+    ) -> "dict[UserProfile, list[tuple[Evaluation, int]]]":
+        """The due evaluations and their days left of all given users that have any, fetched with a single query"""
+        participations = (
+            Evaluation.participants.through.objects.filter(
+                userprofile__in=users, evaluation__state=Evaluation.State.IN_EVALUATION
+            )
+            .filter(
+                ~Exists(
+                    Evaluation.voters.through.objects.filter(
+                        userprofile=OuterRef("userprofile"), evaluation=OuterRef("evaluation")
+                    )
+                )
+            )
+            .select_related("userprofile", "evaluation__course")
         )
-        return sorted(evaluations_and_days_left, key=lambda tup: (tup[1], tup[0].full_name))
+        evaluations_and_days_left_by_user = defaultdict(list)
+        for participation in participations:
+            evaluation = participation.evaluation
+            evaluations_and_days_left_by_user[participation.userprofile].append(
+                (evaluation, evaluation.days_left_for_evaluation)
+            )
+        return {
+            user: sorted(evaluations_and_days_left, key=lambda tup: (tup[1], tup[0].full_name))
+            for user, evaluations_and_days_left in evaluations_and_days_left_by_user.items()
+        }
 
 
 def validate_template(value):
@@ -2184,6 +2381,21 @@ def validate_template(value):
         raise ValidationError(str(e)) from e
 
 
+@lru_cache(maxsize=256)
+def compile_email_template(text: str) -> Template:
+    """
+    Compiles the contents of an email template. The compiled templates are cached by their content, so that sending an
+    email to many users parses each template only once.
+    """
+    return Template(text)
+
+
+@dataclass
+class EmailDispatchResult:
+    sent: int = 0
+    failed: int = 0
+
+
 class EmailTemplate(models.Model):
     name = models.CharField(max_length=1024, unique=True, verbose_name=_("Name"))
 
@@ -2209,6 +2421,11 @@ class EmailTemplate(models.Model):
         EDITORS = "editors", _("all editors")
         CONTRIBUTORS = "contributors", _("all contributors")
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # the outdated contents would never be used again
+        compile_email_template.cache_clear()
+
     @classmethod
     @typeguard_ignore  # workaround for typeguard issue with Recipients here
     def recipient_list_for_evaluation(
@@ -2254,7 +2471,7 @@ class EmailTemplate(models.Model):
 
     @staticmethod
     def render_string(text: str, dictionary: dict[str, Any], *, autoescape: bool = True) -> str:
-        result = Template(text).render(Context(dictionary, autoescape))
+        result = compile_email_template(text).render(Context(dictionary, autoescape))
 
         if autoescape:
             return result
@@ -2278,6 +2495,10 @@ class EmailTemplate(models.Model):
             for user in recipients:
                 user_evaluation_map.setdefault(user, []).append(evaluation)
 
+        due_evaluations_by_user = UserProfile.get_sorted_due_evaluations_by_user(
+            UserProfile.objects.filter(pk__in=[user.pk for user in user_evaluation_map])
+        )
+        recipients = []
         for user, user_evaluations in user_evaluation_map.items():
             remaining_days_by_evaluation = {
                 evaluation: (evaluation.vote_end_date - date.today()).days for evaluation in user_evaluations
@@ -2286,9 +2507,10 @@ class EmailTemplate(models.Model):
             body_params = {
                 "user": user,
                 "evaluations": evaluations_with_days,
-                "due_evaluations": user.get_sorted_due_evaluations(),
+                "due_evaluations": due_evaluations_by_user.get(user, []),
             }
-            self.send_to_user(user, subject_params={}, body_params=body_params, use_cc=use_cc, request=request)
+            recipients.append((user, {}, body_params))
+        self.send_to_users(recipients, use_cc=use_cc, request=request)
 
     def send_to_user(
         self,
@@ -2300,24 +2522,115 @@ class EmailTemplate(models.Model):
         additional_cc_users: Iterable[UserProfile] = (),
         request: HttpRequest | None = None,
     ) -> None:
-        if not user.email:
-            message = gettext_noop("{} has no email address defined. Could not send email.")
-            log_message = message.format(user.full_name_with_additional_info)
-            # If this method is triggered by a cronjob changing evaluation states, the request is None.
-            # In this case warnings should be sent to the admins via email (configured in the settings for logger.error).
-            # If a request exists, the page is displayed in the browser and the message can be shown on the page (messages.warning).
-            if request is not None:
-                logger.warning(log_message)
-                messages.warning(request, _(message).format(user.full_name_with_additional_info))
-            else:
-                logger.error(log_message)
-            return
+        self.send_to_users(
+            [(user, subject_params, body_params)],
+            use_cc=use_cc,
+            additional_cc_users=additional_cc_users,
+            request=request,
+        )
 
+    def send_to_users(
+        self,
+        recipients: Iterable[tuple[UserProfile, dict[str, Any], dict[str, Any]]],
+        *,
+        use_cc: bool,
+        additional_cc_users: Iterable[UserProfile] = (),
+        request: HttpRequest | None = None,
+    ) -> EmailDispatchResult:
+        """
+        Sends the email to each user with the given subject and body parameters. The delegates and CC users of all
+        recipients are fetched up front, and the emails are rendered and sent in batches over a single connection.
+        If settings.EMAIL_OUTBOX is enabled, the emails are put into the outbox instead.
+        """
+        recipients = list(recipients)
+        additional_cc_users = list(additional_cc_users)
+        if use_cc:
+            prefetch_related_objects(
+                [user for user, __, __ in recipients] + additional_cc_users, "delegates", "cc_users"
+            )
+
+        result = EmailDispatchResult()
+        users_needing_login_url = []
+        connection = get_connection()
+        try:
+            for batch_number, batch in enumerate(batched(recipients, settings.EMAIL_BATCH_SIZE, strict=False), start=1):
+                start = perf_counter()
+                batch_result = EmailDispatchResult()
+                batch_mails = []
+                for user, subject_params, body_params in batch:
+                    if not user.email:
+                        self._report_missing_email_address(user, request)
+                        batch_result.failed += 1
+                        continue
+
+                    mail, send_separate_login_url = self._construct_mail_for_user(
+                        user, subject_params, body_params, use_cc, additional_cc_users
+                    )
+                    batch_mails.append((user, mail, send_separate_login_url))
+
+                if settings.EMAIL_OUTBOX:
+                    QueuedEmail.enqueue([mail for __, mail, __ in batch_mails])
+                    sent_mails = batch_mails
+                else:
+                    sent_mails = [
+                        (user, mail, send_separate_login_url)
+                        for user, mail, send_separate_login_url in batch_mails
+                        if self._send_mail(connection, mail, user.full_name_with_additional_info)
+                    ]
+                batch_result.sent += len(sent_mails)
+                batch_result.failed += len(batch_mails) - len(sent_mails)
+                users_needing_login_url.extend(
+                    user for user, __, send_separate_login_url in sent_mails if send_separate_login_url
+                )
+
+                duration = perf_counter() - start
+                logger.info(
+                    'Sent batch %d of email "%s": %d sent, %d failed in %.1f seconds (%.1f emails per second).',
+                    batch_number,
+                    self.name,
+                    batch_result.sent,
+                    batch_result.failed,
+                    duration,
+                    batch_result.sent / duration if duration else 0,
+                )
+                result.sent += batch_result.sent
+                result.failed += batch_result.failed
+        finally:
+            connection.close()
+
+        if users_needing_login_url:
+            self.send_login_url_to_users(users_needing_login_url)
+
+        return result
+
+    @staticmethod
+    def _report_missing_email_address(user: UserProfile, request: HttpRequest | None) -> None:
+        message = gettext_noop("{} has no email address defined. Could not send email.")
+        log_message = message.format(user.full_name_with_additional_info)
+        # If this method is triggered by a cronjob changing evaluation states, the request is None.
+        # In this case warnings should be sent to the admins via email (configured in the settings for logger.error).
+        # If a request exists, the page is displayed in the browser and the message can be shown on the page (messages.warning).
+        if request is not None:
+            logger.warning(log_message)
+            messages.warning(request, _(message).format(user.full_name_with_additional_info))
+        else:
+            logger.error(log_message)
+
+    def _construct_mail_for_user(
+        self,
+        user: UserProfile,
+        subject_params: dict[str, Any],
+        body_params: dict[str, Any],
+        use_cc: bool,
+        additional_cc_users: Collection[UserProfile],
+    ) -> tuple[EmailMessage, bool]:
+        """Returns the email for the user and whether their login URL must be sent separately"""
         cc_users = set(additional_cc_users)
 
         if use_cc:
-            users = {user, *additional_cc_users}
-            cc_users |= set(UserProfile.objects.filter(Q(represented_users__in=users) | Q(ccing_users__in=users)))
+            # the delegates and CC users are prefetched for all recipients
+            for cc_user in {user, *additional_cc_users}:
+                cc_users.update(cc_user.delegates.all(), cc_user.cc_users.all())
 
         cc_addresses = [p.email for p in cc_users if p.email]
 
@@ -2330,35 +2643,38 @@ class EmailTemplate(models.Model):
             else:
                 send_separate_login_url = True
 
-        mail = self.construct_mail(user.email, cc_addresses, subject_params, body_params)
+        return self.construct_mail(user.email, cc_addresses, subject_params, body_params), send_separate_login_url
 
+    @staticmethod
+    def _send_mail(connection: BaseEmailBackend, mail: EmailMessage, recipient_name: str) -> bool:
+        """Sends the email over the connection and logs the outcome. Returns whether it was sent."""
         try:
-            mail.send(fail_silently=False)
-            if cc_addresses:
-                logger.info(
-                    'Sent email "%s" to %s (%s), CC: %s.',
-                    mail.subject,
-                    user.full_name,
-                    user.email,
-                    ", ".join(cc_addresses),
-                )
-            else:
-                logger.info('Sent email "%s" to %s (%s).', mail.subject, user.full_name, user.email)
-            if send_separate_login_url:
-                self.send_login_url_to_user(user)
+            connection.send_messages([mail])
         except Exception:
             if settings.DEBUG:
                 raise
             logger.exception(
                 'An exception occurred when sending the following email to user "%s":\n%s\n',
-                user.full_name_with_additional_info,
+                recipient_name,
                 mail.message(),
             )
+            # the next email opens a new connection in case this one is broken
+            connection.close()
+            return False
+
+        if mail.cc:
+            logger.info('Sent email "%s" to %s, CC: %s.', mail.subject, ", ".join(mail.to), ", ".join(mail.cc))
+        else:
+            logger.info('Sent email "%s" to %s.', mail.subject, ", ".join(mail.to))
+        return True
 
     def send_to_address(
         self, recipient_email: str, subject_params: dict[str, Any], body_params: dict[str, Any]
     ) -> None:
         mail = self.construct_mail(recipient_email, [], subject_params, body_params)
+        if settings.EMAIL_OUTBOX:
+            QueuedEmail.enqueue([mail])
+            return
         try:
             mail.send(fail_silently=False)
             logger.info('Sent email "%s" to %s', mail.subject, recipient_email)
@@ -2400,20 +2716,28 @@ class EmailTemplate(models.Model):
         )
 
     @classmethod
-    def send_reminder_to_user(
-        cls, user: UserProfile, first_due_in_days: int, due_evaluations: Iterable[Evaluation]
+    def send_reminders_to_users(
+        cls, due_evaluations_by_user: Iterable[tuple[UserProfile, Sequence[tuple[Evaluation, int]]]]
     ) -> None:
+        """Sends a reminder to each user about their due evaluations, which are sorted by their days left"""
         template = cls.objects.get(name=cls.STUDENT_REMINDER)
-        subject_params = {"user": user, "first_due_in_days": first_due_in_days}
-        body_params = {"user": user, "first_due_in_days": first_due_in_days, "due_evaluations": due_evaluations}
+        recipients = []
+        for user, due_evaluations in due_evaluations_by_user:
+            first_due_in_days = due_evaluations[0][1]
+            subject_params = {"user": user, "first_due_in_days": first_due_in_days}
+            body_params = {"user": user, "first_due_in_days": first_due_in_days, "due_evaluations": due_evaluations}
+            recipients.append((user, subject_params, body_params))
 
-        template.send_to_user(user, subject_params=subject_params, body_params=body_params, use_cc=False)
+        template.send_to_users(recipients, use_cc=False)
 
     @classmethod
     def send_login_url_to_user(cls, user: UserProfile) -> None:
+        cls.send_login_url_to_users([user])
+
+    @classmethod
+    def send_login_url_to_users(cls, users: Iterable[UserProfile]) -> None:
         template = cls.objects.get(name=cls.LOGIN_KEY_CREATED)
-        template.send_to_user(user, subject_params={}, body_params={"user": user}, use_cc=False)
-        logger.info("Sent login url email to %s.", user.email)
+        template.send_to_users([(user, {}, {"user": user}) for user in users], use_cc=False)
 
     @classmethod
     def send_contributor_publish_notifications(
@@ -2446,9 +2770,13 @@ class EmailTemplate(models.Model):
                     if textanswer.contribution.contributor:
                         evaluations_per_contributor[textanswer.contribution.contributor].add(evaluation)
 
-        for contributor, evaluation_set in evaluations_per_contributor.items():
-            body_params = {"user": contributor, "evaluations": evaluation_set}
-            template.send_to_user(contributor, subject_params={}, body_params=body_params, use_cc=True)
+        template.send_to_users(
+            [
+                (contributor, {}, {"user": contributor, "evaluations": evaluation_set})
+                for contributor, evaluation_set in evaluations_per_contributor.items()
+            ],
+            use_cc=True,
+        )
 
     @classmethod
     def send_participant_publish_notifications(
@@ -2465,9 +2793,13 @@ class EmailTemplate(models.Model):
                 for participant in evaluation.participants.all():
                     evaluations_per_participant[participant].add(evaluation)
 
-        for participant, evaluation_set in evaluations_per_participant.items():
-            body_params = {"user": participant, "evaluations": evaluation_set}
-            template.send_to_user(participant, subject_params={}, body_params=body_params, use_cc=True)
+        template.send_to_users(
+            [
+                (participant, {}, {"user": participant, "evaluations": evaluation_set})
+                for participant, evaluation_set in evaluations_per_participant.items()
+            ],
+            use_cc=True,
+        )
 
     @classmethod
     def send_textanswer_reminder_to_user(
@@ -2496,6 +2828,60 @@ class EmailTemplate(models.Model):
         )
 
 
+class QueuedEmail(models.Model):
+    """
+    An email that has not been sent yet, see settings.EMAIL_OUTBOX. The process_email_outbox command sends queued emails
+    and retries failed ones later.
+    """
+
+    subject = models.TextField()
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    to = ArrayField(models.TextField())
+    cc = ArrayField(models.TextField(), default=list)
+    bcc = ArrayField(models.TextField(), default=list)
+    headers = models.JSONField(default=dict)
+
+    queued_at = models.DateTimeField(default=now)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=now, db_index=True)
+    last_error = models.TextField(blank=True)
+
+    @classmethod
+    def enqueue(cls, mails: Iterable[EmailMessage]) -> None:
+        """Puts the emails into the outbox. They are sent after the current transaction has been committed."""
+        queued_emails = cls.objects.bulk_create(
+            [
+                cls(
+                    subject=mail.subject,
+                    body=mail.body,
+                    html_body=next(
+                        (content for content, mimetype in getattr(mail, "alternatives", []) if mimetype == "text/html"),
+                        "",
+                    ),
+                    to=mail.to,
+                    cc=mail.cc,
+                    bcc=mail.bcc,
+                    headers=mail.extra_headers,
+                )
+                for mail in mails
+            ]
+        )
+        for queued_email in queued_emails:
+            logger.info('Queued email "%s" to %s.', queued_email.subject, ", ".join(queued_email.to))
+
+    def to_mail(self) -> EmailMultiAlternatives:
+        return EmailMultiAlternatives(
+            subject=self.subject,
+            body=self.body,
+            to=self.to,
+            cc=self.cc,
+            bcc=self.bcc,
+            headers=self.headers,
+            alternatives=[(self.html_body, "text/html")] if self.html_body else [],
+        )
+
+
 class VoteTimestamp(models.Model):
     evaluation = models.ForeignKey(Evaluation, models.CASCADE)
     timestamp = models.DateTimeField(verbose_name=_("vote timestamp"), default=now)
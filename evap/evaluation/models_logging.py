@@ -1,7 +1,7 @@
 import itertools
 import threading
 from collections import defaultdict, namedtuple
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
 from contextlib import contextmanager
 from datetime import date, datetime, time
 from enum import StrEnum
@@ -307,6 +307,24 @@ class LoggedModel(models.Model):
         LogEntry.objects.bulk_create(to_create)
         LogEntry.objects.bulk_update(to_update, ["data"])
 
+    @staticmethod
+    def update_log_after_m2m_bulk_changes(
+        m2m_field: str, changes: Iterable[tuple["LoggedModel", FieldActionType, list[int]]]
+    ) -> None:
+        """
+        Log changes of an m2m field that were written to the through table directly, without m2m_changed signals.
+        Each change consists of the instance, the action type and the primary keys of the added or removed objects.
+        """
+        changed_instances = {}
+        for instance, action_type, change_list in changes:
+            if change_list and m2m_field not in instance.unlogged_fields:
+                instance.log_m2m_change(m2m_field, action_type, change_list, store_in_db=False)
+                changed_instances[instance.pk] = instance
+
+        logentries = [instance._logentry for instance in changed_instances.values() if instance._logentry is not None]
+        LogEntry.objects.bulk_create([logentry for logentry in logentries if logentry.pk is None])
+        LogEntry.objects.bulk_update([logentry for logentry in logentries if logentry.pk is not None], ["data"])
+
     def related_logentries(self):
         """
         Return a queryset with all logentries that should be shown with this model.
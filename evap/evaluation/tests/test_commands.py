@@ -3,16 +3,20 @@ from collections import defaultdict
 from datetime import date, datetime, timedelta
 from io import StringIO
 from itertools import chain, cycle
+from smtplib import SMTPException
 from unittest.mock import MagicMock, call, patch
 
 from django.conf import settings
 from django.contrib.auth.hashers import make_password
 from django.core import mail, management
+from django.core.cache import caches
 from django.core.management import CommandError
 from django.db.models import Sum
 from django.test.utils import override_settings
 from model_bakery import baker
 
+from evap.evaluation.management.commands.refresh_results_cache import Command as RefreshResultsCacheCommand
+from evap.evaluation.management.commands.send_reminders import get_sorted_evaluation_url_tuples_with_urgent_review
 from evap.evaluation.models import (
     CHOICES,
     NO_ANSWER,
@@ -20,14 +24,22 @@ from evap.evaluation.models import (
     Course,
     EmailTemplate,
     Evaluation,
+    EvaluationCounters,
     QuestionAssignment,
     Questionnaire,
+    QueuedEmail,
     RatingAnswerCounter,
     Semester,
     TextAnswer,
     UserProfile,
 )
 from evap.evaluation.tests.tools import TestCase, make_manager, make_rating_answer_counters
+from evap.results.models import EvaluationGradeSummary
+from evap.results.tools import get_results_cache_key
+from evap.results.views import (
+    get_course_result_template_fragment_cache_key,
+    get_evaluation_result_template_fragment_cache_key,
+)
 from evap.tools import MonthAndDay
 
 
@@ -185,10 +197,114 @@ class TestRefreshResultsCacheCommand(TestCase):
     def test_calls_cache_results(self):
         baker.make(Evaluation, state=Evaluation.State.PUBLISHED)
 
-        with patch("evap.evaluation.management.commands.refresh_results_cache.cache_results") as mock:
+        with patch("evap.evaluation.management.commands.refresh_results_cache.cache_results_many") as mock:
             management.call_command("refresh_results_cache", stdout=StringIO())
 
-        self.assertEqual(mock.call_count, Evaluation.objects.count())
+        self.assertEqual(
+            [evaluation for call_args in mock.call_args_list for evaluation in call_args.args[0]],
+            list(Evaluation.objects.all()),
+        )
+
+    def test_caches_results_and_templates(self):
+        course = baker.make(Course)
+        evaluations = baker.make(
+            Evaluation,
+            course=course,
+            state=Evaluation.State.PUBLISHED,
+            _quantity=2,
+            _fill_optional=["name_de", "name_en"],
+        )
+        other_evaluation = baker.make(Evaluation, state=Evaluation.State.REVIEWED)
+        caches["results"].clear()
+
+        management.call_command("refresh_results_cache", "--chunk-size=1", stdout=StringIO())
+
+        for evaluation in [*evaluations, other_evaluation]:
+            self.assertTrue(caches["results"].has_key(get_results_cache_key(evaluation)))
+        for evaluation in evaluations:
+            self.assertTrue(
+                caches["results"].has_key(get_evaluation_result_template_fragment_cache_key(evaluation.id, "de", False))
+            )
+        self.assertTrue(caches["results"].has_key(get_course_result_template_fragment_cache_key(course.id, "en")))
+        self.assertEqual(EvaluationGradeSummary.objects.count(), 3)
+        self.assertFalse(
+            caches["results"].has_key(
+                get_evaluation_result_template_fragment_cache_key(other_evaluation.id, "en", True)
+            )
+        )
+
+    def test_parallel_jobs(self):
+        evaluations = baker.make(
+            Evaluation,
+            course=iter(baker.make(Course, _quantity=3)),
+            state=Evaluation.State.PUBLISHED,
+            _quantity=3,
+            _fill_optional=["name_de", "name_en"],
+        )
+        caches["results"].clear()
+
+        class InProcessExecutor:
+            # worker processes would not see the data of the test transaction
+            def __init__(self, max_workers, initializer):
+                self.max_workers = max_workers
+                initializer()
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                pass
+
+            def map(self, fn, *iterables):
+                return map(fn, *iterables)
+
+        command_module = "evap.evaluation.management.commands.refresh_results_cache"
+        with (
+            patch(f"{command_module}.ProcessPoolExecutor", wraps=InProcessExecutor) as executor_mock,
+            patch(f"{command_module}.connections.close_all") as close_all_mock,
+        ):
+            management.call_command("refresh_results_cache", "--jobs=2", "--chunk-size=1", stdout=StringIO())
+
+        executor_mock.assert_called_once()
+        self.assertEqual(executor_mock.call_args.kwargs["max_workers"], 2)
+        close_all_mock.assert_called_once()
+        for evaluation in evaluations:
+            self.assertTrue(caches["results"].has_key(get_results_cache_key(evaluation)))
+            self.assertTrue(
+                caches["results"].has_key(get_evaluation_result_template_fragment_cache_key(evaluation.id, "en", True))
+            )
+        self.assertEqual(EvaluationGradeSummary.objects.count(), 3)
+
+    def test_only_missing(self):
+        cached_evaluation, missing_evaluation = baker.make(Evaluation, state=Evaluation.State.PUBLISHED, _quantity=2)
+        caches["results"].clear()
+        management.call_command("refresh_results_cache", stdout=StringIO())
+        caches["results"].delete(get_results_cache_key(missing_evaluation))
+
+        with patch("evap.evaluation.management.commands.refresh_results_cache.cache_results_many") as mock:
+            management.call_command("refresh_results_cache", "--only-missing", stdout=StringIO())
+
+        self.assertEqual(list(mock.call_args.args[0]), [missing_evaluation])
+
+    def test_course_chunks(self):
+        first_course, second_course, third_course = baker.make(Course, _quantity=3)
+        baker.make(
+            Evaluation,
+            course=iter([first_course] * 3 + [second_course] + [third_course] * 3),
+            state=iter(
+                [Evaluation.State.PUBLISHED] * 3
+                + [Evaluation.State.EVALUATED]
+                + [Evaluation.State.REVIEWED] * 2
+                + [Evaluation.State.IN_EVALUATION]
+            ),
+            _quantity=7,
+            _fill_optional=["name_de", "name_en"],
+        )
+
+        self.assertEqual(
+            RefreshResultsCacheCommand.get_course_chunks(2),
+            [([first_course.id], 3), ([second_course.id, third_course.id], 3)],
+        )
 
 
 class TestScssCommand(TestCase):
@@ -290,6 +406,110 @@ class TestUpdateEvaluationStatesCommand(TestCase):
         self.assertEqual(mock.call_count, 1)
 
 
+class TestVerifyEvaluationCountersCommand(TestCase):
+    def test_reports_and_repairs_drift(self):
+        evaluation = baker.make(Evaluation)
+        missing_evaluation = baker.make(Evaluation)
+        baker.make(TextAnswer, contribution=evaluation.general_contribution, _quantity=2)
+        EvaluationCounters.objects.filter(evaluation=missing_evaluation).delete()
+
+        output = StringIO()
+        management.call_command("verify_evaluation_counters", stdout=output)
+        self.assertEqual(
+            output.getvalue(),
+            f"Evaluation {evaluation.pk}: textanswer_count 0 instead of 2\n"
+            "1 evaluations without counters, 1 evaluations with drifted counters.\n",
+        )
+        self.assertEqual(EvaluationCounters.objects.get(evaluation=evaluation).textanswer_count, 0)
+
+        management.call_command("verify_evaluation_counters", "--repair", stdout=StringIO())
+        self.assertEqual(EvaluationCounters.objects.get(evaluation=evaluation).textanswer_count, 2)
+        self.assertTrue(EvaluationCounters.objects.filter(evaluation=missing_evaluation).exists())
+
+        output = StringIO()
+        management.call_command("verify_evaluation_counters", stdout=output)
+        self.assertEqual(output.getvalue(), "0 evaluations without counters, 0 evaluations with drifted counters.\n")
+
+
+class TestProcessEmailOutboxCommand(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = baker.make(UserProfile, email="user@institution.example.com")
+        cls.template = EmailTemplate.objects.get(name=EmailTemplate.EDITOR_REVIEW_NOTICE)
+
+    @override_settings(EMAIL_OUTBOX=True)
+    def test_sends_queued_emails(self):
+        self.user.delegates.add(baker.make(UserProfile, email="delegate@institution.example.com"))
+        self.template.send_to_user(self.user, subject_params={}, body_params={"user": self.user}, use_cc=True)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(QueuedEmail.objects.count(), 1)
+
+        output = StringIO()
+        management.call_command("process_email_outbox", stdout=output)
+
+        self.assertFalse(QueuedEmail.objects.exists())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [self.user.email])
+        self.assertEqual(mail.outbox[0].cc, ["delegate@institution.example.com"])
+        self.assertEqual(mail.outbox[0].alternatives[0].mimetype, "text/html")
+        self.assertEqual(output.getvalue(), "Outbox: 0 pending emails, 0 failed emails, lag: none\n")
+
+    def test_retries_failed_emails_with_backoff(self):
+        with override_settings(EMAIL_OUTBOX=True):
+            self.template.send_to_user(self.user, subject_params={}, body_params={"user": self.user}, use_cc=False)
+
+        with patch("django.core.mail.backends.locmem.EmailBackend.send_messages", side_effect=SMTPException("down")):
+            management.call_command("process_email_outbox", "--backoff=60", "--max-attempts=2", stdout=StringIO())
+
+        queued_email = QueuedEmail.objects.get()
+        self.assertEqual(queued_email.attempts, 1)
+        self.assertEqual(queued_email.last_error, "down")
+        self.assertGreater(queued_email.next_attempt_at, datetime.now() + timedelta(seconds=50))
+
+        # the email is not due yet
+        management.call_command("process_email_outbox", "--max-attempts=2", stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 0)
+
+        QueuedEmail.objects.update(next_attempt_at=datetime.now())
+        with patch("django.core.mail.backends.locmem.EmailBackend.send_messages", side_effect=SMTPException("down")):
+            management.call_command("process_email_outbox", "--max-attempts=2", stdout=StringIO())
+        self.assertEqual(QueuedEmail.objects.get().attempts, 2)
+
+        # failed emails are kept, but not retried anymore
+        QueuedEmail.objects.update(next_attempt_at=datetime.now())
+        output = StringIO()
+        management.call_command("process_email_outbox", "--max-attempts=2", stdout=output)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(output.getvalue(), "Outbox: 0 pending emails, 1 failed emails, lag: none\n")
+
+    def test_crashing_worker_only_resends_unfinished_email(self):
+        with override_settings(EMAIL_OUTBOX=True):
+            for __ in range(3):
+                self.template.send_to_user(self.user, subject_params={}, body_params={"user": self.user}, use_cc=False)
+
+        # the worker dies while sending the second email
+        with (
+            patch("django.core.mail.backends.locmem.EmailBackend.send_messages", side_effect=[1, KeyboardInterrupt]),
+            self.assertRaises(KeyboardInterrupt),
+        ):
+            management.call_command("process_email_outbox", stdout=StringIO())
+
+        # the first email was sent and the others stay claimed until the lease expires
+        self.assertEqual(QueuedEmail.objects.count(), 2)
+        self.assertTrue(all(queued_email.attempts == 0 for queued_email in QueuedEmail.objects.all()))
+        management.call_command("process_email_outbox", stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 0)
+
+        QueuedEmail.objects.update(next_attempt_at=datetime.now())
+        management.call_command("process_email_outbox", stdout=StringIO())
+        self.assertFalse(QueuedEmail.objects.exists())
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_lease_must_exceed_batch_duration(self):
+        with self.assertRaises(CommandError):
+            management.call_command("process_email_outbox", "--rate=1", "--lease=100", stdout=StringIO())
+
+
 @override_settings(REMIND_X_DAYS_AHEAD_OF_END_DATE=[0, 2], TEXTANSWER_REVIEW_REMINDER_WEEKDAYS=[])
 class TestSendRemindersCommand(TestCase):
     def test_remind_user_about_one_evaluation(self):
@@ -302,11 +522,10 @@ class TestSendRemindersCommand(TestCase):
             participants=[user_to_remind],
         )
 
-        with patch("evap.evaluation.models.EmailTemplate.send_reminder_to_user") as mock:
+        with patch("evap.evaluation.models.EmailTemplate.send_reminders_to_users") as mock:
             management.call_command("send_reminders", stdout=StringIO())
 
-        self.assertEqual(mock.call_count, 1)
-        mock.assert_called_once_with(user_to_remind, first_due_in_days=2, due_evaluations=[(evaluation, 2)])
+        mock.assert_called_once_with([(user_to_remind, [(evaluation, 2)])])
 
     def test_remind_user_once_about_two_evaluations(self):
         user_to_remind = baker.make(UserProfile)
@@ -325,13 +544,10 @@ class TestSendRemindersCommand(TestCase):
             participants=[user_to_remind],
         )
 
-        with patch("evap.evaluation.models.EmailTemplate.send_reminder_to_user") as mock:
+        with patch("evap.evaluation.models.EmailTemplate.send_reminders_to_users") as mock:
             management.call_command("send_reminders", stdout=StringIO())
 
-        self.assertEqual(mock.call_count, 1)
-        mock.assert_called_once_with(
-            user_to_remind, first_due_in_days=0, due_evaluations=[(evaluation1, 0), (evaluation2, 2)]
-        )
+        mock.assert_called_once_with([(user_to_remind, [(evaluation1, 0), (evaluation2, 2)])])
 
     def test_dont_remind_already_voted(self):
         user_no_remind = baker.make(UserProfile)
@@ -344,7 +560,7 @@ class TestSendRemindersCommand(TestCase):
             voters=[user_no_remind],
         )
 
-        with patch("evap.evaluation.models.EmailTemplate.send_reminder_to_user") as mock:
+        with patch("evap.evaluation.models.EmailTemplate.send_reminders_to_users") as mock:
             management.call_command("send_reminders", stdout=StringIO())
 
         self.assertEqual(mock.call_count, 0)
@@ -365,7 +581,7 @@ class TestSendRemindersCommand(TestCase):
             participants=[user],
         )
 
-        with patch("evap.evaluation.models.EmailTemplate.send_reminder_to_user") as mock:
+        with patch("evap.evaluation.models.EmailTemplate.send_reminders_to_users") as mock:
             management.call_command("send_reminders", stdout=StringIO())
 
         mock.assert_not_called()
@@ -381,11 +597,66 @@ class TestSendRemindersCommand(TestCase):
             participants=[user],
         )
 
-        with patch("evap.evaluation.models.EmailTemplate.send_reminder_to_user") as mock2:
+        with patch("evap.evaluation.models.EmailTemplate.send_reminders_to_users") as mock2:
             management.call_command("send_reminders", stdout=StringIO())
 
-        mock2.assert_called_once_with(
-            user, first_due_in_days=2, due_evaluations=[(old_evaluation, 2), (recent_evaluation, 2)]
+        mock2.assert_called_once_with([(user, [(old_evaluation, 2), (recent_evaluation, 2)])])
+
+    @override_settings(TEXTANSWER_REVIEW_REMINDER_WEEKDAYS=list(range(7)))
+    def test_dry_run_with_stats(self):
+        make_manager()
+        users = baker.make(UserProfile, _quantity=2)
+        baker.make(
+            Evaluation,
+            state=Evaluation.State.IN_EVALUATION,
+            vote_start_datetime=datetime.now() - timedelta(days=2),
+            vote_end_date=date.today() + timedelta(days=2),
+            participants=users,
+        )
+
+        output = StringIO()
+        with patch("evap.evaluation.models.EmailTemplate.send_to_users") as mock:
+            management.call_command("send_reminders", "--dry-run", "--stats", stdout=output)
+
+        mock.assert_not_called()
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertRegex(
+            output.getvalue(),
+            r"^Student reminders: 2 recipients in \d+\.\d\d seconds\n"
+            r"Text answer review reminders: 0 recipients in \d+\.\d\d seconds\n"
+            r"Grade reminders: 0 recipients in \d+\.\d\d seconds\n$",
+        )
+
+    def test_urgent_review_matches_textanswer_review_state(self):
+        external_user = baker.make(UserProfile, email="external@example.com")
+        internal_user = baker.make(UserProfile, email="internal@institution.example.com")
+        evaluations = baker.make(
+            Evaluation,
+            state=Evaluation.State.EVALUATED,
+            can_publish_text_results=True,
+            wait_for_grade_upload_before_publishing=True,
+            course__gets_no_grade_documents=False,
+            _quantity=4,
+        )
+        evaluations[0].participants.set([external_user])
+        evaluations[1].participants.set([external_user, internal_user])
+        evaluations[2].participants.set([internal_user])
+        evaluations[2].course.gets_no_grade_documents = True
+        evaluations[2].course.save()
+        for evaluation in evaluations[:3]:
+            baker.make(TextAnswer, contribution=evaluation.general_contribution)
+        evaluations[3].participants.set([external_user])
+
+        urgent_evaluations = [evaluation for evaluation, __ in get_sorted_evaluation_url_tuples_with_urgent_review()]
+
+        self.assertCountEqual(urgent_evaluations, [evaluations[0], evaluations[2]])
+        self.assertCountEqual(
+            urgent_evaluations,
+            [
+                evaluation
+                for evaluation in Evaluation.objects.all()
+                if evaluation.textanswer_review_state == Evaluation.TextAnswerReviewState.REVIEW_URGENT
+            ],
         )
 
     @override_settings(TEXTANSWER_REVIEW_REMINDER_WEEKDAYS=list(range(7)))
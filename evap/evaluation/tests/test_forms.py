@@ -1,6 +1,14 @@
+from django import forms
 from model_bakery import baker
 
-from evap.evaluation.forms import NewKeyForm, ProfileForm
+from evap.evaluation.forms import (
+    NewKeyForm,
+    ProfileForm,
+    UserModelChoiceField,
+    UserModelMultipleChoiceField,
+    UserSearchSelect,
+    UserSearchSelectMultiple,
+)
 from evap.evaluation.models import UserProfile
 from evap.evaluation.tests.tools import TestCase, get_form_data_from_instance
 
@@ -52,3 +60,27 @@ class ProfileFormTests(TestCase):
         form_data["first_name_chosen"] = "Hello \u202eWorld"
         form = ProfileForm(form_data, instance=user)
         self.assertFalse(form.is_valid())
+
+
+class UserSearchSelectTests(TestCase):
+    class UserForm(forms.Form):
+        user = UserModelChoiceField(UserProfile.objects.all(), widget=UserSearchSelect(exclude_proxy_users=True))
+        users = UserModelMultipleChoiceField(UserProfile.objects.all(), widget=UserSearchSelectMultiple)
+
+    def test_only_selected_users_are_rendered(self):
+        selected_user, other_user = baker.make(
+            UserProfile, email=iter(["selected@institution.example.com", "other@institution.example.com"]), _quantity=2
+        )
+
+        form = self.UserForm(initial={"user": selected_user.pk, "users": [selected_user.pk]})
+        for field_name in ["user", "users"]:
+            html = str(form[field_name])
+            self.assertIn(f'value="{selected_user.pk}" selected', html)
+            self.assertNotIn(other_user.email, html)
+        self.assertIn('data-user-search-url="/user_search?exclude_proxy_users=1"', str(form["user"]))
+        self.assertIn('data-user-search-url="/user_search"', str(form["users"]))
+
+        form = self.UserForm({"user": other_user.pk, "users": [selected_user.pk, other_user.pk]})
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data["user"], other_user)
+        self.assertIn(other_user.email, str(form["user"]))
@@ -1,11 +1,15 @@
 from datetime import date, datetime, timedelta
-from unittest.mock import Mock, call, patch
+from smtplib import SMTPException
+from unittest.mock import Mock, patch
 
 from django.contrib.auth.models import Group
 from django.core import mail
 from django.core.cache import caches
 from django.core.exceptions import ValidationError
+from django.db import connection
+from django.template import Template
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django_fsm import TransitionNotAllowed
 from model_bakery import baker
 
@@ -15,6 +19,7 @@ from evap.evaluation.models import (
     CourseType,
     EmailTemplate,
     Evaluation,
+    EvaluationCounters,
     NotArchivableError,
     Question,
     QuestionAssignment,
@@ -23,6 +28,7 @@ from evap.evaluation.models import (
     Semester,
     TextAnswer,
     UserProfile,
+    compile_email_template,
 )
 from evap.evaluation.tests.tools import (
     TestCase,
@@ -34,6 +40,7 @@ from evap.evaluation.tests.tools import (
 from evap.grades.models import GradeDocument
 from evap.results.tools import cache_results, calculate_average_distribution
 from evap.results.views import get_evaluation_result_template_fragment_cache_key
+from evap.student.tools import AnswerWriter
 
 
 class TestSemester(WebTest):
@@ -196,6 +203,36 @@ class TestEvaluations(WebTest):
         evaluation = Evaluation.objects.get(pk=evaluation.pk)
         self.assertEqual(evaluation.state, Evaluation.State.PUBLISHED)
 
+    @override_settings(INSTITUTION_EMAIL_DOMAINS=["institution.example.com"])
+    def test_update_evaluations_updates_caches_together(self):
+        participant = baker.make(UserProfile, email="foo@institution.example.com")
+        evaluations = baker.make(
+            Evaluation,
+            state=Evaluation.State.IN_EVALUATION,
+            participants=[participant],
+            vote_start_datetime=datetime.now() - timedelta(days=2),
+            vote_end_date=date.today() - timedelta(days=1),
+            wait_for_grade_upload_before_publishing=False,
+            _quantity=2,
+        )
+        already_published = baker.make(Evaluation, state=Evaluation.State.PUBLISHED)
+
+        with (
+            patch("evap.results.tools.cache_results_many") as cache_mock,
+            patch("evap.results.views.update_template_cache_of_published_evaluations_in_courses") as template_mock,
+            patch("evap.evaluation.models.EmailTemplate.send_participant_publish_notifications"),
+            patch("evap.evaluation.models.EmailTemplate.send_contributor_publish_notifications"),
+        ):
+            Evaluation.update_evaluations()
+
+        cache_mock.assert_called_once()
+        self.assertCountEqual(cache_mock.call_args.args[0], evaluations)
+        template_mock.assert_called_once()
+        self.assertCountEqual(template_mock.call_args.args[0], [evaluation.course for evaluation in evaluations])
+        self.assertNotIn(already_published.course, template_mock.call_args.args[0])
+        for evaluation in evaluations:
+            self.assertEqual(Evaluation.objects.get(pk=evaluation.pk).state, Evaluation.State.PUBLISHED)
+
     @override_settings(EVALUATION_END_WARNING_PERIOD=24)
     def test_ends_soon(self):
         evaluation = baker.make(
@@ -594,6 +631,65 @@ class TestCourse(TestCase):
         self.assertEqual(course.responsibles_names, f"{user1.full_name}, {user2.full_name}")
 
 
+class TestEvaluationCounters(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.evaluation = baker.make(Evaluation, state=Evaluation.State.IN_EVALUATION, can_publish_text_results=True)
+
+    def assertCounters(self, **expected_counts):
+        counters = EvaluationCounters.objects.get(evaluation=self.evaluation)
+        expected = dict.fromkeys(EvaluationCounters.COUNTER_FIELDS, 0) | expected_counts
+        self.assertEqual({name: getattr(counters, name) for name in EvaluationCounters.COUNTER_FIELDS}, expected)
+
+    def test_created_with_evaluation(self):
+        self.assertCounters()
+
+    def test_contributors(self):
+        contribution = baker.make(Contribution, evaluation=self.evaluation, contributor=baker.make(UserProfile))
+        self.assertCounters(contributor_count=1)
+        contribution.delete()
+        self.assertCounters()
+
+    def test_grade_documents(self):
+        other_evaluation = baker.make(Evaluation, course=self.evaluation.course, _fill_optional=["name_de", "name_en"])
+        grade_document = baker.make(
+            GradeDocument, course=self.evaluation.course, type=GradeDocument.Type.MIDTERM_GRADES
+        )
+        self.assertCounters(midterm_grade_document_count=1)
+        self.assertEqual(EvaluationCounters.objects.get(evaluation=other_evaluation).midterm_grade_document_count, 1)
+
+        grade_document.type = GradeDocument.Type.FINAL_GRADES
+        grade_document.save()
+        self.assertCounters(final_grade_document_count=1)
+        grade_document.delete()
+        self.assertCounters()
+
+    def test_textanswers(self):
+        assignment = baker.make(QuestionAssignment, question__type=QuestionType.TEXT)
+        answer_writer = AnswerWriter()
+        answer_writer.add_text_answer(self.evaluation.general_contribution, assignment, "first")
+        answer_writer.add_text_answer(self.evaluation.general_contribution, assignment, "second")
+        answer_writer.save(self.evaluation)
+        self.assertCounters(textanswer_count=2)
+
+        self.evaluation.textanswer_set.update(review_decision=TextAnswer.ReviewDecision.PUBLIC)
+        EvaluationCounters.update_for([self.evaluation])
+        self.assertCounters(textanswer_count=2, reviewed_textanswer_count=2)
+
+        self.evaluation.reset_to_new(delete_previous_answers=True)
+        self.assertCounters()
+
+    def test_counts_fall_back_to_counting(self):
+        baker.make(Contribution, evaluation=self.evaluation, contributor=baker.make(UserProfile), _quantity=2)
+        baker.make(TextAnswer, contribution=self.evaluation.general_contribution, _quantity=3)
+        EvaluationCounters.objects.all().delete()
+
+        evaluation = Evaluation.objects.annotate(**EvaluationCounters.counts()).get(pk=self.evaluation.pk)
+        self.assertEqual(evaluation.contributor_count, 2)
+        self.assertEqual(evaluation.textanswer_count, 3)
+        self.assertEqual(evaluation.reviewed_textanswer_count, 0)
+
+
 class TestUserProfile(TestCase):
     def test_is_student(self):
         some_user = baker.make(UserProfile)
@@ -895,6 +991,22 @@ class TestEmailTemplate(TestCase):
         template = EmailTemplate.objects.get(name=EmailTemplate.STUDENT_REMINDER)
         template.send_to_user(user, subject_params={}, body_params={}, use_cc=False)
 
+    def test_compiled_templates_are_cached_until_saved(self):
+        template = EmailTemplate.objects.get(name=EmailTemplate.STUDENT_REMINDER)
+        compile_email_template.cache_clear()
+        with patch("evap.evaluation.models.Template", wraps=Template) as template_mock:
+            template.send_to_user(self.user, subject_params={}, body_params={}, use_cc=False)
+            template.send_to_user(self.user, subject_params={}, body_params={}, use_cc=False)
+            num_compilations = template_mock.call_count
+
+            template.subject = "New subject {{ user.email }}"
+            template.save()
+            template.send_to_user(self.user, subject_params={"user": self.user}, body_params={}, use_cc=False)
+
+        self.assertEqual(num_compilations, 3)  # subject, plain content and html content
+        self.assertEqual(template_mock.call_count, 6)
+        self.assertEqual(mail.outbox[2].subject, f"New subject {self.user.email}")
+
     def test_send_multi_alternatives_email(self):
         template = EmailTemplate(
             subject="Example", plain_content="Example plain content", html_content="<p>Example html content</p>"
@@ -1013,8 +1125,43 @@ class TestEmailTemplate(TestCase):
         self.assertEqual(len(mail.outbox), 1)
         self.assertEqual(set(mail.outbox[0].cc), {self.additional_cc.email})
 
-    @staticmethod
-    def test_send_contributor_publish_notifications():
+    @override_settings(EMAIL_BATCH_SIZE=2)
+    def test_send_to_users_in_batches(self):
+        def send_to_users(users):
+            with CaptureQueriesContext(connection) as context:
+                result = self.template.send_to_users([(user, {}, {"user": user}) for user in users], use_cc=True)
+            return result, len(context.captured_queries)
+
+        users = baker.make(UserProfile, email=iter(f"user{i}@example.com" for i in range(5)), _quantity=5)
+        for user in users:
+            user.delegates.add(baker.make(UserProfile, email=f"delegate-of-{user.email}"))
+
+        result, num_queries_for_two_users = send_to_users(users[:2])
+        self.assertEqual((result.sent, result.failed), (2, 0))
+        mail.outbox.clear()
+
+        # the delegates and CC users of all recipients are fetched at once
+        with self.assertLogs("evap.evaluation.models", level="INFO") as logs:
+            result, num_queries = send_to_users(users)
+        self.assertEqual(num_queries, num_queries_for_two_users)
+        self.assertEqual((result.sent, result.failed), (5, 0))
+        self.assertEqual([message.to for message in mail.outbox], [[user.email] for user in users])
+        self.assertEqual([message.cc for message in mail.outbox], [[f"delegate-of-{user.email}"] for user in users])
+        self.assertEqual(sum("Sent batch" in line for line in logs.output), 3)
+
+    def test_send_to_users_reports_failures(self):
+        users = baker.make(UserProfile, email=iter(["a@example.com", "b@example.com", "c@example.com"]), _quantity=3)
+        with (
+            patch("django.core.mail.backends.locmem.EmailBackend.send_messages", side_effect=[1, SMTPException, 1]),
+            self.assertLogs("evap.evaluation.models", level="ERROR") as logs,
+        ):
+            result = self.template.send_to_users([(user, {}, {}) for user in users], use_cc=False)
+
+        self.assertEqual((result.sent, result.failed), (2, 1))
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn('sending the following email to user "', logs.output[0])
+
+    def test_send_contributor_publish_notifications(self):
         responsible1 = baker.make(UserProfile)
         responsible2 = baker.make(UserProfile)
 
@@ -1045,55 +1192,30 @@ class TestEmailTemplate(TestCase):
         baker.make(TextAnswer, contribution=contributor_both_contribution)
         baker.make(TextAnswer, contribution=contributor2_contribution)
 
-        expected_calls = [
+        expected_recipients = [
             # these 4 are included since they are contributors for evaluation1 which can publish the average grade
-            call(
-                responsible1,
-                subject_params={},
-                body_params={"user": responsible1, "evaluations": {evaluation1}},
-                use_cc=True,
-            ),
-            call(editor1, subject_params={}, body_params={"user": editor1, "evaluations": {evaluation1}}, use_cc=True),
-            call(
-                contributor1,
-                subject_params={},
-                body_params={"user": contributor1, "evaluations": {evaluation1}},
-                use_cc=True,
-            ),
-            call(
-                contributor_both,
-                subject_params={},
-                body_params={"user": contributor_both, "evaluations": {evaluation1, evaluation2}},
-                use_cc=True,
-            ),
+            (responsible1, {}, {"user": responsible1, "evaluations": {evaluation1}}),
+            (editor1, {}, {"user": editor1, "evaluations": {evaluation1}}),
+            (contributor1, {}, {"user": contributor1, "evaluations": {evaluation1}}),
+            (contributor_both, {}, {"user": contributor_both, "evaluations": {evaluation1, evaluation2}}),
             # contributor2 has textanswers, so they are notified
-            call(
-                contributor2,
-                subject_params={},
-                body_params={"user": contributor2, "evaluations": {evaluation2}},
-                use_cc=True,
-            ),
+            (contributor2, {}, {"user": contributor2, "evaluations": {evaluation2}}),
         ]
 
-        with patch("evap.evaluation.models.EmailTemplate.send_to_user") as send_to_user_mock:
+        with patch("evap.evaluation.models.EmailTemplate.send_to_users") as send_to_users_mock:
             EmailTemplate.send_contributor_publish_notifications({evaluation1, evaluation2})
             # Assert that all expected publish notifications are sent to contributors.
-            send_to_user_mock.assert_has_calls(expected_calls, any_order=True)
+            send_to_users_mock.assert_called_once()
+            self.assertCountEqual(send_to_users_mock.call_args.args[0], expected_recipients)
+            self.assertEqual(send_to_users_mock.call_args.kwargs, {"use_cc": True})
 
         # if general textanswers for an evaluation exist, all responsibles should also be notified
         baker.make(TextAnswer, contribution=evaluation2.general_contribution)
-        expected_calls.append(
-            call(
-                responsible2,
-                subject_params={},
-                body_params={"user": responsible2, "evaluations": {evaluation2}},
-                use_cc=True,
-            )
-        )
+        expected_recipients.append((responsible2, {}, {"user": responsible2, "evaluations": {evaluation2}}))
 
-        with patch("evap.evaluation.models.EmailTemplate.send_to_user") as send_to_user_mock:
+        with patch("evap.evaluation.models.EmailTemplate.send_to_users") as send_to_users_mock:
             EmailTemplate.send_contributor_publish_notifications({evaluation1, evaluation2})
-            send_to_user_mock.assert_has_calls(expected_calls, any_order=True)
+            self.assertCountEqual(send_to_users_mock.call_args.args[0], expected_recipients)
 
 
 class TestEmailRecipientList(TestCase):
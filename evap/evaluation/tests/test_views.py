@@ -188,6 +188,66 @@ class TestProfileView(WebTest):
         self.assertContains(page, "testdisplayname")
 
 
+class TestUserSearchView(WebTest):
+    url = reverse("evaluation:user_search")
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = make_manager()
+        cls.student = baker.make(UserProfile, email="student@institution.example.com")
+        cls.user = baker.make(
+            UserProfile, first_name_given="Jane", last_name="Doe", email="jane.doe@institution.example.com"
+        )
+        cls.proxy_user = baker.make(
+            UserProfile, last_name="Doe Office", email="doe.office@institution.example.com", is_proxy_user=True
+        )
+        baker.make(UserProfile, last_name="Doe", email="john.doe@institution.example.com", is_active=False)
+
+    def search(self, params, user=None):
+        return self.app.get(self.url, params=params, user=user or self.manager).json
+
+    def test_permissions(self):
+        self.app.get(self.url, params={"q": "doe"}, user=self.student, status=403)
+
+        evaluation = create_evaluation_with_responsible_and_editor()["evaluation"]
+        for user in [evaluation.course.responsibles.first(), self.manager]:
+            self.app.get(self.url, params={"q": "doe"}, user=user, status=200)
+
+    def test_search(self):
+        expected = {"value": self.user.pk, "text": self.user.full_name_with_additional_info}
+        for query in ["jane", "DOE", "jane.doe@", "Doe Jan"]:
+            with self.subTest(query=query):
+                self.assertIn(expected, self.search({"q": query})["results"])
+
+        self.assertEqual(self.search({"q": "an"}), {"results": [], "has_more": False})
+        self.assertEqual(self.search({"q": "j"}), {"results": [], "has_more": False})
+
+    def test_excluded_users(self):
+        results = self.search({"q": "doe"})["results"]
+        self.assertEqual([result["value"] for result in results], [self.user.pk, self.proxy_user.pk])
+
+        results = self.search({"q": "doe", "exclude_proxy_users": "1"})["results"]
+        self.assertEqual([result["value"] for result in results], [self.user.pk])
+
+    def test_pagination(self):
+        baker.make(UserProfile, last_name="Smith", email=iter(f"smith{i}@example.com" for i in range(25)), _quantity=25)
+
+        first_page = self.search({"q": "smith"})
+        self.assertEqual(len(first_page["results"]), 20)
+        self.assertTrue(first_page["has_more"])
+
+        second_page = self.search({"q": "smith", "page": 2})
+        self.assertEqual(len(second_page["results"]), 5)
+        self.assertFalse(second_page["has_more"])
+        self.assertFalse(
+            {result["value"] for result in first_page["results"]}
+            & {result["value"] for result in second_page["results"]}
+        )
+
+        self.app.get(self.url, params={"q": "smith", "page": "x"}, user=self.manager, status=400)
+        self.app.get(self.url, params={"q": "smith", "page": 0}, user=self.manager, status=400)
+
+
 class TestNegativeLikertQuestions(WebTest):
     @classmethod
     def setUpTestData(cls):
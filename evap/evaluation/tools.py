@@ -1,3 +1,4 @@
+import csv
 import datetime
 import re
 import typing
@@ -7,6 +8,7 @@ from contextlib import contextmanager
 from typing import TYPE_CHECKING, Any
 from urllib.parse import quote
 
+import openpyxl
 import xlwt
 from django import forms
 from django.conf import settings
@@ -17,11 +19,15 @@ from django.db.models.constraints import CheckConstraint
 from django.db.models.fields.mixins import FieldCacheMixin
 from django.dispatch.dispatcher import Signal
 from django.forms.formsets import BaseFormSet
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import translation
 from django.utils.datastructures import MultiValueDict
 from django.utils.translation import get_language
 from django.views.generic import FormView
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.utils import get_column_letter
 
 from evap.tools import date_to_datetime
 
@@ -36,6 +42,8 @@ else:
 
 CellValue = str | int | float | None
 
+STREAMING_CHUNK_SIZE = 64 * 1024
+
 
 def choice_database_values_from_django_choices_spec(django_choices_spec: "_ChoicesList") -> list:
     assert all(isinstance(element, tuple) for element in django_choices_spec)
@@ -282,11 +290,64 @@ class AttachmentResponse(HttpResponse):
         self.set_content_disposition(filename)
 
     def set_content_disposition(self, filename: str) -> None:
-        try:
-            filename.encode("ascii")
-            self["Content-Disposition"] = f'attachment; filename="{filename}"'
-        except UnicodeEncodeError:
-            self["Content-Disposition"] = f"attachment; filename*=utf-8''{quote(filename)}"
+        self["Content-Disposition"] = attachment_content_disposition(filename)
+
+
+class StreamingAttachmentResponse(StreamingHttpResponse):
+    """
+    Like `AttachmentResponse`, but the content is produced by an iterator while the response is sent, so
+    the download starts right away and the content never has to be held in memory as a whole.
+    """
+
+    def __init__(self, filename: str, streaming_content: Iterable[bytes | str], content_type=None, **kwargs) -> None:
+        super().__init__(streaming_content, content_type=content_type, **kwargs)
+        self["Content-Disposition"] = attachment_content_disposition(filename)
+
+
+class _LineBuffer:
+    """File-like object that hands back what is written to it, so `csv.writer` returns the formatted lines."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def stream_csv(rows: Iterable[Iterable[Any]], **fmtparams) -> Iterator[str]:
+    """Format the rows as CSV lines and yield them in chunks of about `STREAMING_CHUNK_SIZE` characters."""
+    writer = csv.writer(_LineBuffer(), **fmtparams)
+    chunk: list[str] = []
+    chunk_size = 0
+    for row in rows:
+        line = writer.writerow(row)
+        chunk.append(line)
+        chunk_size += len(line)
+        if chunk_size >= STREAMING_CHUNK_SIZE:
+            yield "".join(chunk)
+            chunk = []
+            chunk_size = 0
+    if chunk:
+        yield "".join(chunk)
+
+
+def csv_attachment_response(filename: str, rows: Iterable[Iterable[Any]]) -> StreamingAttachmentResponse:
+    """
+    Return a response that streams the rows as a semicolon-separated CSV file. The rows are produced while the
+    response is sent, in the language of the current request.
+    """
+    language = get_language()
+
+    def content() -> Iterator[str]:
+        with translation.override(language):
+            yield from stream_csv(rows, delimiter=";", lineterminator="\n")
+
+    return StreamingAttachmentResponse(filename, content(), content_type="text/csv; charset=utf-8")
+
+
+def attachment_content_disposition(filename: str) -> str:
+    try:
+        filename.encode("ascii")
+        return f'attachment; filename="{filename}"'
+    except UnicodeEncodeError:
+        return f"attachment; filename*=utf-8''{quote(filename)}"
 
 
 class HttpResponseNoContent(HttpResponse):
@@ -311,6 +372,12 @@ class HttpResponseNoContent(HttpResponse):
 
 
 class ExcelExporter(ABC):
+    """
+    Base class for Excel exports. By default, .xls files are created with xlwt. With `xlsx=True`, .xlsx files are
+    written row by row using openpyxl's write-only mode instead, which keeps memory usage constant and supports more
+    than 256 columns. The styles are defined as xlwt styles for both formats.
+    """
+
     styles = {
         "default": xlwt.Style.default_style,
         "headline": xlwt.easyxf(
@@ -324,33 +391,124 @@ class ExcelExporter(ABC):
         "border_top": xlwt.easyxf("borders: top medium"),
     }
 
+    # Palette index -> RGB value of custom colors used in the styles
+    COLOR_MAPPINGS: dict[int, tuple[int, int, int]] = {}
+
     # Derived classes can set this to
     # have a sheet added at initialization.
     default_sheet_name: str | None = None
 
-    def __init__(self) -> None:
-        self.workbook = xlwt.Workbook()
+    def __init__(self, *, xlsx: bool = False) -> None:
+        self.xlsx = xlsx
+        if xlsx:
+            self.workbook = openpyxl.Workbook(write_only=True)
+            self.xlsx_styles: dict[str, dict[str, Any]] = {}
+            self.xlsx_row: list[WriteOnlyCell] = []
+        else:
+            self.workbook = xlwt.Workbook()
+            for index, color in self.COLOR_MAPPINGS.items():
+                self.workbook.set_colour_RGB(index, *color)
+
         self.cur_row = 0
         self.cur_col = 0
+        self.cur_sheet = None
         if self.default_sheet_name is not None:
-            self.cur_sheet = self.workbook.add_sheet(self.default_sheet_name)
+            self.add_sheet(self.default_sheet_name)
+
+    @property
+    def file_extension(self) -> str:
+        return "xlsx" if self.xlsx else "xls"
+
+    @property
+    def content_type(self) -> str:
+        if self.xlsx:
+            return "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        return "application/vnd.ms-excel"
+
+    def add_sheet(self, name: str) -> None:
+        if self.xlsx:
+            self.flush_xlsx_row()
+            self.cur_sheet = self.workbook.create_sheet(name)
         else:
-            self.cur_sheet = None
+            self.cur_sheet = self.workbook.add_sheet(name)
+        self.cur_row = 0
+        self.cur_col = 0
+
+    def set_column_width(self, col: int, width: int) -> None:
+        """Set the width of a column of the current sheet in 1/256 of the width of a character."""
+        if self.xlsx:
+            self.cur_sheet.column_dimensions[get_column_letter(col + 1)].width = width / 256
+        else:
+            self.cur_sheet.col(col).width = width
 
     def write_cell(self, label: CellValue = "", style: str = "default") -> None:
         """Write a single cell and move to the next column."""
-        self.cur_sheet.write(
-            self.cur_row,
-            self.cur_col,
-            label,
-            self.styles[style],
-        )
+        if self.xlsx:
+            cell = WriteOnlyCell(self.cur_sheet, value=label)
+            for attribute, value in self.get_xlsx_style(style).items():
+                setattr(cell, attribute, value)
+            self.xlsx_row.append(cell)
+        else:
+            self.cur_sheet.write(
+                self.cur_row,
+                self.cur_col,
+                label,
+                self.styles[style],
+            )
         self.cur_col += 1
 
     def next_row(self) -> None:
+        if self.xlsx:
+            self.flush_xlsx_row()
         self.cur_col = 0
         self.cur_row += 1
 
+    def flush_xlsx_row(self) -> None:
+        if self.cur_sheet is not None and self.xlsx_row:
+            self.cur_sheet.append(self.xlsx_row)
+        self.xlsx_row = []
+
+    def get_xlsx_style(self, style_name: str) -> dict[str, Any]:
+        """Translate the xlwt style to the corresponding attributes of an openpyxl cell."""
+        if style_name in self.xlsx_styles:
+            return self.xlsx_styles[style_name]
+
+        style = self.styles[style_name]
+        horizontal = {
+            xlwt.Alignment.HORZ_LEFT: "left",
+            xlwt.Alignment.HORZ_CENTER: "center",
+            xlwt.Alignment.HORZ_RIGHT: "right",
+        }
+        vertical = {
+            xlwt.Alignment.VERT_TOP: "top",
+            xlwt.Alignment.VERT_CENTER: "center",
+            xlwt.Alignment.VERT_BOTTOM: "bottom",
+        }
+        sides = {xlwt.Borders.THIN: Side(style="thin"), xlwt.Borders.MEDIUM: Side(style="medium")}
+
+        attributes: dict[str, Any] = {
+            "font": Font(bold=bool(style.font.bold), italic=bool(style.font.italic), size=style.font.height / 20),
+            "alignment": Alignment(
+                horizontal=horizontal.get(style.alignment.horz),
+                vertical=vertical.get(style.alignment.vert),
+                wrap_text=bool(style.alignment.wrap),
+                text_rotation=style.alignment.rota,
+            ),
+            "border": Border(
+                left=sides.get(style.borders.left, Side()),
+                right=sides.get(style.borders.right, Side()),
+                top=sides.get(style.borders.top, Side()),
+                bottom=sides.get(style.borders.bottom, Side()),
+            ),
+            "number_format": style.num_format_str,
+        }
+        color = self.COLOR_MAPPINGS.get(style.pattern.pattern_fore_colour)
+        if style.pattern.pattern == xlwt.Pattern.SOLID_PATTERN and color is not None:
+            attributes["fill"] = PatternFill("solid", fgColor="{:02X}{:02X}{:02X}".format(*color))
+
+        self.xlsx_styles[style_name] = attributes
+        return attributes
+
     def write_row[CV: CellValue](
         self,
         vals: Iterable[CV],
@@ -378,4 +536,6 @@ class ExcelExporter(ABC):
     def export(self, response: HttpResponse | typing.BinaryIO, *args, **kwargs) -> None:
         """Convenience method to avoid some boilerplate."""
         self.export_impl(*args, **kwargs)
+        if self.xlsx:
+            self.flush_xlsx_row()
         self.workbook.save(response)
@@ -5,7 +5,8 @@ from django.conf import settings
 from django.contrib import auth, messages
 from django.core.exceptions import SuspiciousOperation
 from django.core.mail import EmailMessage
-from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest
+from django.db.models import Q
+from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.shortcuts import redirect, render
 from django.urls import reverse
 from django.utils.encoding import iri_to_uri
@@ -15,6 +16,7 @@ from django.views.decorators.debug import sensitive_post_parameters
 from django.views.decorators.http import require_POST
 from django.views.i18n import set_language
 
+from evap.evaluation.auth import manager_or_editor_or_delegate_required
 from evap.evaluation.forms import LoginEmailForm, NewKeyForm, NotebookForm, ProfileForm
 from evap.evaluation.models import EmailTemplate, FaqSection, Semester, UserProfile
 from evap.evaluation.tools import HttpResponseNoContent, openid_login_is_active, password_login_is_active
@@ -247,3 +249,51 @@ def set_startpage(request: HttpRequest) -> HttpResponse:
     user.save()
 
     return redirect("evaluation:index")
+
+
+USER_SEARCH_PAGE_SIZE = 20
+
+
+@manager_or_editor_or_delegate_required
+def user_search(request: HttpRequest) -> HttpResponse:
+    """
+    Active users whose first name, last name or email address start with each of the words of the query, in pages of
+    USER_SEARCH_PAGE_SIZE users. Used by user selection fields with a UserSearchSelect widget.
+    """
+    terms = request.GET.get("q", "").split()
+    try:
+        page = int(request.GET.get("page", 1))
+    except ValueError:
+        return HttpResponseBadRequest()
+    if page < 1:
+        return HttpResponseBadRequest()
+
+    if sum(len(term) for term in terms) < 2:
+        return JsonResponse({"results": [], "has_more": False})
+
+    users = UserProfile.objects.filter(is_active=True)
+    if request.GET.get("exclude_proxy_users"):
+        users = users.filter(is_proxy_user=False)
+    for term in terms:
+        users = users.filter(
+            Q(first_name_given__istartswith=term)
+            | Q(first_name_chosen__istartswith=term)
+            | Q(last_name__istartswith=term)
+            | Q(email__istartswith=term)
+        )
+
+    offset = (page - 1) * USER_SEARCH_PAGE_SIZE
+    users = list(
+        users.only("id", "title", "first_name_given", "first_name_chosen", "last_name", "email", "is_proxy_user")[
+            offset : offset + USER_SEARCH_PAGE_SIZE + 1
+        ]
+    )
+    return JsonResponse(
+        {
+            "results": [
+                {"value": user.id, "text": user.full_name_with_additional_info}
+                for user in users[:USER_SEARCH_PAGE_SIZE]
+            ],
+            "has_more": len(users) > USER_SEARCH_PAGE_SIZE,
+        }
+    )
@@ -2,11 +2,11 @@ import os
 
 from django.conf import settings
 from django.db import models
-from django.db.models.signals import pre_delete, pre_save
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 from django.dispatch.dispatcher import receiver
 from django.utils.translation import gettext_lazy as _
 
-from evap.evaluation.models import Course
+from evap.evaluation.models import Course, Evaluation, EvaluationCounters
 from evap.evaluation.tools import inject_choices_constraint, translate
 
 
@@ -66,3 +66,9 @@ def delete_file_pre_save(instance: GradeDocument, **_kwargs) -> None:
     new_file = instance.file
     if not old_file == new_file:
         old_file.delete(False)
+
+
+@receiver(post_save, sender=GradeDocument)
+@receiver(post_delete, sender=GradeDocument)
+def update_grade_document_counts(instance: GradeDocument, **_kwargs) -> None:
+    EvaluationCounters.update_for(Evaluation.objects.filter(course_id=instance.course_id))
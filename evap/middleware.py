@@ -7,6 +7,8 @@ from django.utils import translation
 from django.views import View
 from mozilla_django_oidc.views import OIDCAuthenticationCallbackView, OIDCAuthenticationRequestView
 
+from evap.results.tools import results_memo
+
 type ViewFuncOrClass = Callable | View
 
 VIEWS_WITHOUT_LOGIN_REQUIRED: WeakSet[ViewFuncOrClass] = WeakSet()
@@ -70,3 +72,11 @@ def user_language_middleware(get_response):
         return response
 
     return middleware
+
+
+def results_memo_middleware(get_response):
+    def middleware(request):
+        with results_memo():
+            return get_response(request)
+
+    return middleware
@@ -1,6 +1,7 @@
 import warnings
-from collections import OrderedDict, defaultdict
+from collections import defaultdict
 from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
 from itertools import chain, repeat
 from typing import Any, TypeVar
 
@@ -14,7 +15,6 @@ from evap.evaluation.tools import ExcelExporter
 from evap.results.tools import (
     AnsweredRatingResult,
     ContributionResult,
-    QuestionResult,
     RatingResult,
     TextResult,
     calculate_average_course_distribution,
@@ -29,6 +29,83 @@ QuerySetOrSequence = QuerySet[T] | Sequence[T]
 AnnotatedEvaluation = Any
 
 
+@dataclass
+class QuestionAggregate:
+    """The answers to a question of an evaluation, summed up over all exported contributions"""
+
+    weighted_average_sum: float = 0.0
+    count_sum: int = 0
+    approval_count: int = 0
+
+    @property
+    def average(self) -> float:
+        return self.weighted_average_sum / self.count_sum
+
+
+class EvaluationAggregates:
+    """Everything the results export shows about an evaluation, computed from its results in one pass"""
+
+    def __init__(self, evaluation: Evaluation, contributor: UserProfile | None, course_grade: float | None) -> None:
+        # (questionnaire id, question id) -> aggregate, only contains questions with answers
+        self.questions: dict[tuple[int, int], QuestionAggregate] = {}
+        self.questionnaires: set[Questionnaire] = set()
+
+        for contribution_result in get_results(evaluation).contribution_results:
+            if (
+                contributor
+                and contribution_result.contributor is not None
+                and contribution_result.contributor != contributor
+            ):
+                continue
+            for questionnaire_result in contribution_result.questionnaire_results:
+                question_results = questionnaire_result.question_results
+                # RatingQuestion.counts is a tuple of integers or None, if this tuple is all zero, we want to exclude it
+                if not any(isinstance(question_result, AnsweredRatingResult) for question_result in question_results):
+                    continue
+                self.questionnaires.add(questionnaire_result.questionnaire)
+                for question_result in question_results:
+                    if not RatingResult.has_answers(question_result):
+                        continue
+                    question_aggregate = self.questions.setdefault(
+                        (questionnaire_result.questionnaire.id, question_result.question.id), QuestionAggregate()
+                    )
+                    question_aggregate.weighted_average_sum += question_result.average * question_result.count_sum
+                    question_aggregate.count_sum += question_result.count_sum
+                    if question_result.question.is_yes_no_question:
+                        question_aggregate.approval_count += question_result.approval_count
+
+        self.average_grade = distribution_to_grade(calculate_average_distribution(evaluation))
+
+        course_evaluations = evaluation.course.evaluations.all()
+        self.course_evaluations_count = len(course_evaluations)
+        self.weight_percentage: int | None = None
+        if self.course_evaluations_count > 1:
+            self.weight_percentage = int((evaluation.weight / sum(e.weight for e in course_evaluations)) * 100)
+        self.course_grade = course_grade
+
+
+class ExportAggregates:
+    """Computes the EvaluationAggregates and course grades of each exported evaluation and course only once"""
+
+    def __init__(self) -> None:
+        self.evaluations: dict[tuple[int, int | None], EvaluationAggregates] = {}
+        self.course_grades: dict[int, float | None] = {}
+
+    def get(self, evaluation: Evaluation, contributor: UserProfile | None) -> EvaluationAggregates:
+        key = (evaluation.id, contributor.id if contributor else None)
+        if key not in self.evaluations:
+            self.evaluations[key] = EvaluationAggregates(evaluation, contributor, self.get_course_grade(evaluation))
+        return self.evaluations[key]
+
+    def get_course_grade(self, evaluation: Evaluation) -> float | None:
+        course = evaluation.course
+        if len(course.evaluations.all()) <= 1:
+            return None
+        if course.id not in self.course_grades:
+            self.course_grades[course.id] = distribution_to_grade(calculate_average_course_distribution(course))
+        return self.course_grades[course.id]
+
+
 class ResultsExporter(ExcelExporter):
     CUSTOM_COLOR_START = 8
     NUM_GRADE_COLORS = 21  # 1.0 to 5.0 in 0.2 steps
@@ -49,11 +126,10 @@ class ResultsExporter(ExcelExporter):
         **ExcelExporter.styles,
     }
 
-    def __init__(self) -> None:
-        super().__init__()
-
-        for index, color in self.COLOR_MAPPINGS.items():
-            self.workbook.set_colour_RGB(index, *color)
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        # evaluations usually appear on several sheets, but their results only need to be aggregated once
+        self.aggregates = ExportAggregates()
 
     @classmethod
     def grade_to_style(cls, grade: float) -> str:
@@ -113,19 +189,15 @@ class ResultsExporter(ExcelExporter):
 
         return filtered_questions
 
-    @staticmethod
     def filter_evaluations(
+        self,
         semesters: Iterable[Semester],
         evaluation_states: Iterable[Evaluation.State],
         program_ids: Iterable[int],
         course_type_ids: Iterable[int],
         contributor: UserProfile | None,
         include_not_enough_voters: bool,
-    ) -> tuple[list[tuple[Evaluation, OrderedDict[int, list[QuestionResult]]]], list[Questionnaire], bool]:
-        # pylint: disable=too-many-locals
-        course_results_exist = False
-        evaluations_with_results = []
-        used_questionnaires: set[Questionnaire] = set()
+    ) -> tuple[list[AnnotatedEvaluation], list[Questionnaire], bool]:
         evaluations_filter = Q(
             course__semester__in=semesters,
             state__in=evaluation_states,
@@ -136,47 +208,33 @@ class ResultsExporter(ExcelExporter):
             evaluations_filter = evaluations_filter & (
                 Q(course__responsibles__in=[contributor]) | Q(contributions__contributor__in=[contributor])
             )
-        evaluations = Evaluation.objects.filter(evaluations_filter).distinct()
+        evaluations = (
+            Evaluation.objects.filter(evaluations_filter)
+            .distinct()
+            .select_related("course__semester", "course__type")
+            .prefetch_related("course__evaluations", "course__responsibles", "course__programs")
+        )
+        evaluations = Evaluation.annotate_with_participant_and_voter_counts(evaluations)
+
+        annotated_evaluations = []
+        used_questionnaires: set[Questionnaire] = set()
         for evaluation in evaluations:
             if not evaluation.can_publish_rating_results and not include_not_enough_voters:
                 continue
-            results: OrderedDict[int, list[QuestionResult]] = OrderedDict()
-            for contribution_result in get_results(evaluation).contribution_results:
-                for questionnaire_result in contribution_result.questionnaire_results:
-                    # RatingQuestion.counts is a tuple of integers or None, if this tuple is all zero, we want to exclude it
-                    question_results = questionnaire_result.question_results
-                    if not any(
-                        isinstance(question_result, AnsweredRatingResult) for question_result in question_results
-                    ):
-                        continue
-                    if (
-                        not contributor
-                        or contribution_result.contributor is None
-                        or contribution_result.contributor == contributor
-                    ):
-                        results.setdefault(questionnaire_result.questionnaire.id, []).extend(question_results)
-                        used_questionnaires.add(questionnaire_result.questionnaire)
             annotated_evaluation: AnnotatedEvaluation = evaluation
-            annotated_evaluation.course_evaluations_count = annotated_evaluation.course.evaluations.count()
-            if annotated_evaluation.course_evaluations_count > 1:
-                course_results_exist = True
-                weight_sum = sum(evaluation.weight for evaluation in annotated_evaluation.course.evaluations.all())
-                annotated_evaluation.weight_percentage = int((evaluation.weight / weight_sum) * 100)
-                annotated_evaluation.course.avg_grade = distribution_to_grade(
-                    calculate_average_course_distribution(annotated_evaluation.course)
-                )
-            evaluations_with_results.append((annotated_evaluation, results))
+            annotated_evaluation.aggregates = self.aggregates.get(evaluation, contributor)
+            used_questionnaires.update(annotated_evaluation.aggregates.questionnaires)
+            annotated_evaluations.append(annotated_evaluation)
 
-        evaluations_with_results.sort(
-            key=lambda cr: (cr[0].course.semester.id, cr[0].course.type.order, cr[0].full_name)
-        )
+        annotated_evaluations.sort(key=lambda e: (e.course.semester.id, e.course.type.order, e.full_name))
+        course_results_exist = any(e.aggregates.course_evaluations_count > 1 for e in annotated_evaluations)
         sorted_questionnaires = sorted(used_questionnaires)
 
-        return evaluations_with_results, sorted_questionnaires, course_results_exist
+        return annotated_evaluations, sorted_questionnaires, course_results_exist
 
     def write_headings_and_evaluation_info(
         self,
-        evaluations_with_results: list[tuple[Evaluation, OrderedDict[int, list[QuestionResult]]]],
+        evaluations: list[AnnotatedEvaluation],
         semesters: QuerySetOrSequence[Semester],
         contributor: UserProfile | None,
         programs: Iterable[int],
@@ -198,7 +256,7 @@ class ResultsExporter(ExcelExporter):
         else:
             self.write_cell(export_name, "headline")
 
-        for evaluation, __ in evaluations_with_results:
+        for evaluation in evaluations:
             title = evaluation.full_name
             if len(semesters) > 1:
                 title += f"\n{evaluation.course.semester.name}"
@@ -208,44 +266,36 @@ class ResultsExporter(ExcelExporter):
 
         self.next_row()
         self.write_cell(_("Programs"), "bold")
-        for evaluation, __ in evaluations_with_results:
+        for evaluation in evaluations:
             self.write_cell("\n".join([d.name for d in evaluation.course.programs.all()]), "program")
 
         self.next_row()
         self.write_cell(_("Course Type"), "bold")
-        for evaluation, __ in evaluations_with_results:
+        for evaluation in evaluations:
             self.write_cell(evaluation.course.type.name, "border_left_right")
 
         self.next_row()
         # One more cell is needed for the question column
-        self.write_empty_row_with_styles(["default"] + ["border_left_right"] * len(evaluations_with_results))
-
-    def write_overall_results(
-        self,
-        evaluations_with_results: list[tuple[AnnotatedEvaluation, OrderedDict[int, list[QuestionResult]]]],
-        course_results_exist: bool,
-    ) -> None:
-        annotated_evaluations = [e for e, __ in evaluations_with_results]
+        self.write_empty_row_with_styles(["default"] + ["border_left_right"] * len(evaluations))
 
+    def write_overall_results(self, evaluations: list[AnnotatedEvaluation], course_results_exist: bool) -> None:
         self.write_cell(_("Overall Average Grade"), "bold")
-        averages = (distribution_to_grade(calculate_average_distribution(e)) for e in annotated_evaluations)
+        averages = (e.aggregates.average_grade for e in evaluations)
         self.write_row(averages, lambda avg: self.grade_to_style(avg) if avg else "border_left_right")
 
         self.write_cell(_("Total voters/Total participants"), "bold")
-        voter_ratios = (f"{e.num_voters}/{e.num_participants}" for e in annotated_evaluations)
+        voter_ratios = (f"{e.num_voters}/{e.num_participants}" for e in evaluations)
         self.write_row(voter_ratios, style="total_voters")
 
         self.write_cell(_("Evaluation rate"), "bold")
         # round down like in progress bar
         participant_percentages = (
-            f"{int((e.num_voters / e.num_participants) * 100) if e.num_participants > 0 else 0}%"
-            for e in annotated_evaluations
+            f"{int((e.num_voters / e.num_participants) * 100) if e.num_participants > 0 else 0}%" for e in evaluations
         )
         self.write_row(participant_percentages, style="evaluation_rate")
 
         if course_results_exist:
-            # Only query the number of evaluations once and keep track of it here.
-            count_gt_1: list[bool] = [e.course_evaluations_count > 1 for e in annotated_evaluations]
+            count_gt_1: list[bool] = [e.aggregates.course_evaluations_count > 1 for e in evaluations]
 
             # Borders only if there is a course grade below. Offset by one column
             self.write_empty_row_with_styles(
@@ -254,18 +304,18 @@ class ResultsExporter(ExcelExporter):
 
             self.write_cell(_("Evaluation weight"), "bold")
             weight_percentages = (
-                f"{e.weight_percentage}%" if gt1 else None
-                for e, gt1 in zip(annotated_evaluations, count_gt_1, strict=True)
+                f"{e.aggregates.weight_percentage}%" if gt1 else None
+                for e, gt1 in zip(evaluations, count_gt_1, strict=True)
             )
             self.write_row(weight_percentages, lambda s: "evaluation_weight" if s is not None else "default")
 
             self.write_cell(_("Course Grade"), "bold")
-            for evaluation, gt1 in zip(annotated_evaluations, count_gt_1, strict=True):
+            for evaluation, gt1 in zip(evaluations, count_gt_1, strict=True):
                 if not gt1:
                     self.write_cell()
                     continue
 
-                avg = evaluation.course.avg_grade
+                avg = evaluation.aggregates.course_grade
                 style = self.grade_to_style(avg) if avg is not None else "border_left_right"
                 self.write_cell(avg, style)
             self.next_row()
@@ -276,7 +326,7 @@ class ResultsExporter(ExcelExporter):
     def write_questionnaire(
         self,
         questionnaire: Questionnaire,
-        evaluations_with_results: list[tuple[Evaluation, OrderedDict[int, list[QuestionResult]]]],
+        evaluations: list[AnnotatedEvaluation],
         contributor: UserProfile | None,
     ) -> None:
         if contributor and questionnaire.type == Questionnaire.Type.CONTRIBUTOR:
@@ -285,44 +335,28 @@ class ResultsExporter(ExcelExporter):
             self.write_cell(questionnaire.public_name, "bold")
 
         # first cell of row is printed above
-        self.write_empty_row_with_styles(["border_left_right"] * len(evaluations_with_results))
+        self.write_empty_row_with_styles(["border_left_right"] * len(evaluations))
 
         for question in self.filter_text_and_heading_questions(
             assignment.question for assignment in questionnaire.question_assignments.all()
         ):
             self.write_cell(question.text, "italic" if question.is_heading_question else "default")
 
-            for __, results in evaluations_with_results:
-                if questionnaire.id not in results or question.is_heading_question:
-                    self.write_cell(style="border_left_right")
-                    continue
-
-                values = []
-                count_sum = 0
-                approval_count = 0
-
-                for grade_result in results[questionnaire.id]:
-                    if grade_result.question.id != question.id or not RatingResult.has_answers(grade_result):
-                        continue
-
-                    values.append(grade_result.average * grade_result.count_sum)
-                    count_sum += grade_result.count_sum
-                    if grade_result.question.is_yes_no_question:
-                        approval_count += grade_result.approval_count
-
-                if not values:
+            for evaluation in evaluations:
+                question_aggregate = evaluation.aggregates.questions.get((questionnaire.id, question.id))
+                if question_aggregate is None:
                     self.write_cell(style="border_left_right")
                     continue
 
-                avg = sum(values) / count_sum
+                avg = question_aggregate.average
                 if question.is_yes_no_question:
-                    percent_approval = approval_count / count_sum if count_sum > 0 else 0
+                    percent_approval = question_aggregate.approval_count / question_aggregate.count_sum
                     self.write_cell(f"{percent_approval:.0%}", self.grade_to_style(avg))
                 else:
                     self.write_cell(avg, self.grade_to_style(avg))
             self.next_row()
 
-        self.write_empty_row_with_styles(["default"] + ["border_left_right"] * len(evaluations_with_results))
+        self.write_empty_row_with_styles(["default"] + ["border_left_right"] * len(evaluations))
 
     # pylint: disable=arguments-differ
     def export_impl(
@@ -338,15 +372,13 @@ class ResultsExporter(ExcelExporter):
         assert len(selection_list) > 0
 
         for sheet_counter, (program_ids, course_type_ids) in enumerate(selection_list, 1):
-            self.cur_sheet = self.workbook.add_sheet("Sheet " + str(sheet_counter))
-            self.cur_row = 0
-            self.cur_col = 0
+            self.add_sheet("Sheet " + str(sheet_counter))
 
             evaluation_states = [Evaluation.State.PUBLISHED]
             if include_unpublished:
                 evaluation_states.extend([Evaluation.State.EVALUATED, Evaluation.State.REVIEWED])
 
-            evaluations_with_results, used_questionnaires, course_results_exist = self.filter_evaluations(
+            evaluations, used_questionnaires, course_results_exist = self.filter_evaluations(
                 semesters,
                 evaluation_states,
                 program_ids,
@@ -356,13 +388,13 @@ class ResultsExporter(ExcelExporter):
             )
 
             self.write_headings_and_evaluation_info(
-                evaluations_with_results, semesters, contributor, program_ids, course_type_ids, verbose_heading
+                evaluations, semesters, contributor, program_ids, course_type_ids, verbose_heading
             )
 
             for questionnaire in used_questionnaires:
-                self.write_questionnaire(questionnaire, evaluations_with_results, contributor)
+                self.write_questionnaire(questionnaire, evaluations, contributor)
 
-            self.write_overall_results(evaluations_with_results, course_results_exist)
+            self.write_overall_results(evaluations, course_results_exist)
 
 
 # See method definition.
@@ -387,8 +419,8 @@ class TextAnswerExporter(ExcelExporter):
 
     default_sheet_name = _("Text Answers")
 
-    def __init__(self, evaluation_name, semester_name, responsibles, results, contributor_name):
-        super().__init__()
+    def __init__(self, evaluation_name, semester_name, responsibles, results, contributor_name, **kwargs):
+        super().__init__(**kwargs)
         self.evaluation_name = evaluation_name
         self.semester_name = semester_name
         self.responsibles = responsibles
@@ -397,8 +429,8 @@ class TextAnswerExporter(ExcelExporter):
         self.contributor_name = contributor_name
 
     def export_impl(self):  # pylint: disable=arguments-differ
-        self.cur_sheet.col(0).width = 10000
-        self.cur_sheet.col(1).width = 40000
+        self.set_column_width(0, 10000)
+        self.set_column_width(1, 40000)
 
         self.write_row([self.evaluation_name])
         self.write_row([self.semester_name])
@@ -0,0 +1,56 @@
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("evaluation", "0164_remove_questionnaire_questionnaire_visibility_choices_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CourseGradeSummary",
+            fields=[
+                (
+                    "course",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="grade_summary",
+                        serialize=False,
+                        to="evaluation.course",
+                    ),
+                ),
+                (
+                    "distribution",
+                    django.contrib.postgres.fields.ArrayField(base_field=models.FloatField(), null=True, size=5),
+                ),
+                ("average_grade", models.FloatField(null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="EvaluationGradeSummary",
+            fields=[
+                (
+                    "evaluation",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="grade_summary",
+                        serialize=False,
+                        to="evaluation.evaluation",
+                    ),
+                ),
+                (
+                    "distribution",
+                    django.contrib.postgres.fields.ArrayField(base_field=models.FloatField(), null=True, size=5),
+                ),
+                ("average_grade", models.FloatField(null=True)),
+                ("num_voters", models.IntegerField()),
+                ("num_participants", models.IntegerField()),
+            ],
+        ),
+    ]
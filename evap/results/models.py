@@ -0,0 +1,29 @@
+from django.contrib.postgres.fields import ArrayField
+from django.db import models
+
+from evap.evaluation.models import Course, Evaluation
+
+
+class EvaluationGradeSummary(models.Model):
+    """
+    The average grade of an evaluation with cached results, stored whenever its results are cached, so that pages
+    listing many evaluations don't have to load all of their results. Deleted when the results are no longer cached.
+    The numbers of voters and participants are kept up to date, as they decide whether the average grade is published.
+    """
+
+    evaluation = models.OneToOneField(Evaluation, models.CASCADE, primary_key=True, related_name="grade_summary")
+    distribution = ArrayField(models.FloatField(), size=5, null=True)
+    average_grade = models.FloatField(null=True)
+    num_voters = models.IntegerField()
+    num_participants = models.IntegerField()
+
+
+class CourseGradeSummary(models.Model):
+    """
+    The average grade of a course, calculated from the grade summaries of its evaluations regardless of whether all of
+    them are published. Updated whenever the grade summary of one of its evaluations changes.
+    """
+
+    course = models.OneToOneField(Course, models.CASCADE, primary_key=True, related_name="grade_summary")
+    distribution = ArrayField(models.FloatField(), size=5, null=True)
+    average_grade = models.FloatField(null=True)
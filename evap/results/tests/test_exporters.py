@@ -1,6 +1,9 @@
 from io import BytesIO
+from unittest.mock import patch
 
+import openpyxl
 import xlrd
+import xlwt
 from django.utils import translation
 from model_bakery import baker
 
@@ -262,6 +265,34 @@ class TestExporters(TestCase):
 
         self.assertEqual(len(workbook.sheets()), 2)
 
+    def test_results_are_aggregated_once_per_export(self):
+        programs = baker.make(Program, _quantity=2)
+        evaluation = baker.make(
+            Evaluation,
+            course__programs=programs,
+            state=Evaluation.State.PUBLISHED,
+            _participant_count=2,
+            _voter_count=2,
+        )
+        questionnaire = baker.make(Questionnaire)
+        assignment = baker.make(
+            QuestionAssignment, question__type=QuestionType.POSITIVE_LIKERT, questionnaire=questionnaire
+        )
+        make_rating_answer_counters(assignment, evaluation.general_contribution, [1, 1, 0, 0, 0])
+        evaluation.general_contribution.questionnaires.set([questionnaire])
+        cache_results(evaluation)
+
+        binary_content = BytesIO()
+        selection_list = [([program.id], [evaluation.course.type.id]) for program in programs]
+        with patch("evap.results.exporters.get_results", wraps=get_results) as get_results_mock:
+            ResultsExporter().export(binary_content, [evaluation.course.semester], selection_list)
+        get_results_mock.assert_called_once()
+
+        binary_content.seek(0)
+        workbook = xlrd.open_workbook(file_contents=binary_content.read())
+        for sheet in workbook.sheets():
+            self.assertEqual(sheet.row_values(5)[1], 1.5)
+
     @staticmethod
     def get_export_sheet(semester, program, course_types, include_unpublished=True, include_not_enough_voters=True):
         binary_content = BytesIO()
@@ -540,28 +571,66 @@ class TestExporters(TestCase):
         cache_results(evaluation_1)
         cache_results(evaluation_2)
 
-        binary_content = export_contributor_results(contributor).content
-        workbook = xlrd.open_workbook(file_contents=binary_content)
+        response = export_contributor_results(contributor)
+        self.assertEqual(
+            response["Content-Disposition"], f'attachment; filename="Evaluation_{contributor.full_name}.xlsx"'
+        )
+        workbook = openpyxl.load_workbook(BytesIO(response.content))
+        rows = list(workbook.worksheets[0].iter_rows(values_only=True))
 
         self.assertEqual(
-            workbook.sheets()[0].row_values(0)[1],
+            rows[0][1],
             f"{evaluation_1.full_name}\n{evaluation_1.course.semester.name}\n{contributor.full_name}",
         )
         self.assertEqual(
-            workbook.sheets()[0].row_values(0)[2],
+            rows[0][2],
             f"{evaluation_2.full_name}\n{evaluation_2.course.semester.name}\n{other_contributor.full_name}",
         )
-        self.assertEqual(workbook.sheets()[0].row_values(4)[0], general_questionnaire.public_name)
-        self.assertEqual(workbook.sheets()[0].row_values(5)[0], general_assignment.question.text)
-        self.assertEqual(workbook.sheets()[0].row_values(5)[2], 4.0)
+        self.assertEqual(rows[4][0], general_questionnaire.public_name)
+        self.assertEqual(rows[5][0], general_assignment.question.text)
+        self.assertEqual(rows[5][2], 4.0)
         self.assertEqual(
-            workbook.sheets()[0].row_values(7)[0],
+            rows[7][0],
             f"{contributor_questionnaire.public_name} ({contributor.full_name})",
         )
-        self.assertEqual(workbook.sheets()[0].row_values(8)[0], contributor_assignment.question.text)
-        self.assertEqual(workbook.sheets()[0].row_values(8)[2], 3.0)
-        self.assertEqual(workbook.sheets()[0].row_values(10)[0], "Overall Average Grade")
-        self.assertEqual(workbook.sheets()[0].row_values(10)[2], 3.25)
+        self.assertEqual(rows[8][0], contributor_assignment.question.text)
+        self.assertEqual(rows[8][2], 3.0)
+        self.assertEqual(rows[10][0], "Overall Average Grade")
+        self.assertEqual(rows[10][2], 3.25)
+
+    def test_xlsx_export(self):
+        program = baker.make(Program)
+        evaluation = baker.make(
+            Evaluation,
+            course__programs=[program],
+            state=Evaluation.State.PUBLISHED,
+            _participant_count=2,
+            _voter_count=2,
+        )
+        questionnaire = baker.make(Questionnaire)
+        assignment = baker.make(
+            QuestionAssignment, question__type=QuestionType.POSITIVE_LIKERT, questionnaire=questionnaire
+        )
+        make_rating_answer_counters(assignment, evaluation.general_contribution, [1, 1, 0, 0, 0])
+        evaluation.general_contribution.questionnaires.set([questionnaire])
+        cache_results(evaluation)
+
+        binary_content = BytesIO()
+        ResultsExporter(xlsx=True).export(
+            binary_content, [evaluation.course.semester], [([program.id], [evaluation.course.type.id])]
+        )
+        binary_content.seek(0)
+        sheet = openpyxl.load_workbook(binary_content).worksheets[0]
+
+        self.assertEqual(sheet.cell(row=1, column=2).value.split("\n")[0], evaluation.full_name)
+        self.assertEqual(sheet.cell(row=1, column=2).alignment.text_rotation, 90)
+        self.assertEqual(sheet.cell(row=6, column=1).value, assignment.question.text)
+        grade_cell = sheet.cell(row=6, column=2)
+        self.assertEqual(grade_cell.value, 1.5)
+        self.assertTrue(grade_cell.font.bold)
+        self.assertEqual(grade_cell.border.left.style, "medium")
+        color = ResultsExporter.COLOR_MAPPINGS[xlwt.Style.colour_map[ResultsExporter.grade_to_style(1.5) + "_color"]]
+        self.assertEqual(grade_cell.fill.fgColor.rgb, "00{:02X}{:02X}{:02X}".format(*color))
 
     def test_text_answer_export(self):
         evaluation = baker.make(Evaluation, state=Evaluation.State.PUBLISHED, can_publish_text_results=True)
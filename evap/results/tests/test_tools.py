@@ -1,11 +1,16 @@
-from datetime import datetime
+import random
+from collections import Counter
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
 
 from django.conf import settings
 from django.core.cache import caches
 from django.test import override_settings
+from django.utils import translation
 from model_bakery import baker
 
 from evap.evaluation.models import (
+    CHOICES,
     Contribution,
     Course,
     Evaluation,
@@ -18,22 +23,36 @@ from evap.evaluation.models import (
     UserProfile,
 )
 from evap.evaluation.tests.tools import TestCase, make_rating_answer_counters
+from evap.results.models import CourseGradeSummary, EvaluationGradeSummary
 from evap.results.tools import (
+    DESERIALIZATION_GENERATION_CACHE_KEY,
+    RESULTS_SERIALIZATION_FORMAT,
     ViewContributorResults,
     ViewGeneralResults,
+    annotate_distributions_and_grades,
     cache_results,
+    cache_results_many,
     calculate_average_course_distribution,
     calculate_average_distribution,
+    calculate_average_distributions,
     can_textanswer_be_seen_by,
+    clear_deserialization_cache,
     create_rating_result,
+    deserialize_evaluation_result,
     distribution_to_grade,
+    get_live_results_cache_key,
     get_results,
     get_results_cache_key,
+    get_results_many,
     normalized_distribution,
+    results_memo,
+    serialize_evaluation_result,
     textanswers_visible_to,
     unipolarized_distribution,
+    update_live_results,
 )
 from evap.staff.tools import merge_users
+from evap.student.models import QueuedVote
 
 
 class TestCalculateResults(TestCase):
@@ -166,6 +185,233 @@ class TestCalculateResults(TestCase):
                 Contribution.objects.filter(evaluation=evaluation, contributor=contribution_result.contributor).exists()
             )
 
+    def test_serialized_results_match_calculated_results(self):
+        students = baker.make(UserProfile, _quantity=2, _bulk_create=True)
+        evaluation = baker.make(
+            Evaluation,
+            state=Evaluation.State.PUBLISHED,
+            participants=students,
+            voters=students,
+            can_publish_text_results=True,
+        )
+        questionnaire = baker.make(Questionnaire)
+        baker.make(QuestionAssignment, questionnaire=questionnaire, question__type=QuestionType.HEADING)
+        rating_assignment = baker.make(
+            QuestionAssignment,
+            questionnaire=questionnaire,
+            question__type=QuestionType.POSITIVE_LIKERT,
+            question__allows_additional_textanswers=True,
+        )
+        text_assignment = baker.make(QuestionAssignment, questionnaire=questionnaire, question__type=QuestionType.TEXT)
+        contribution = baker.make(
+            Contribution, contributor=baker.make(UserProfile), evaluation=evaluation, questionnaires=[questionnaire]
+        )
+        evaluation.general_contribution.questionnaires.set([questionnaire])
+        make_rating_answer_counters(rating_assignment, contribution, [1, 0, 3, 0, 2])
+        baker.make(
+            TextAnswer,
+            contribution=contribution,
+            assignment=iter([rating_assignment, text_assignment]),
+            review_decision=TextAnswer.ReviewDecision.PUBLIC,
+            _quantity=2,
+        )
+
+        def summarize(evaluation_result):
+            return [
+                (
+                    contribution_result.contributor.full_name if contribution_result.contributor else None,
+                    [
+                        (
+                            questionnaire_result.questionnaire.name,
+                            [
+                                (
+                                    type(result),
+                                    result.question.text,
+                                    getattr(result, "counts", None),
+                                    [answer.answer for answer in getattr(result, "answers", [])],
+                                    getattr(getattr(result, "additional_text_result", None), "answers", None),
+                                )
+                                for result in questionnaire_result.question_results
+                            ],
+                        )
+                        for questionnaire_result in contribution_result.questionnaire_results
+                    ],
+                )
+                for contribution_result in evaluation_result.contribution_results
+            ]
+
+        cache_results(evaluation)
+        cached_result = caches["results"].get(get_results_cache_key(evaluation))
+        self.assertEqual(cached_result[0], RESULTS_SERIALIZATION_FORMAT)
+
+        clear_deserialization_cache()
+        self.assertEqual(summarize(get_results(evaluation)), summarize(deserialize_evaluation_result(cached_result)))
+        self.assertEqual(
+            summarize(deserialize_evaluation_result(serialize_evaluation_result(get_results(evaluation)))),
+            summarize(get_results(evaluation)),
+        )
+        contribution_result = next(
+            result for result in get_results(evaluation).contribution_results if result.contributor
+        )
+        text_result = contribution_result.questionnaire_results[0].question_results[2]
+        self.assertEqual(
+            [user.full_name for user in text_result.answers_visible_to.visible_by_contribution],
+            [user.full_name for user in textanswers_visible_to(contribution).visible_by_contribution],
+        )
+
+    def test_get_results_many(self):
+        evaluations = baker.make(
+            Evaluation, state=Evaluation.State.PUBLISHED, _quantity=3, _fill_optional=["name_de", "name_en"]
+        )
+        cache_results_many(evaluations)
+
+        with patch.object(caches["results"], "get_many", wraps=caches["results"].get_many) as get_many:
+            evaluation_results = get_results_many(evaluations)
+
+        get_many.assert_called_once()
+        self.assertEqual(evaluation_results.keys(), {evaluation.id for evaluation in evaluations})
+
+    def test_results_memo(self):
+        evaluation = baker.make(Evaluation, state=Evaluation.State.PUBLISHED)
+        cache_results(evaluation)
+
+        with results_memo(), patch.object(caches["results"], "get_many", wraps=caches["results"].get_many) as get_many:
+            first_result = get_results(evaluation)
+            second_result = get_results(evaluation)
+
+        get_many.assert_called_once()
+        # views modify the results, so they must not be shared
+        self.assertIsNot(first_result, second_result)
+        self.assertIsNot(first_result.contribution_results[0], second_result.contribution_results[0])
+
+    def test_results_in_outdated_format_are_recalculated(self):
+        evaluation = baker.make(Evaluation, state=Evaluation.State.PUBLISHED)
+        questionnaire = baker.make(Questionnaire)
+        assignment = baker.make(QuestionAssignment, questionnaire=questionnaire, question__type=QuestionType.GRADE)
+        evaluation.general_contribution.questionnaires.set([questionnaire])
+        make_rating_answer_counters(assignment, evaluation.general_contribution, [1, 2, 3, 4, 5])
+        caches["results"].set(get_results_cache_key(evaluation), ((0,), []))
+
+        evaluation_result = get_results(evaluation)
+
+        self.assertEqual(evaluation_result.questionnaire_results[0].question_results[0].counts, (1, 2, 3, 4, 5))
+        self.assertEqual(caches["results"].get(get_results_cache_key(evaluation))[0], RESULTS_SERIALIZATION_FORMAT)
+
+    def test_questions_changed_by_other_processes_are_reloaded(self):
+        evaluation = baker.make(Evaluation, state=Evaluation.State.PUBLISHED)
+        questionnaire = baker.make(Questionnaire, name_en="Questionnaire")
+        assignment = baker.make(
+            QuestionAssignment, questionnaire=questionnaire, question__type=QuestionType.GRADE, question__text_en="Old"
+        )
+        evaluation.general_contribution.questionnaires.set([questionnaire])
+        cache_results(evaluation)
+        get_results(evaluation)
+
+        # another process saves the question: its receiver only changes the shared cache of this process
+        Question.objects.filter(pk=assignment.question.pk).update(text_en="New")
+        Questionnaire.objects.filter(pk=questionnaire.pk).update(name_en="Changed questionnaire")
+        with translation.override("en"):
+            self.assertEqual(get_results(evaluation).questionnaire_results[0].question_results[0].question.text, "Old")
+            caches["results"].set(DESERIALIZATION_GENERATION_CACHE_KEY, "other process")
+
+            questionnaire_result = get_results(evaluation).questionnaire_results[0]
+            self.assertEqual(questionnaire_result.question_results[0].question.text, "New")
+            self.assertEqual(questionnaire_result.questionnaire.name, "Changed questionnaire")
+
+
+class TestLiveResults(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.students = baker.make(UserProfile, _quantity=4, _bulk_create=True)
+        cls.evaluation = baker.make(
+            Evaluation, state=Evaluation.State.IN_EVALUATION, participants=cls.students, voters=cls.students[:2]
+        )
+        questionnaire = baker.make(Questionnaire)
+        cls.question = baker.make(Question, type=QuestionType.GRADE)
+        cls.assignment = baker.make(QuestionAssignment, questionnaire=questionnaire, question=cls.question)
+        cls.contribution = baker.make(
+            Contribution, contributor=baker.make(UserProfile), evaluation=cls.evaluation, questionnaires=[questionnaire]
+        )
+        cls.deltas = Counter({(cls.contribution.contributor_id, questionnaire.id, cls.question.id, 2): 1})
+        make_rating_answer_counters(cls.assignment, cls.contribution, [1, 1, 0, 0, 0])
+
+    @staticmethod
+    def counts(evaluation_result):
+        return evaluation_result.questionnaire_results[0].question_results[0].counts
+
+    def vote(self):
+        self.evaluation.voters.add(self.students[2])
+        counter, __ = RatingAnswerCounter.objects.get_or_create(
+            assignment=self.assignment, contribution=self.contribution, answer=2
+        )
+        counter.count += 1
+        counter.save()
+
+    def test_live_results_are_cached_per_number_of_voters(self):
+        self.assertIsNone(caches["results"].get(get_live_results_cache_key(self.evaluation)))
+        self.assertEqual(self.counts(get_results(self.evaluation)), (1, 1, 0, 0, 0))
+        self.assertEqual(caches["results"].get(get_live_results_cache_key(self.evaluation)).num_voters, 2)
+
+        # without a new voter, the cached results are used
+        RatingAnswerCounter.objects.filter(assignment=self.assignment, answer=1).update(count=5)
+        self.assertEqual(self.counts(get_results(self.evaluation)), (1, 1, 0, 0, 0))
+
+        self.evaluation.voters.add(self.students[2])
+        self.assertEqual(self.counts(get_results(self.evaluation)), (5, 1, 0, 0, 0))
+
+    def test_live_results_are_recomputed_after_queued_votes_are_processed(self):
+        self.evaluation.voters.add(self.students[2])
+        queued_vote = baker.make(QueuedVote, evaluation=self.evaluation, queued_at=datetime.now())
+        self.assertEqual(self.counts(get_results(self.evaluation)), (1, 1, 0, 0, 0))
+
+        # like a worker storing the queued answers after a reader computed the results, but before it cached them
+        counter, __ = RatingAnswerCounter.objects.get_or_create(
+            assignment=self.assignment, contribution=self.contribution, answer=2
+        )
+        counter.count += 1
+        counter.save()
+        queued_vote.delete()
+
+        self.assertEqual(self.counts(get_results(self.evaluation)), (1, 2, 0, 0, 0))
+
+    def test_update_live_results_applies_vote(self):
+        get_results(self.evaluation)
+        self.vote()
+
+        update_live_results(self.evaluation, 3, 0, self.deltas)
+
+        live_result = caches["results"].get(get_live_results_cache_key(self.evaluation))
+        self.assertEqual(live_result.num_voters, 3)
+        self.assertEqual(self.counts(live_result.evaluation_result), (1, 2, 0, 0, 0))
+        with self.assertNumQueries(2):
+            self.assertEqual(self.counts(get_results(self.evaluation)), (1, 2, 0, 0, 0))
+
+    def test_update_live_results_deletes_outdated_entries(self):
+        get_results(self.evaluation)
+        self.vote()
+        self.evaluation.voters.add(self.students[3])
+
+        update_live_results(self.evaluation, 4, 0, self.deltas)
+
+        self.assertIsNone(caches["results"].get(get_live_results_cache_key(self.evaluation)))
+        self.assertEqual(self.counts(get_results(self.evaluation)), (1, 2, 0, 0, 0))
+
+    def test_update_live_results_keeps_entries_including_the_vote(self):
+        self.vote()
+        get_results(self.evaluation)
+
+        update_live_results(self.evaluation, 3, 0, self.deltas)
+
+        live_result = caches["results"].get(get_live_results_cache_key(self.evaluation))
+        self.assertEqual(live_result.num_voters, 3)
+        self.assertEqual(self.counts(live_result.evaluation_result), (1, 2, 0, 0, 0))
+
+    def test_state_change_invalidates_live_results(self):
+        get_results(self.evaluation)
+        self.evaluation.end_evaluation()
+        self.evaluation.save()
+        self.assertIsNone(caches["results"].get(get_live_results_cache_key(self.evaluation)))
+
 
 class TestCalculateAverageDistribution(TestCase):
     @classmethod
@@ -459,6 +705,155 @@ class TestCalculateAverageDistribution(TestCase):
         calculated_grade = distribution_to_grade(calculate_average_distribution(self.evaluation))
         self.assertAlmostEqual(calculated_grade, 1.5)
 
+    def test_calculate_average_distributions_matches_single_evaluations(self):
+        random.seed(1384)
+        yes_no_assignment = baker.make(
+            QuestionAssignment, questionnaire=self.questionnaire, question__type=QuestionType.POSITIVE_YES_NO
+        )
+        assignments = [
+            self.grade_assignment,
+            self.likert_assignment,
+            self.negative_likert_assignment,
+            self.bipolar_assignment,
+            self.bipolar_assignment_2,
+            yes_no_assignment,
+        ]
+        second_evaluation = baker.make(
+            Evaluation,
+            course=self.evaluation.course,
+            state=Evaluation.State.PUBLISHED,
+            participants=[self.student1, self.student2],
+            voters=[self.student1, self.student2],
+            _fill_optional=["name_de", "name_en"],
+        )
+        second_evaluation.general_contribution.questionnaires.set([self.questionnaire])
+        running_evaluation = baker.make(Evaluation, state=Evaluation.State.IN_EVALUATION)
+
+        counters = [
+            counter
+            for contribution in [
+                self.general_contribution,
+                self.contribution1,
+                self.contribution2,
+                second_evaluation.general_contribution,
+            ]
+            for assignment in assignments
+            for counter in make_rating_answer_counters(
+                assignment,
+                contribution,
+                [random.randint(0, 20) for __ in CHOICES[assignment.question.type].grades],  # nosec
+                False,
+            )
+        ]
+        RatingAnswerCounter.objects.bulk_create(counters)
+        cache_results(self.evaluation)
+        cache_results(second_evaluation)
+
+        evaluations = [self.evaluation, second_evaluation, running_evaluation]
+        distributions = calculate_average_distributions(evaluations)
+
+        self.assertEqual(distributions.keys(), {evaluation.id for evaluation in evaluations})
+        self.assertIsNone(distributions[running_evaluation.id])
+        for evaluation in [self.evaluation, second_evaluation]:
+            expected = calculate_average_distribution(evaluation)
+            self.assertIsNotNone(expected)
+            # the grades must be exactly equal, not just almost
+            self.assertEqual(distributions[evaluation.id], expected)
+            self.assertEqual(distribution_to_grade(distributions[evaluation.id]), distribution_to_grade(expected))
+
+
+class TestGradeSummaries(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        students = baker.make(UserProfile, _quantity=2, _bulk_create=True)
+        cls.evaluation = baker.make(
+            Evaluation,
+            state=Evaluation.State.IN_EVALUATION,
+            vote_start_datetime=datetime.now() - timedelta(days=2),
+            vote_end_date=date.today() - timedelta(days=1),
+            participants=students,
+            voters=students,
+        )
+        cls.other_evaluation = baker.make(
+            Evaluation,
+            course=cls.evaluation.course,
+            state=Evaluation.State.NEW,
+            weight=3,
+            _fill_optional=["name_de", "name_en"],
+        )
+        questionnaire = baker.make(Questionnaire)
+        grade_assignment = baker.make(
+            QuestionAssignment, questionnaire=questionnaire, question__type=QuestionType.GRADE
+        )
+        cls.evaluation.general_contribution.questionnaires.set([questionnaire])
+        make_rating_answer_counters(grade_assignment, cls.evaluation.general_contribution, [1, 2, 0, 0, 1])
+
+    def test_grade_summaries_are_stored_when_results_are_cached(self):
+        self.evaluation.end_evaluation()
+        self.evaluation.save()
+
+        summary = EvaluationGradeSummary.objects.get(evaluation=self.evaluation)
+        self.assertEqual(tuple(summary.distribution), calculate_average_distribution(self.evaluation))
+        self.assertEqual(summary.average_grade, distribution_to_grade(summary.distribution))
+        self.assertEqual((summary.num_voters, summary.num_participants), (2, 2))
+
+        course_summary = CourseGradeSummary.objects.get(course=self.evaluation.course)
+        self.assertEqual(
+            tuple(course_summary.distribution),
+            calculate_average_course_distribution(self.evaluation.course, check_for_unpublished_evaluations=False),
+        )
+
+    def test_grade_summaries_are_deleted_with_cached_results(self):
+        self.evaluation.end_evaluation()
+        self.evaluation.save()
+        self.assertTrue(EvaluationGradeSummary.objects.filter(evaluation=self.evaluation).exists())
+
+        self.evaluation.vote_end_date = date.today()
+        self.evaluation.reopen_evaluation()
+        self.evaluation.save()
+
+        self.assertFalse(EvaluationGradeSummary.objects.filter(evaluation=self.evaluation).exists())
+        self.assertIsNone(CourseGradeSummary.objects.get(course=self.evaluation.course).distribution)
+
+    def test_annotate_distributions_and_grades_uses_grade_summaries(self):
+        self.evaluation.end_evaluation()
+        self.evaluation.save()
+        expected_distribution = calculate_average_distribution(self.evaluation)
+        caches["results"].clear()
+
+        evaluation = Evaluation.objects.get(pk=self.evaluation.pk)
+        with self.assertNumQueries(1):
+            annotate_distributions_and_grades([evaluation])
+
+        self.assertEqual(evaluation.distribution, expected_distribution)
+        self.assertEqual(evaluation.avg_grade, distribution_to_grade(expected_distribution))
+
+    def test_grade_summaries_follow_participant_changes(self):
+        self.evaluation.end_evaluation()
+        self.evaluation.save()
+        expected_distribution = calculate_average_distribution(self.evaluation)
+        self.assertIsNotNone(expected_distribution)
+
+        # with 2 of 12 participants having voted, the average grade can't be published anymore
+        new_participants = baker.make(UserProfile, _quantity=10, _bulk_create=True)
+        self.evaluation.participants.add(*new_participants)
+
+        summary = EvaluationGradeSummary.objects.get(evaluation=self.evaluation)
+        self.assertEqual((summary.num_voters, summary.num_participants), (2, 12))
+        evaluation = Evaluation.objects.get(pk=self.evaluation.pk)
+        annotate_distributions_and_grades([evaluation])
+        self.assertIsNone(evaluation.distribution)
+        self.assertIsNone(evaluation.avg_grade)
+        self.assertIsNone(CourseGradeSummary.objects.get(course=self.evaluation.course).distribution)
+
+        new_participants[0].evaluations_participating_in.clear()
+        self.evaluation.participants.remove(*new_participants[1:])
+
+        evaluation = Evaluation.objects.get(pk=self.evaluation.pk)
+        annotate_distributions_and_grades([evaluation])
+        self.assertEqual(evaluation.distribution, expected_distribution)
+        self.assertIsNotNone(CourseGradeSummary.objects.get(course=self.evaluation.course).distribution)
+
 
 class TestTextAnswerVisibilityInfo(TestCase):
     @classmethod
@@ -1,14 +1,22 @@
 import enum
-from collections import OrderedDict, defaultdict
+import uuid
+from collections import Counter, OrderedDict, defaultdict
 from collections.abc import Iterable
+from contextlib import contextmanager
+from contextvars import ContextVar
 from copy import copy
+from dataclasses import dataclass
 from enum import Enum
+from functools import cache
 from math import ceil, modf
 from typing import TypeGuard, cast
 
 from django.conf import settings
 from django.core.cache import caches
-from django.db.models import Exists, OuterRef, Sum, prefetch_related_objects
+from django.db.models import Count, Exists, OuterRef, QuerySet, Subquery, Sum, prefetch_related_objects
+from django.db.models.functions import Coalesce
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
 
 from evap.evaluation.models import (
     CHOICES,
@@ -23,6 +31,8 @@ from evap.evaluation.models import (
     UserProfile,
 )
 from evap.evaluation.tools import discard_cached_related_objects
+from evap.results.models import CourseGradeSummary, EvaluationGradeSummary
+from evap.student.models import QueuedVote
 from evap.tools import assert_not_none, unordered_groupby
 
 STATES_WITH_RESULTS_CACHING = {Evaluation.State.EVALUATED, Evaluation.State.REVIEWED, Evaluation.State.PUBLISHED}
@@ -190,6 +200,205 @@ class EvaluationResult:
         ]
 
 
+# Increase when changing the structure created by serialize_evaluation_result. Changes of the serialized model fields
+# are detected automatically, as they are part of RESULTS_SERIALIZATION_FORMAT.
+RESULTS_SERIALIZATION_VERSION = 1
+# Model.from_db expects the fields in the order of the model's concrete fields
+SERIALIZED_USER_FIELDS = tuple(
+    field.attname
+    for field in UserProfile._meta.concrete_fields
+    if field.attname in {"id", "email", "title", "first_name_given", "first_name_chosen", "last_name", "is_active"}
+)
+SERIALIZED_TEXT_ANSWER_FIELDS = tuple(field.attname for field in TextAnswer._meta.concrete_fields)
+RESULTS_SERIALIZATION_FORMAT = (RESULTS_SERIALIZATION_VERSION, SERIALIZED_USER_FIELDS, SERIALIZED_TEXT_ANSWER_FIELDS)
+
+
+class SerializedQuestionResultType(enum.IntEnum):
+    HEADING = 0
+    TEXT = 1
+    RATING = 2
+
+
+# Questions and questionnaires of deserialized results are shared by all results loaded in this process. Saving or
+# deleting one replaces the generation token in the shared cache, which makes every process discard its instances the
+# next time it loads cached results.
+_questions_by_id: dict[int, Question] = {}
+_questionnaires_by_id: dict[int, Questionnaire] = {}
+_deserialization_generation: str | None = None
+DESERIALIZATION_GENERATION_CACHE_KEY = "evap.results.tools.deserialization_generation"
+
+
+def _new_deserialization_generation() -> None:
+    caches["results"].set(DESERIALIZATION_GENERATION_CACHE_KEY, uuid.uuid4().hex, None)
+
+
+@receiver([post_save, post_delete], sender=Question)
+def _discard_deserialization_question(*, instance: Question, **_kwargs) -> None:
+    _questions_by_id.pop(instance.pk, None)
+    _new_deserialization_generation()
+
+
+@receiver([post_save, post_delete], sender=Questionnaire)
+def _discard_deserialization_questionnaire(*, instance: Questionnaire, **_kwargs) -> None:
+    _questionnaires_by_id.pop(instance.pk, None)
+    _new_deserialization_generation()
+
+
+def _use_deserialization_generation(generation: str | None) -> None:
+    """Discards the questions and questionnaires loaded in this process if they belong to another generation."""
+    global _deserialization_generation  # noqa: PLW0603
+    if generation != _deserialization_generation:
+        clear_deserialization_cache()
+        _deserialization_generation = generation
+
+
+def clear_deserialization_cache() -> None:
+    _questions_by_id.clear()
+    _questionnaires_by_id.clear()
+
+
+def _serialize_user(user: UserProfile) -> tuple:
+    return tuple(getattr(user, field) for field in SERIALIZED_USER_FIELDS)
+
+
+def _deserialize_user(serialized_user: tuple) -> UserProfile:
+    return UserProfile.from_db(None, SERIALIZED_USER_FIELDS, serialized_user)
+
+
+def _serialize_text_result(text_result: TextResult) -> tuple:
+    visibility = None
+    if text_result.answers_visible_to is not None:
+        visibility = (
+            [_serialize_user(user) for user in text_result.answers_visible_to.visible_by_contribution],
+            text_result.answers_visible_to.visible_by_delegation_count,
+        )
+    answers = [
+        tuple(getattr(answer, field) for field in SERIALIZED_TEXT_ANSWER_FIELDS) for answer in text_result.answers
+    ]
+    return answers, visibility
+
+
+def _deserialize_text_result(question: Question, serialized_text_result: tuple) -> TextResult:
+    answers, visibility = serialized_text_result
+    answers_visible_to = None
+    if visibility is not None:
+        users, visible_by_delegation_count = visibility
+        answers_visible_to = TextAnswerVisibility(
+            [_deserialize_user(user) for user in users], visible_by_delegation_count
+        )
+    return TextResult(
+        question,
+        [TextAnswer.from_db(None, SERIALIZED_TEXT_ANSWER_FIELDS, answer) for answer in answers],
+        answers_visible_to,
+    )
+
+
+def _serialize_question_result(question_result: QuestionResult) -> tuple:
+    if isinstance(question_result, HeadingResult):
+        return SerializedQuestionResultType.HEADING, question_result.question.id
+    if isinstance(question_result, TextResult):
+        return SerializedQuestionResultType.TEXT, question_result.question.id, _serialize_text_result(question_result)
+
+    counts = question_result.counts if RatingResult.is_published(question_result) else None
+    additional_text_result = None
+    if question_result.additional_text_result is not None:
+        additional_text_result = _serialize_text_result(question_result.additional_text_result)
+    return SerializedQuestionResultType.RATING, question_result.question.id, counts, additional_text_result
+
+
+def _deserialize_question_result(serialized_question_result: tuple) -> QuestionResult:
+    result_type, question_id, *data = serialized_question_result
+    question = _questions_by_id[question_id]
+    if result_type == SerializedQuestionResultType.HEADING:
+        return HeadingResult(question)
+    if result_type == SerializedQuestionResultType.TEXT:
+        return _deserialize_text_result(question, data[0])
+
+    counts, serialized_additional_text_result = data
+    additional_text_result = None
+    if serialized_additional_text_result is not None:
+        additional_text_result = _deserialize_text_result(question, serialized_additional_text_result)
+    answer_counters = None
+    if counts is not None:
+        values = [value for __, __, value in CHOICES[question.type].as_name_color_value_tuples() if value != NO_ANSWER]
+        answer_counters = [
+            RatingAnswerCounter(answer=value, count=count) for value, count in zip(values, counts, strict=True)
+        ]
+    return create_rating_result(question, answer_counters, additional_text_result)
+
+
+def serialize_evaluation_result(evaluation_result: EvaluationResult) -> tuple:
+    """
+    Converts results to a compact structure of ids, answer counts and text answer values, which is much smaller and
+    faster to unpickle than the result objects. Questions and questionnaires are only stored by their ids.
+    """
+    return (
+        RESULTS_SERIALIZATION_FORMAT,
+        [
+            (
+                _serialize_user(contribution_result.contributor)
+                if contribution_result.contributor is not None
+                else None,
+                contribution_result.label,
+                [
+                    (
+                        questionnaire_result.questionnaire.id,
+                        [_serialize_question_result(result) for result in questionnaire_result.question_results],
+                    )
+                    for questionnaire_result in contribution_result.questionnaire_results
+                ],
+            )
+            for contribution_result in evaluation_result.contribution_results
+        ],
+    )
+
+
+def deserialize_evaluation_result(serialized_evaluation_result: object) -> EvaluationResult | None:
+    """
+    Inverse of serialize_evaluation_result. Returns None if the results were serialized in another format,
+    e.g. by an older version, or refer to questions or questionnaires that no longer exist.
+    """
+    if (
+        not isinstance(serialized_evaluation_result, tuple)
+        or len(serialized_evaluation_result) != 2
+        or serialized_evaluation_result[0] != RESULTS_SERIALIZATION_FORMAT
+    ):
+        return None
+    serialized_contribution_results = serialized_evaluation_result[1]
+
+    questionnaire_ids = set()
+    question_ids = set()
+    for __, __, serialized_questionnaire_results in serialized_contribution_results:
+        for questionnaire_id, serialized_question_results in serialized_questionnaire_results:
+            questionnaire_ids.add(questionnaire_id)
+            question_ids.update(
+                serialized_question_result[1] for serialized_question_result in serialized_question_results
+            )
+    if missing_questionnaire_ids := questionnaire_ids - _questionnaires_by_id.keys():
+        _questionnaires_by_id.update(Questionnaire.objects.in_bulk(missing_questionnaire_ids))
+    if missing_question_ids := question_ids - _questions_by_id.keys():
+        _questions_by_id.update(Question.objects.in_bulk(missing_question_ids))
+    if not questionnaire_ids <= _questionnaires_by_id.keys() or not question_ids <= _questions_by_id.keys():
+        return None
+
+    return EvaluationResult(
+        [
+            ContributionResult(
+                _deserialize_user(contributor) if contributor is not None else None,
+                label,
+                [
+                    QuestionnaireResult(
+                        _questionnaires_by_id[questionnaire_id],
+                        [_deserialize_question_result(result) for result in serialized_question_results],
+                    )
+                    for questionnaire_id, serialized_question_results in serialized_questionnaire_results
+                ],
+            )
+            for contributor, label, serialized_questionnaire_results in serialized_contribution_results
+        ]
+    )
+
+
 def get_results_cache_key(evaluation: Evaluation) -> str:
     return f"evap.staff.results.tools.get_results-{evaluation.id:d}"
 
@@ -197,19 +406,252 @@ def get_results_cache_key(evaluation: Evaluation) -> str:
 def cache_results(evaluation, *, refetch_related_objects=True):
     assert evaluation.state in STATES_WITH_RESULTS_CACHING
     cache_key = get_results_cache_key(evaluation)
-    caches["results"].set(cache_key, _get_results_impl(evaluation, refetch_related_objects=refetch_related_objects))
+    evaluation_result = _get_results_impl(evaluation, refetch_related_objects=refetch_related_objects)
+    _set_serialized_results({cache_key: serialize_evaluation_result(evaluation_result)})
+    update_grade_summaries([(evaluation, evaluation_result)])
 
 
-def get_results(evaluation: Evaluation) -> EvaluationResult:
-    assert evaluation.state in STATES_WITH_RESULTS_CACHING | {Evaluation.State.IN_EVALUATION}
+def cache_results_many(evaluations: Iterable[Evaluation], *, refetch_related_objects=True):
+    """Like cache_results, but writes the results of all evaluations to the cache at once."""
+    evaluation_results = []
+    for evaluation in evaluations:
+        assert evaluation.state in STATES_WITH_RESULTS_CACHING
+        evaluation_results.append(
+            (evaluation, _get_results_impl(evaluation, refetch_related_objects=refetch_related_objects))
+        )
+    _set_serialized_results(
+        {
+            get_results_cache_key(evaluation): serialize_evaluation_result(evaluation_result)
+            for evaluation, evaluation_result in evaluation_results
+        }
+    )
+    update_grade_summaries(evaluation_results)
+
+
+# cache key -> serialized results fetched during the current request, see results_memo
+_results_memo: ContextVar[dict[str, object] | None] = ContextVar("results_memo", default=None)
+
+
+@contextmanager
+def results_memo():
+    """
+    Within this context, the serialized results of each evaluation are fetched from the cache at most once.
+    Only the serialized results are kept, so every get_results call still returns new objects that may be modified.
+    """
+    token = _results_memo.set({})
+    try:
+        yield
+    finally:
+        _results_memo.reset(token)
+
+
+def _get_serialized_results(cache_keys: list[str]) -> dict[str, object]:
+    memo = _results_memo.get()
+    if memo is None:
+        return caches["results"].get_many(cache_keys)
+
+    if missing_cache_keys := [cache_key for cache_key in cache_keys if cache_key not in memo]:
+        memo.update(caches["results"].get_many(missing_cache_keys))
+    return {cache_key: memo[cache_key] for cache_key in cache_keys if cache_key in memo}
 
-    if evaluation.state == Evaluation.State.IN_EVALUATION:
-        return _get_results_impl(evaluation)
 
+def _set_serialized_results(serialized_results: dict[str, object]) -> None:
+    caches["results"].set_many(serialized_results)
+    if (memo := _results_memo.get()) is not None:
+        memo.update(serialized_results)
+
+
+def delete_cached_results(evaluation: Evaluation) -> None:
     cache_key = get_results_cache_key(evaluation)
-    result = caches["results"].get(cache_key)
-    assert isinstance(result, EvaluationResult)
-    return result
+    caches["results"].delete(cache_key)
+    if (memo := _results_memo.get()) is not None:
+        memo.pop(cache_key, None)
+
+
+def get_results(evaluation: Evaluation) -> EvaluationResult:
+    return get_results_many([evaluation])[evaluation.id]
+
+
+def get_results_many(evaluations: Iterable[Evaluation]) -> dict[int, EvaluationResult]:
+    """Like get_results for many evaluations, fetching all cached results at once. Maps evaluation ids to results."""
+    evaluation_results = {}
+    cached_evaluations = []
+    for evaluation in evaluations:
+        assert evaluation.state in STATES_WITH_RESULTS_CACHING | {Evaluation.State.IN_EVALUATION}
+        if evaluation.state == Evaluation.State.IN_EVALUATION:
+            evaluation_results[evaluation.id] = get_live_results(evaluation)
+        else:
+            cached_evaluations.append(evaluation)
+
+    if cached_evaluations:
+        serialized_results = _get_serialized_results(
+            [get_results_cache_key(evaluation) for evaluation in cached_evaluations]
+            + [DESERIALIZATION_GENERATION_CACHE_KEY]
+        )
+        _use_deserialization_generation(serialized_results.get(DESERIALIZATION_GENERATION_CACHE_KEY))
+        for evaluation in cached_evaluations:
+            serialized_result = serialized_results.get(get_results_cache_key(evaluation))
+            assert serialized_result is not None
+            evaluation_results[evaluation.id] = deserialize_evaluation_result(serialized_result) or _recache_results(
+                evaluation
+            )
+
+    return evaluation_results
+
+
+def _recache_results(evaluation: Evaluation) -> EvaluationResult:
+    """Fallback for cached results in an outdated serialization format, which are replaced by freshly calculated ones"""
+    evaluation_result = _get_results_impl(evaluation)
+    _set_serialized_results({get_results_cache_key(evaluation): serialize_evaluation_result(evaluation_result)})
+    return evaluation_result
+
+
+# (contributor id, questionnaire id, question id, answer) -> number of new answers
+RatingAnswerDeltas = Counter[tuple[int | None, int, int, int]]
+
+
+@dataclass
+class LiveEvaluationResult:
+    """
+    Results of an evaluation that is still running. The entry is only valid for the exact numbers of voters and
+    queued votes and the text result publishing state it was computed for, which lets votes apply their answers
+    incrementally while readers can detect (and recompute) outdated entries with a single query.
+    """
+
+    num_voters: int
+    num_queued_votes: int
+    can_publish_text_results: bool
+    evaluation_result: EvaluationResult
+
+    @property
+    def version(self) -> tuple[int, int]:
+        return self.num_voters, self.num_queued_votes
+
+    @property
+    def can_publish_rating_results(self) -> bool:
+        return self.num_voters >= settings.VOTER_COUNT_NEEDED_FOR_PUBLISHING_RATING_RESULTS
+
+
+def get_live_results_version(evaluation: Evaluation) -> tuple[int, int]:
+    """
+    Counts the voters and queued votes of the evaluation in a single query. Voters are only ever added and queued votes
+    are only removed once their answers are stored, so the two numbers identify the answers stored in the database.
+    """
+    return (
+        Evaluation.objects.filter(pk=evaluation.pk)
+        .values_list(
+            _count_per_evaluation(Evaluation.voters.through.objects.filter(evaluation=OuterRef("pk"))),
+            _count_per_evaluation(QueuedVote.objects.filter(evaluation=OuterRef("pk"))),
+        )
+        .get()
+    )
+
+
+def _count_per_evaluation(queryset: QuerySet) -> Coalesce:
+    """Subquery counting the objects of a queryset that is filtered by a referenced evaluation"""
+    return Coalesce(Subquery(queryset.order_by().values("evaluation").annotate(count=Count("pk")).values("count")), 0)
+
+
+def get_live_results_cache_key(evaluation: Evaluation) -> str:
+    return f"evap.results.tools.get_live_results-{evaluation.id:d}"
+
+
+def get_live_results(evaluation: Evaluation) -> EvaluationResult:
+    assert evaluation.state == Evaluation.State.IN_EVALUATION
+    cache_key = get_live_results_cache_key(evaluation)
+
+    num_voters, num_queued_votes = get_live_results_version(evaluation)
+    live_result = caches["results"].get(cache_key)
+    if (
+        isinstance(live_result, LiveEvaluationResult)
+        and live_result.version == (num_voters, num_queued_votes)
+        and live_result.can_publish_text_results == evaluation.can_publish_text_results
+    ):
+        return live_result.evaluation_result
+
+    evaluation_result = _get_results_impl(evaluation)
+
+    live_result = LiveEvaluationResult(
+        num_voters, num_queued_votes, evaluation.can_publish_text_results, evaluation_result
+    )
+    # only cache the result if neither a vote came in nor queued votes were processed while computing it and it was
+    # computed for the current number of voters, otherwise it is not guaranteed to match its version.
+    if (
+        live_result.can_publish_rating_results == evaluation.can_publish_rating_results
+        and get_live_results_version(evaluation) == live_result.version
+    ):
+        caches["results"].set(cache_key, live_result)
+    return evaluation_result
+
+
+def invalidate_live_results(evaluation: Evaluation) -> None:
+    caches["results"].delete(get_live_results_cache_key(evaluation))
+
+
+def update_live_results(
+    evaluation: Evaluation, num_voters: int, num_queued_votes: int, rating_answer_deltas: RatingAnswerDeltas
+) -> None:
+    """
+    Applies the answers of a single stored (not queued) vote to the cached live results after the vote was committed.
+    `num_voters` and `num_queued_votes` must be counted with get_live_results_version in the vote's transaction, i.e.
+    they include the committed votes plus this vote. Since voters are only ever added, an entry for one voter less
+    described exactly these committed votes, so no lock is needed. Outdated entries are deleted, entries for the same
+    or a later number of voters are left alone.
+    """
+    cache_key = get_live_results_cache_key(evaluation)
+    live_result = caches["results"].get(cache_key)
+    if not isinstance(live_result, LiveEvaluationResult) or live_result.num_voters >= num_voters:
+        return
+    if live_result.version != (num_voters - 1, num_queued_votes):
+        caches["results"].delete(cache_key)
+        return
+
+    updated_live_result = LiveEvaluationResult(
+        num_voters, num_queued_votes, evaluation.can_publish_text_results, live_result.evaluation_result
+    )
+    if (
+        updated_live_result.can_publish_rating_results != live_result.can_publish_rating_results
+        or updated_live_result.can_publish_text_results != live_result.can_publish_text_results
+    ):
+        # the structure of the results changes, so incremental updates are not possible
+        caches["results"].delete(cache_key)
+        return
+
+    # New text answers are not reviewed yet and thus not part of the results, so only the counters need updating.
+    apply_rating_answer_deltas(updated_live_result.evaluation_result, rating_answer_deltas)
+    caches["results"].set(cache_key, updated_live_result)
+
+
+def apply_rating_answer_deltas(evaluation_result: EvaluationResult, rating_answer_deltas: RatingAnswerDeltas) -> None:
+    deltas_per_question: dict[tuple[int | None, int, int], list[tuple[int, int]]] = unordered_groupby(
+        ((contributor_id, questionnaire_id, question_id), (answer, delta))
+        for (contributor_id, questionnaire_id, question_id, answer), delta in rating_answer_deltas.items()
+    )
+
+    for contribution_result in evaluation_result.contribution_results:
+        contributor_id = contribution_result.contributor.id if contribution_result.contributor is not None else None
+        for questionnaire_result in contribution_result.questionnaire_results:
+            question_results = questionnaire_result.question_results
+            for index, question_result in enumerate(question_results):
+                if not RatingResult.is_published(question_result):
+                    continue
+                deltas = deltas_per_question.get(
+                    (contributor_id, questionnaire_result.questionnaire.id, question_result.question.id)
+                )
+                if not deltas:
+                    continue
+
+                counts = {value: count for count, __, __, value in question_result.zipped_choices}
+                for answer, delta in deltas:
+                    counts[answer] += delta
+                answer_counters = [
+                    RatingAnswerCounter(answer=answer, count=count) for answer, count in counts.items() if count != 0
+                ]
+                question_results[index] = create_rating_result(
+                    question_result.question,
+                    answer_counters,
+                    additional_text_result=question_result.additional_text_result,
+                )
 
 
 GET_RESULTS_PREFETCH_LOOKUPS = [
@@ -277,9 +719,139 @@ type Distribution = tuple[float, ...] | None
 
 
 def annotate_distributions_and_grades(evaluations):
+    evaluations = list(evaluations)
+    distributions_and_grades = {
+        evaluation_id: (
+            (as_distribution(distribution), average_grade)
+            if Evaluation.can_publish_average_grade_for(num_voters, num_participants)
+            else (None, None)
+        )
+        for evaluation_id, distribution, average_grade, num_voters, num_participants in (
+            EvaluationGradeSummary.objects.filter(evaluation__in=evaluations).values_list(
+                "evaluation_id", "distribution", "average_grade", "num_voters", "num_participants"
+            )
+        )
+    }
+    # evaluations without stored grade summary, e.g. running ones
+    for evaluation_id, distribution in calculate_average_distributions(
+        evaluation for evaluation in evaluations if evaluation.id not in distributions_and_grades
+    ).items():
+        distributions_and_grades[evaluation_id] = (distribution, distribution_to_grade(distribution))
+
     for evaluation in evaluations:
-        evaluation.distribution = calculate_average_distribution(evaluation)
-        evaluation.avg_grade = distribution_to_grade(evaluation.distribution)
+        evaluation.distribution, evaluation.avg_grade = distributions_and_grades[evaluation.id]
+
+
+def as_distribution(stored_distribution: list[float] | None) -> Distribution:
+    return tuple(stored_distribution) if stored_distribution is not None else None
+
+
+def update_grade_summaries(evaluation_results: list[tuple[Evaluation, EvaluationResult]]):
+    """Stores the average grades of the given evaluations and of their courses, see EvaluationGradeSummary."""
+    summaries = []
+    for evaluation, evaluation_result in evaluation_results:
+        distribution = None
+        if evaluation.can_staff_see_average_grade:
+            distribution = average_distribution_of_results(evaluation_result)
+        summaries.append(
+            EvaluationGradeSummary(
+                evaluation=evaluation,
+                distribution=distribution,
+                average_grade=distribution_to_grade(distribution),
+                num_voters=evaluation.num_voters,
+                num_participants=evaluation.num_participants,
+            )
+        )
+
+    EvaluationGradeSummary.objects.bulk_create(
+        summaries,
+        update_conflicts=True,
+        unique_fields=["evaluation"],
+        update_fields=["distribution", "average_grade", "num_voters", "num_participants"],
+    )
+    update_course_grade_summaries({evaluation.course_id for evaluation, __ in evaluation_results})
+
+
+def update_grade_summary_counts(evaluation_ids: Iterable[int]):
+    """
+    Stores the current numbers of voters and participants in the grade summaries of the given evaluations, as they
+    decide whether the average grades are published, and updates the summaries of their courses.
+    """
+    summaries = EvaluationGradeSummary.objects.filter(evaluation_id__in=list(evaluation_ids))
+    course_ids = set(summaries.values_list("evaluation__course_id", flat=True))
+    if not course_ids:
+        return
+
+    # published evaluations keep the numbers they were published with, see Evaluation.num_participants
+    evaluation = Evaluation.objects.filter(pk=OuterRef("evaluation"))
+    summaries.update(
+        num_voters=Coalesce(
+            Subquery(evaluation.values("_voter_count")),
+            _count_per_evaluation(Evaluation.voters.through.objects.filter(evaluation=OuterRef("evaluation"))),
+        ),
+        num_participants=Coalesce(
+            Subquery(evaluation.values("_participant_count")),
+            _count_per_evaluation(Evaluation.participants.through.objects.filter(evaluation=OuterRef("evaluation"))),
+        ),
+    )
+    update_course_grade_summaries(course_ids)
+
+
+@receiver(m2m_changed, sender=Evaluation.participants.through)
+@receiver(m2m_changed, sender=Evaluation.voters.through)
+def _update_grade_summary_counts_on_m2m_change(
+    *, sender, instance, action: str, reverse: bool, pk_set: set[int] | None, **_kwargs
+) -> None:
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            update_grade_summary_counts([instance.pk])
+    elif action in ("post_add", "post_remove"):
+        update_grade_summary_counts(assert_not_none(pk_set))
+    elif action == "pre_clear":
+        # the evaluations of the user are not known anymore once they are cleared
+        instance._cleared_evaluation_ids = list(
+            sender.objects.filter(userprofile=instance).values_list("evaluation_id", flat=True)
+        )
+    elif action == "post_clear":
+        update_grade_summary_counts(instance.__dict__.pop("_cleared_evaluation_ids"))
+
+
+def delete_grade_summary(evaluation: Evaluation):
+    EvaluationGradeSummary.objects.filter(evaluation=evaluation).delete()
+    update_course_grade_summaries([evaluation.course_id])
+
+
+def update_course_grade_summaries(course_ids: Iterable[int]):
+    """Recalculates the average grades of the given courses from the grade summaries of their evaluations."""
+    weighted_distributions: dict[int, list[tuple[Distribution, int]]] = {course_id: [] for course_id in course_ids}
+    evaluations = (
+        Evaluation.objects.filter(course_id__in=weighted_distributions)
+        .order_by("pk")
+        .values_list(
+            "course_id",
+            "weight",
+            "grade_summary__distribution",
+            "grade_summary__num_voters",
+            "grade_summary__num_participants",
+        )
+    )
+    for course_id, weight, distribution, num_voters, num_participants in evaluations:
+        if distribution is not None and not Evaluation.can_publish_average_grade_for(num_voters, num_participants):
+            distribution = None
+        weighted_distributions[course_id].append((as_distribution(distribution), weight))
+
+    summaries = []
+    for course_id, course_weighted_distributions in weighted_distributions.items():
+        distribution = avg_distribution(course_weighted_distributions)
+        summaries.append(
+            CourseGradeSummary(
+                course_id=course_id, distribution=distribution, average_grade=distribution_to_grade(distribution)
+            )
+        )
+
+    CourseGradeSummary.objects.bulk_create(
+        summaries, update_conflicts=True, unique_fields=["course"], update_fields=["distribution", "average_grade"]
+    )
 
 
 def normalized_distribution(distribution):
@@ -311,6 +883,38 @@ def unipolarized_distribution(result):
     return normalized_distribution(summed_distribution)
 
 
+@cache
+def unipolarization_weights(grades: tuple[float, ...]) -> tuple[tuple[float, ...], ...]:
+    """
+    For each answer choice, the fractions of its answers that unipolarized_distribution adds to the grades 1 to 5.
+    Adding zero for all other grades does not change the resulting floats.
+    """
+    weights = []
+    for grade in grades:
+        grade_fraction, grade = modf(grade)
+        grade = int(grade)
+        choice_weights = [0.0] * 5
+        choice_weights[grade - 1] = 1 - grade_fraction
+        if grade < 5:
+            choice_weights[grade] = grade_fraction
+        weights.append(tuple(choice_weights))
+    return tuple(weights)
+
+
+def unipolarized_distribution_with_weights(result):
+    """Same as unipolarized_distribution, but using the cached unipolarization_weights of the result's choices."""
+    if not result.counts:
+        return None
+
+    weights = unipolarization_weights(tuple(result.choices.grades))
+    return normalized_distribution(
+        [
+            sum(choice_weights[index] * count for choice_weights, count in zip(weights, result.counts, strict=True))
+            for index in range(5)
+        ]
+    )
+
+
 def avg_distribution(weighted_distributions):
     if all(distribution is None for distribution, __ in weighted_distributions):
         return None
@@ -323,23 +927,15 @@ def avg_distribution(weighted_distributions):
     return normalized_distribution(summed_distribution)
 
 
-def average_grade_questions_distribution(results):
+def average_grade_questions_distribution(results, unipolarize=unipolarized_distribution):
     return avg_distribution(
-        [
-            (unipolarized_distribution(result), result.count_sum)
-            for result in results
-            if result.question.is_grade_question
-        ]
+        [(unipolarize(result), result.count_sum) for result in results if result.question.is_grade_question]
     )
 
 
-def average_non_grade_rating_questions_distribution(results):
+def average_non_grade_rating_questions_distribution(results, unipolarize=unipolarized_distribution):
     return avg_distribution(
-        [
-            (unipolarized_distribution(result), result.count_sum)
-            for result in results
-            if result.question.is_non_grade_rating_question
-        ]
+        [(unipolarize(result), result.count_sum) for result in results if result.question.is_non_grade_rating_question]
     )
 
 
@@ -347,15 +943,9 @@ def calculate_average_course_distribution(course, check_for_unpublished_evaluati
     if check_for_unpublished_evaluations and course.evaluations.exclude(state=Evaluation.State.PUBLISHED).exists():
         return None
 
-    return avg_distribution(
-        [
-            (
-                calculate_average_distribution(evaluation),
-                evaluation.weight,
-            )
-            for evaluation in course.evaluations.all()
-        ]
-    )
+    evaluations = course.evaluations.all()
+    distributions = calculate_average_distributions(evaluations)
+    return avg_distribution([(distributions[evaluation.id], evaluation.weight) for evaluation in evaluations])
 
 
 def get_evaluations_with_course_result_attributes(evaluations):
@@ -373,10 +963,19 @@ def get_evaluations_with_course_result_attributes(evaluations):
 
     evaluation_weight_sum_per_course_id = {entry[0]: entry[1] for entry in course_id_evaluation_weight_sum_pairs}
 
+    course_distributions = {
+        course_id: as_distribution(distribution)
+        for course_id, distribution in CourseGradeSummary.objects.filter(
+            course__in=Course.objects.filter(evaluations__in=evaluations)
+        ).values_list("course_id", "distribution")
+    }
+
     for evaluation in evaluations:
         if evaluation.course.id in courses_with_unpublished_evaluations:
             evaluation.course.not_all_evaluations_are_published = True
             evaluation.course.distribution = None
+        elif evaluation.course.id in course_distributions:
+            evaluation.course.distribution = course_distributions[evaluation.course.id]
         else:
             evaluation.course.distribution = calculate_average_course_distribution(evaluation.course, False)
 
@@ -393,9 +992,35 @@ def calculate_average_distribution(evaluation):
     if not evaluation.can_staff_see_average_grade or not evaluation.can_publish_average_grade:
         return None
 
+    return average_distribution_of_results(get_results(evaluation))
+
+
+def calculate_average_distributions(evaluations: Iterable[Evaluation]) -> dict[int, Distribution]:
+    """
+    Same as calculate_average_distribution for many evaluations at once, mapping evaluation ids to distributions.
+    The cached results are fetched with get_results_many and the answer counts are unipolarized with precomputed weights.
+    """
+    distributions: dict[int, Distribution] = {}
+    evaluations_with_average = []
+    for evaluation in evaluations:
+        assert evaluation.state >= Evaluation.State.IN_EVALUATION
+        if not evaluation.can_staff_see_average_grade or not evaluation.can_publish_average_grade:
+            distributions[evaluation.id] = None
+        else:
+            evaluations_with_average.append(evaluation)
+
+    for evaluation_id, evaluation_result in get_results_many(evaluations_with_average).items():
+        distributions[evaluation_id] = average_distribution_of_results(
+            evaluation_result, unipolarize=unipolarized_distribution_with_weights
+        )
+
+    return distributions
+
+
+def average_distribution_of_results(evaluation_result: EvaluationResult, unipolarize=unipolarized_distribution):
     # will contain a list of question results for each contributor and one for the evaluation (where contributor is None)
     grouped_results = defaultdict(list)
-    for contribution_result in get_results(evaluation).contribution_results:
+    for contribution_result in evaluation_result.contribution_results:
         for questionnaire_result in contribution_result.questionnaire_results:
             if not questionnaire_result.questionnaire.is_dropout:  # dropout questionnaires are not counted
                 grouped_results[contribution_result.contributor].extend(questionnaire_result.question_results)
@@ -408,11 +1033,11 @@ def calculate_average_distribution(evaluation):
                 avg_distribution(
                     [
                         (
-                            average_grade_questions_distribution(contributor_results),
+                            average_grade_questions_distribution(contributor_results, unipolarize),
                             settings.CONTRIBUTOR_GRADE_QUESTIONS_WEIGHT,
                         ),
                         (
-                            average_non_grade_rating_questions_distribution(contributor_results),
+                            average_non_grade_rating_questions_distribution(contributor_results, unipolarize),
                             settings.CONTRIBUTOR_NON_GRADE_RATING_QUESTIONS_WEIGHT,
                         ),
                     ]
@@ -428,9 +1053,12 @@ def calculate_average_distribution(evaluation):
 
     return avg_distribution(
         [
-            (average_grade_questions_distribution(evaluation_results), settings.GENERAL_GRADE_QUESTIONS_WEIGHT),
             (
-                average_non_grade_rating_questions_distribution(evaluation_results),
+                average_grade_questions_distribution(evaluation_results, unipolarize),
+                settings.GENERAL_GRADE_QUESTIONS_WEIGHT,
+            ),
+            (
+                average_non_grade_rating_questions_distribution(evaluation_results, unipolarize),
                 settings.GENERAL_NON_GRADE_QUESTIONS_WEIGHT,
             ),
             (average_contributor_distribution, settings.CONTRIBUTIONS_WEIGHT),
@@ -72,39 +72,45 @@ def update_template_cache(evaluations):
     results_index_course_template = get_template("results_index_course_impl.html", using="CachedEngine")
     results_index_evaluation_template = get_template("results_index_evaluation_impl.html", using="CachedEngine")
 
+    # all fragments are written at once to save round trips to the cache
+    fragments = {}
     try:
         for lang in ["en", "de"]:
             translation.activate(lang)
 
             for course, course_evaluations in courses_and_evaluations.items():
                 if len(course_evaluations) > 1:
-                    caches["results"].set(
-                        get_course_result_template_fragment_cache_key(course.id, lang),
-                        results_index_course_template.render({"course": course, "evaluations": course_evaluations}),
+                    fragments[get_course_result_template_fragment_cache_key(course.id, lang)] = (
+                        results_index_course_template.render({"course": course, "evaluations": course_evaluations})
                     )
 
                 for evaluation in course_evaluations:
                     assert evaluation.state in STATES_WITH_RESULT_TEMPLATE_CACHING
                     base_args = {"evaluation": evaluation, "is_subentry": len(course_evaluations) > 1}
 
-                    caches["results"].set(
-                        get_evaluation_result_template_fragment_cache_key(evaluation.id, lang, True),
-                        results_index_evaluation_template.render({**base_args, "links_to_results_page": True}),
+                    fragments[get_evaluation_result_template_fragment_cache_key(evaluation.id, lang, True)] = (
+                        results_index_evaluation_template.render({**base_args, "links_to_results_page": True})
                     )
-                    caches["results"].set(
-                        get_evaluation_result_template_fragment_cache_key(evaluation.id, lang, False),
-                        results_index_evaluation_template.render({**base_args, "links_to_results_page": False}),
+                    fragments[get_evaluation_result_template_fragment_cache_key(evaluation.id, lang, False)] = (
+                        results_index_evaluation_template.render({**base_args, "links_to_results_page": False})
                     )
 
     finally:
         translation.activate(current_language)  # reset to previously set language to prevent unwanted side effects
 
+    caches["results"].set_many(fragments)
+
 
 def update_template_cache_of_published_evaluations_in_course(course):
+    update_template_cache_of_published_evaluations_in_courses([course])
+
+
+def update_template_cache_of_published_evaluations_in_courses(courses):
     # Delete template caches for evaluations that no longer need to be cached (e.g. after unpublishing)
-    _delete_course_template_cache_impl(course)
+    for course in courses:
+        _delete_course_template_cache_impl(course)
 
-    course_evaluations = course.evaluations.filter(state__in=STATES_WITH_RESULT_TEMPLATE_CACHING)
+    course_evaluations = Evaluation.objects.filter(course__in=courses, state__in=STATES_WITH_RESULT_TEMPLATE_CACHING)
     update_template_cache(course_evaluations)
 
 
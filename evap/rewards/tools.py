@@ -1,4 +1,5 @@
 import logging
+from collections.abc import Iterable, Mapping
 
 from django.conf import settings
 from django.contrib import messages
@@ -67,6 +68,24 @@ def grant_reward_points_if_eligible(user: UserProfile, semester: Semester) -> tu
     return None, False
 
 
+def grant_reward_points_after_participation_removal(
+    removed_user_ids_by_semester: Mapping[Semester, Iterable[int]],
+) -> None:
+    """
+    Grants the reward points that users may have earned because they no longer need to evaluate the evaluations they
+    were removed from. Used when participations are removed without m2m_changed signals.
+    """
+    grantings: list[RewardPointGranting] = []
+    for semester, user_ids in removed_user_ids_by_semester.items():
+        for user in UserProfile.objects.filter(pk__in=user_ids):
+            granting, __ = grant_reward_points_if_eligible(user, semester)
+            if granting:
+                grantings.append(granting)
+
+    if grantings:
+        RewardPointGranting.granted_by_participation_removal.send(sender=RewardPointGranting, grantings=grantings)
+
+
 def grant_eligible_reward_points_for_semester(request: HttpRequest, semester: Semester) -> None:
     users = UserProfile.objects.filter(evaluations_voted_for__course__semester=semester)
     reward_point_sum = 0
@@ -115,28 +134,25 @@ def grant_reward_points_after_evaluate(request: HttpRequest, semester: Semester,
 def grant_reward_points_on_participation_change(instance, action: str, reverse: bool, pk_set, **_kwargs) -> None:
     # if users do not need to evaluate anymore, they may have earned reward points
     if action == "post_remove":
-        grantings: list[RewardPointGranting] = []
-
         if reverse:
             # one or more evaluations got removed from a participant
             user = instance
+            grantings: list[RewardPointGranting] = []
 
             for semester in Semester.objects.filter(courses__evaluations__pk__in=pk_set):
                 granting, __ = grant_reward_points_if_eligible(user, semester)
                 if granting:
                     assert not grantings
                     grantings = [granting]
+
+            if grantings:
+                RewardPointGranting.granted_by_participation_removal.send(
+                    sender=RewardPointGranting, grantings=grantings
+                )
         else:
             # one or more participants got removed from an evaluation
             evaluation = instance
-
-            for user in UserProfile.objects.filter(pk__in=pk_set):
-                granting, __ = grant_reward_points_if_eligible(user, evaluation.course.semester)
-                if granting:
-                    grantings.append(granting)
-
-        if grantings:
-            RewardPointGranting.granted_by_participation_removal.send(sender=RewardPointGranting, grantings=grantings)
+            grant_reward_points_after_participation_removal({evaluation.course.semester: pk_set})
 
 
 @receiver(models.signals.pre_delete, sender=Evaluation)
@@ -116,6 +116,12 @@ EVALUATION_END_OFFSET_HOURS = 3
 # Amount of hours in which participant will be warned
 EVALUATION_END_WARNING_PERIOD = 5
 
+# If enabled, the answers of a vote are only put into a queue and added to the results by the process_vote_queue command.
+# This keeps votes fast when many participants vote for the same evaluations at the same time. Until they are
+# processed, queued votes can be linked to their voters by anyone with database access, so the command should run
+# continuously with --worker to keep that window short (see QueuedVote).
+VOTE_INGESTION_QUEUE = False
+
 # default timedelta for exam evaluation vote_end_date after exam date
 EXAM_EVALUATION_DEFAULT_DURATION = timedelta(days=3)
 
@@ -195,6 +201,11 @@ LEGAL_NOTICE_LINK = "https://example.com/legalnotice"
 DEFAULT_FROM_EMAIL = "webmaster@localhost"
 REPLY_TO_EMAIL = DEFAULT_FROM_EMAIL
 SEND_ALL_EMAILS_TO_ADMINS_IN_BCC = False
+# number of emails that are rendered and sent over one connection before the progress is logged
+EMAIL_BATCH_SIZE = 100
+# If enabled, emails are only put into an outbox and sent by the process_email_outbox command.
+# This keeps requests that send many emails fast and independent of the speed of the mail server.
+EMAIL_OUTBOX = False
 if DEBUG:
     EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
@@ -282,6 +293,7 @@ MIDDLEWARE = [
     "mozilla_django_oidc.middleware.SessionRefresh",
     "evap.middleware.RequireLoginMiddleware",
     "evap.middleware.user_language_middleware",
+    "evap.middleware.results_memo_middleware",
     "evap.staff.staff_mode.staff_mode_middleware",
     "evap.evaluation.middleware.LoggingRequestMiddleware",
 ]
@@ -12,13 +12,19 @@ from django.http.request import QueryDict
 from django.utils.text import normalize_newlines
 from django.utils.translation import gettext_lazy as _
 
-from evap.evaluation.forms import UserModelChoiceField, UserModelMultipleChoiceField
+from evap.evaluation.forms import (
+    UserModelChoiceField,
+    UserModelMultipleChoiceField,
+    UserSearchSelect,
+    UserSearchSelectMultiple,
+)
 from evap.evaluation.models import (
     Contribution,
     Course,
     CourseType,
     EmailTemplate,
     Evaluation,
+    EvaluationCounters,
     ExamType,
     FaqQuestion,
     FaqSection,
@@ -33,7 +39,12 @@ from evap.evaluation.models import (
     UserProfile,
 )
 from evap.evaluation.tools import clean_email
-from evap.results.tools import STATES_WITH_RESULT_TEMPLATE_CACHING, STATES_WITH_RESULTS_CACHING, cache_results
+from evap.results.tools import (
+    STATES_WITH_RESULT_TEMPLATE_CACHING,
+    STATES_WITH_RESULTS_CACHING,
+    cache_results,
+    update_course_grade_summaries,
+)
 from evap.results.views import update_template_cache, update_template_cache_of_published_evaluations_in_course
 from evap.staff.tools import remove_user_from_represented_and_ccing_users
 from evap.student.models import TextAnswerWarning
@@ -283,6 +294,9 @@ class CourseFormMixin:
         field_classes = {
             "responsibles": UserModelMultipleChoiceField,
         }
+        widgets = {
+            "responsibles": UserSearchSelectMultiple(),
+        }
 
     def _set_responsibles_queryset(self, existing_course=None):
         queryset = UserProfile.objects.exclude(is_active=False)
@@ -437,6 +451,9 @@ class EvaluationForm(forms.ModelForm):
         field_classes = {
             "participants": UserModelMultipleChoiceField,
         }
+        widgets = {
+            "participants": UserSearchSelectMultiple(),
+        }
 
     def __init__(self, *args, requires_decided_main_language=False, **kwargs):
         semester = kwargs.pop("semester", None)
@@ -551,6 +568,8 @@ class EvaluationForm(forms.ModelForm):
 
         if hasattr(evaluation, "old_course"):
             if evaluation.old_course != evaluation.course:
+                EvaluationCounters.update_for([evaluation])
+                update_course_grade_summaries([evaluation.old_course.id, evaluation.course.id])
                 update_template_cache_of_published_evaluations_in_course(evaluation.old_course)
                 update_template_cache_of_published_evaluations_in_course(evaluation.course)
 
@@ -597,7 +616,7 @@ class ExamEvaluationForm(forms.Form):
 
 
 class ContributionForm(forms.ModelForm):
-    contributor = UserModelChoiceField(queryset=UserProfile.objects.exclude(is_active=False))
+    contributor = UserModelChoiceField(queryset=UserProfile.objects.exclude(is_active=False), widget=UserSearchSelect)
     evaluation = forms.ModelChoiceField(
         Evaluation.objects.all(), disabled=True, required=False, widget=forms.HiddenInput()
     )
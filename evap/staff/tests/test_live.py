@@ -61,14 +61,23 @@ class EvaluationEditLiveTest(LiveServerTest):
         with self.enter_staff_mode():
             self.selenium.get(self.reverse("staff:evaluation_edit", args=[evaluation.pk]))
 
-        row = self.wait.until(visibility_of_element_located((By.CSS_SELECTOR, "#id_contributions-0-contributor")))
-        tomselect_options = row.get_property("tomselect")["options"]
-        manager_text = "manager (manager@institution.example.com)"
-        manager_options = [key for key, value in tomselect_options.items() if value["text"] == manager_text]
-        self.assertEqual(len(manager_options), 1)
+        self.wait.until(visibility_of_element_located((By.CSS_SELECTOR, "#id_contributions-0-contributor")))
+        # only selected users are rendered, others are loaded from the user search view
+        self.selenium.execute_script(
+            """document.querySelector("#id_contributions-0-contributor").tomselect.load("manager");"""
+        )
+        self.wait.until(
+            lambda driver: (
+                driver.execute_script(
+                    f"""return document.querySelector("#id_contributions-0-contributor").tomselect
+                    .options["{self.manager.pk}"]?.text;"""
+                )
+                == "manager (manager@institution.example.com)"
+            )
+        )
         self.selenium.execute_script(
             f"""let tomselect = document.querySelector("#id_contributions-0-contributor").tomselect;
-            tomselect.setValue("{manager_options[0]}");"""
+            tomselect.setValue("{self.manager.pk}");"""
         )
 
         submit_btn = self.wait.until(
@@ -1,5 +1,6 @@
 import csv
 import datetime
+import re
 from abc import ABC, abstractmethod
 from io import BytesIO
 from typing import Literal
@@ -63,7 +64,7 @@ from evap.staff.tests.utils import (
     run_in_staff_mode,
 )
 from evap.staff.tools import user_edit_link
-from evap.staff.views import get_evaluations_with_prefetched_data
+from evap.staff.views import SemesterStats, get_evaluations_with_prefetched_data, get_semester_stats
 from evap.student.models import TextAnswerWarning
 
 
@@ -808,6 +809,189 @@ class TestSemesterView(WebTestStaffMode):
         self.assertEqual(page.body.decode().count("textanswers_reviewed"), expected_count)
         self.assertEqual(page.body.decode().count("no_review"), 1)
 
+    @patch("evap.staff.views.SEMESTER_VIEW_MAX_CLIENT_SIDE_EVALUATIONS", 1)
+    def test_server_side_evaluations(self):
+        page = self.app.get(self.url, user=self.manager)
+        self.assertNotIn('id="evaluation-row-', page)
+        self.assertIn(reverse("staff:semester_evaluations", args=[self.semester.pk]), page)
+        self.assertIn('name="filter-program"', page)
+        self.assertNotIn('data-filter="results_not_published"', page)
+
+    def test_client_side_evaluations(self):
+        page = self.app.get(self.url, user=self.manager)
+        self.assertEqual(page.body.decode().count('id="evaluation-row-'), 2)
+        self.assertNotIn('name="filter-program"', page)
+
+
+class TestSemesterEvaluationsView(WebTestStaffMode):
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = make_manager()
+        cls.semester = baker.make(Semester)
+        cls.url = reverse("staff:semester_evaluations", args=[cls.semester.pk])
+
+        cls.program = baker.make(Program)
+        cls.course_type = baker.make(CourseType)
+        responsible = baker.make(UserProfile, email="responsible@institution.example.com", last_name="Responsible")
+        cls.evaluations = [
+            baker.make(
+                Evaluation,
+                name_en="",
+                state=Evaluation.State.NEW,
+                course=baker.make(
+                    Course, name_de="Algebra", name_en="Algebra", semester=cls.semester, programs=[cls.program]
+                ),
+            ),
+            baker.make(
+                Evaluation,
+                name_en="Exam",
+                state=Evaluation.State.IN_EVALUATION,
+                course=baker.make(
+                    Course, name_de="Biologie", name_en="Biology", semester=cls.semester, type=cls.course_type
+                ),
+            ),
+            baker.make(
+                Evaluation,
+                name_en="",
+                state=Evaluation.State.EVALUATED,
+                can_publish_text_results=True,
+                course=baker.make(
+                    Course, name_de="Chemie", name_en="Chemistry", semester=cls.semester, responsibles=[responsible]
+                ),
+            ),
+        ]
+        baker.make(TextAnswer, contribution=cls.evaluations[2].general_contribution)
+        baker.make(Evaluation, course__semester=baker.make(Semester))
+
+    def get_ids(self, params):
+        response = self.app.get(self.url, params=params, user=self.manager).json
+        ids = [int(row_id) for row_id in re.findall(r'id="evaluation-row-(\d+)"', response["rows"])]
+        return ids, response
+
+    def test_pagination(self):
+        with patch("evap.staff.views.SEMESTER_VIEW_PAGE_SIZE", 2):
+            ids, response = self.get_ids({})
+            self.assertEqual(ids, [self.evaluations[0].pk, self.evaluations[1].pk])
+            self.assertEqual(response["next"], self.evaluations[1].pk)
+            self.assertIn(f'id="exam_creation_form_{self.evaluations[0].pk}"', response["exam_creation_forms"])
+
+            ids, response = self.get_ids({"after": response["next"]})
+            self.assertEqual(ids, [self.evaluations[2].pk])
+            self.assertIsNone(response["next"])
+            self.assertNotIn("counts", response)
+
+    def test_filters(self):
+        ids, response = self.get_ids({})
+        self.assertEqual(ids, [evaluation.pk for evaluation in self.evaluations])
+        self.assertEqual(response["counts"]["in_evaluation"], 1)
+        self.assertEqual(response["counts"]["evaluation_not_finished"], 3)
+        self.assertEqual(response["counts"]["unreviewed_textanswers"], 1)
+        self.assertEqual(response["counts"]["no_review"], 2)
+
+        for params, expected in [
+            ({"filter": "evaluated"}, [self.evaluations[2]]),
+            ({"filter": str(Evaluation.State.NEW.value)}, [self.evaluations[0]]),
+            ({"filter": "unreviewed_textanswers"}, [self.evaluations[2]]),
+            ({"filter": "textanswers_reviewed"}, []),
+            ({"program": self.program.pk}, [self.evaluations[0]]),
+            ({"course_type": self.course_type.pk}, [self.evaluations[1]]),
+            ({"search": "bio exa"}, [self.evaluations[1]]),
+            ({"search": "responsible"}, [self.evaluations[2]]),
+        ]:
+            with self.subTest(params=params):
+                ids, __ = self.get_ids(params)
+                self.assertEqual(ids, [evaluation.pk for evaluation in expected])
+
+        __, response = self.get_ids({"search": "chemistry"})
+        self.assertEqual(response["counts"]["unreviewed_textanswers"], 1)
+        self.assertEqual(response["counts"]["in_evaluation"], 0)
+
+    def test_invalid_parameters(self):
+        self.app.get(self.url, params={"filter": "unknown"}, user=self.manager, status=400)
+        self.app.get(self.url, params={"program": "x"}, user=self.manager, status=400)
+        self.app.get(self.url, params={"after": "x"}, user=self.manager, status=400)
+        other_evaluation = Evaluation.objects.exclude(course__semester=self.semester).get()
+        self.app.get(self.url, params={"after": other_evaluation.pk}, user=self.manager, status=404)
+
+    def test_access_to_semester_with_archived_results(self):
+        reviewer = baker.make(UserProfile, groups=[Group.objects.get(name="Reviewer")])
+        self.app.get(self.url, user=reviewer, status=200)
+
+        semester = baker.make(Semester, results_are_archived=True)
+        url = reverse("staff:semester_evaluations", args=[semester.pk])
+        self.app.get(url, user=self.manager, status=200)
+        self.app.get(url, user=reviewer, status=403)
+
+
+class TestGetSemesterStats(TestCase):
+    def test_stats(self):
+        semester = baker.make(Semester)
+        program1, program2 = baker.make(Program, order=iter([1, 2]), _quantity=2)
+        course1 = baker.make(Course, semester=semester, programs=[program1, program2])
+        course2 = baker.make(Course, semester=semester, programs=[program2])
+        published = baker.make(
+            Evaluation,
+            course=course1,
+            state=Evaluation.State.PUBLISHED,
+            _participant_count=10,
+            _voter_count=5,
+            can_publish_text_results=True,
+            vote_start_datetime=datetime.datetime(2024, 1, 1, 8),
+            vote_end_date=datetime.date(2024, 1, 31),
+        )
+        baker.make(
+            TextAnswer,
+            contribution=published.general_contribution,
+            review_decision=iter([TextAnswer.ReviewDecision.PUBLIC, TextAnswer.ReviewDecision.UNDECIDED]),
+            _quantity=2,
+        )
+        users = baker.make(UserProfile, _quantity=3)
+        baker.make(
+            Evaluation,
+            course=course2,
+            state=Evaluation.State.IN_EVALUATION,
+            participants=users,
+            voters=users[:1],
+            vote_start_datetime=datetime.datetime(2024, 2, 1, 8),
+            vote_end_date=datetime.date(2024, 2, 28),
+            _fill_optional=["name_de", "name_en"],
+        )
+        baker.make(
+            Evaluation,
+            course=course2,
+            state=Evaluation.State.NEW,
+            participants=users,
+            vote_start_datetime=datetime.datetime(2023, 1, 1, 8),
+            vote_end_date=datetime.date(2025, 1, 1),
+            _fill_optional=["name_de", "name_en"],
+        )
+        baker.make(
+            Evaluation,
+            course__semester=semester,
+            state=Evaluation.State.APPROVED,
+            vote_start_datetime=datetime.datetime(2024, 3, 1, 8),
+            vote_end_date=datetime.date(2024, 3, 31),
+        )
+        baker.make(Evaluation, state=Evaluation.State.IN_EVALUATION, course=baker.make(Course, programs=[program1]))
+
+        stats = get_semester_stats(semester)
+
+        self.assertEqual(list(stats.keys()), [program1, program2, "total"])
+        self.assertEqual(
+            stats[program1],
+            SemesterStats(10, 5, 1, 1, 2, 1, datetime.datetime(2024, 1, 1, 8), datetime.date(2024, 1, 31)),
+        )
+        self.assertEqual(
+            stats[program2],
+            SemesterStats(13, 6, 1, 2, 2, 1, datetime.datetime(2024, 1, 1, 8), datetime.date(2024, 2, 28)),
+        )
+        self.assertEqual(
+            stats["total"],
+            SemesterStats(13, 6, 1, 3, 2, 1, datetime.datetime(2024, 1, 1, 8), datetime.date(2024, 3, 31)),
+        )
+
+        self.assertEqual(get_semester_stats(baker.make(Semester)), {"total": SemesterStats()})
+
 
 class TestGetEvaluationsWithPrefetchedData(TestCase):
     @staticmethod
@@ -1061,10 +1245,9 @@ class TestSemesterPreparationReminderView(WebTestStaffModeWith200Check):
 
         self.app.post(self.url, user=self.manager, status=200)
 
-        email_template_mock.send_to_user.assert_called_once()
-        kwargs = email_template_mock.send_to_user.mock_calls[0][2]
-        self.assertEqual(kwargs["subject_params"], {})
-        self.assertEqual(kwargs["body_params"], {"user": self.user, "evaluations": [self.evaluation]})
+        email_template_mock.send_to_users.assert_called_once()
+        args, kwargs = email_template_mock.send_to_users.call_args
+        self.assertEqual(args[0], [(self.user, {}, {"user": self.user, "evaluations": [self.evaluation]})])
         self.assertEqual(kwargs["use_cc"], True)
 
     def test_invalid_mode(self) -> None:
@@ -1433,6 +1616,18 @@ class TestSemesterRawDataExportView(WebTestStaffModeWith200Check):
         )
         self.assertEqual(response.content, expected_content.encode("utf-8"))
 
+    def test_number_of_queries_does_not_depend_on_number_of_evaluations(self):
+        program = baker.make(Program)
+        evaluations = baker.make(
+            Evaluation, course__semester=self.semester, course__type=self.course_type, _quantity=20
+        )
+        for evaluation in evaluations:
+            evaluation.course.programs.set([program])
+
+        with self.assertNumQueries(FuzzyInt(0, 15)):
+            response = self.app.get(self.url, user=self.manager)
+        self.assertEqual(len(response.content.decode().splitlines()), 21)
+
 
 class TestSemesterParticipationDataExportView(WebTestStaffMode):
     @classmethod
@@ -1441,7 +1636,7 @@ class TestSemesterParticipationDataExportView(WebTestStaffMode):
         student_user = baker.make(UserProfile, email="student@example.com")
         student_user2 = baker.make(UserProfile, email="student2@example.com")
 
-        semester = baker.make(Semester)
+        cls.semester = semester = baker.make(Semester)
         cls.url = f"/staff/semester/{semester.pk}/participation_export"
 
         baker.make(
@@ -1472,6 +1667,28 @@ class TestSemesterParticipationDataExportView(WebTestStaffMode):
         )
         self.assertEqual(response.content, expected_content.encode("utf-8"))
 
+    def test_internal_participants_and_number_of_queries(self):
+        evaluation = baker.make(Evaluation, course__semester=self.semester, is_rewarded=True)
+        other_evaluation = baker.make(Evaluation, is_rewarded=True)
+        users = baker.make(
+            UserProfile,
+            email=iter(f"user{i}@institution.example.com" for i in range(20)),
+            _bulk_create=True,
+            _quantity=20,
+        )
+        evaluation.participants.add(*users)
+        evaluation.voters.add(*users[:5])
+        other_evaluation.participants.add(*users)
+        other_evaluation.voters.add(*users)
+
+        with self.assertNumQueries(FuzzyInt(0, 10)):
+            response = self.app.get(self.url, user=self.manager)
+
+        lines = response.content.decode().splitlines()
+        self.assertEqual(len(lines), 1 + 2 + 20)
+        self.assertIn("user0@institution.example.com;True;1;1;0;0;0", lines)
+        self.assertIn("user5@institution.example.com;True;0;1;0;0;0", lines)
+
 
 class TestSemesterVoteTimestampsExport(WebTestStaffMode):
     @classmethod
@@ -1863,7 +2080,7 @@ class TestCourseCreateView(WebTestStaffMode):
         form["type"] = self.course_type.pk
         form["programs"] = [self.program.pk]
         form["is_private"] = False
-        form["responsibles"] = [self.responsible.pk]
+        form["responsibles"].force_value([self.responsible.pk])
         form["name_en"] = name_en
         form["name_de"] = name_de
         return form
@@ -1932,7 +2149,7 @@ class TestEvaluationCreateView(WebTestStaffMode):
         form["contributions-INITIAL_FORMS"] = 0
         form["contributions-MAX_NUM_FORMS"] = 5
         form["contributions-0-evaluation"] = ""
-        form["contributions-0-contributor"] = self.manager.pk
+        form["contributions-0-contributor"].force_value(self.manager.pk)
         form["contributions-0-questionnaires"] = [self.q2.pk]
         form["contributions-0-order"] = 0
         form["contributions-0-role"] = Contribution.Role.EDITOR
@@ -11,6 +11,7 @@ urlpatterns = [
     path("semester/", RedirectView.as_view(url='/staff/', permanent=True)),
     path("semester/create", views.SemesterCreateView.as_view(), name="semester_create"),
     path("semester/<int:semester_id>", views.semester_view, name="semester_view"),
+    path("semester/<int:semester_id>/evaluations", views.semester_evaluations, name="semester_evaluations"),
     path("semester/<int:semester_id>/edit", views.SemesterEditView.as_view(), name="semester_edit"),
     path("semester/make_active", views.semester_make_active, name="semester_make_active"),
     path("semester/delete", views.semester_delete, name="semester_delete"),
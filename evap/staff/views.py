@@ -1,12 +1,12 @@
 import csv
 import itertools
 import logging
-from collections import OrderedDict, defaultdict, namedtuple
+from collections import defaultdict, namedtuple
 from collections.abc import Collection
 from dataclasses import dataclass
 from datetime import date, datetime
 from enum import Enum
-from typing import Any, Final, Literal, assert_never, cast
+from typing import Any, Final, Literal, assert_never
 
 import openpyxl
 from django.conf import settings
@@ -18,19 +18,33 @@ from django.db.models import (
     BooleanField,
     Case,
     Count,
+    Exists,
     ExpressionWrapper,
     Func,
     IntegerField,
+    Max,
+    Min,
     OuterRef,
     Prefetch,
     Q,
+    Subquery,
     Sum,
     When,
 )
+from django.db.models.functions import Coalesce
 from django.forms import BaseForm, formset_factory
 from django.forms.models import inlineformset_factory, modelformset_factory
-from django.http import Http404, HttpRequest, HttpResponse, HttpResponseBadRequest, HttpResponseRedirect
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseRedirect,
+    JsonResponse,
+    QueryDict,
+)
 from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
 from django.urls import reverse, reverse_lazy
 from django.utils import translation
 from django.utils.html import format_html
@@ -49,6 +63,7 @@ from evap.evaluation.models import (
     CourseType,
     EmailTemplate,
     Evaluation,
+    EvaluationCounters,
     ExamType,
     FaqQuestion,
     FaqSection,
@@ -68,18 +83,22 @@ from evap.evaluation.tools import (
     HttpResponseNoContent,
     SaveValidFormMixin,
     StrOrPromise,
+    csv_attachment_response,
     get_bool_parameter_from_url_or_session,
     get_object_from_dict_pk_entry_or_logged_40x,
     get_string_parameter_from_url_or_session,
     sort_formset,
     temporary_receiver,
 )
-from evap.grades.models import GradeDocument
 from evap.results.exporters import ResultsExporter
-from evap.results.tools import TextResult, calculate_average_distribution, distribution_to_grade
+from evap.results.tools import (
+    TextResult,
+    annotate_distributions_and_grades,
+    invalidate_live_results,
+)
 from evap.results.views import update_template_cache_of_published_evaluations_in_course
 from evap.rewards.models import RewardPointGranting
-from evap.rewards.tools import can_reward_points_be_used_by, deactivate_semester, is_semester_activated
+from evap.rewards.tools import deactivate_semester, is_semester_activated
 from evap.staff import staff_mode
 from evap.staff.forms import (
     AtLeastOneFormset,
@@ -154,17 +173,18 @@ def index(request):
 
 
 def annotate_evaluations_with_grade_document_counts(evaluations):
+    counts = EvaluationCounters.counts()
     return evaluations.annotate(
-        midterm_grade_documents_count=Count(
-            "course__grade_documents",
-            filter=Q(course__grade_documents__type=GradeDocument.Type.MIDTERM_GRADES),
-            distinct=True,
-        ),
-        final_grade_documents_count=Count(
-            "course__grade_documents",
-            filter=Q(course__grade_documents__type=GradeDocument.Type.FINAL_GRADES),
-            distinct=True,
-        ),
+        midterm_grade_documents_count=counts["midterm_grade_document_count"],
+        final_grade_documents_count=counts["final_grade_document_count"],
+    )
+
+
+def annotate_evaluations_with_textanswer_counts(evaluations):
+    counts = EvaluationCounters.counts()
+    return evaluations.annotate(
+        num_textanswers=Case(When(can_publish_text_results=True, then=counts["textanswer_count"]), default=0),
+        num_reviewed_textanswers=counts["reviewed_textanswer_count"],
     )
 
 
@@ -182,80 +202,177 @@ def get_evaluations_with_prefetched_data(semester):
             "cms_evaluation_links",
         )
         .annotate(
-            num_contributors=Count("contributions", filter=~Q(contributions__contributor=None), distinct=True),
-            num_textanswers=Count(
-                "contributions__textanswer_set",
-                filter=Q(contributions__evaluation__can_publish_text_results=True),
-                distinct=True,
-            ),
-            num_reviewed_textanswers=Count(
-                "contributions__textanswer_set",
-                filter=~Q(contributions__textanswer_set__review_decision=TextAnswer.ReviewDecision.UNDECIDED),
-                distinct=True,
+            num_contributors=EvaluationCounters.counts()["contributor_count"],
+            num_course_evaluations=Subquery(
+                Evaluation.objects.filter(course=OuterRef("course"))
+                .order_by()
+                .values("course")
+                .annotate(count=Count("pk"))
+                .values("count")
             ),
-            num_course_evaluations=Count("course__evaluations", distinct=True),
         )
     ).order_by("pk")
+    evaluations = annotate_evaluations_with_textanswer_counts(evaluations)
     evaluations = annotate_evaluations_with_grade_document_counts(evaluations)
     return Evaluation.annotate_with_participant_and_voter_counts(evaluations)
 
 
-@reviewer_required
-def semester_view(request, semester_id) -> HttpResponse:
+@dataclass
+class SemesterStats:
+    # pylint: disable=too-many-instance-attributes
+    num_enrollments_in_evaluation: int = 0
+    num_votes: int = 0
+    num_evaluations_evaluated: int = 0
+    num_evaluations: int = 0
+    num_textanswers: int = 0
+    num_textanswers_reviewed: int = 0
+    first_start: datetime = datetime(9999, 1, 1)
+    last_end: date = date(2000, 1, 1)
+
+
+def get_semester_stats(semester: Semester) -> dict[Program | str, SemesterStats]:
+    """
+    Statistics of the evaluations of the semester per program, ordered by program, and in total under the key "total".
+    The per-program statistics are computed by a single grouping aggregate query.
+    """
+    evaluations = Evaluation.annotate_with_participant_and_voter_counts(
+        annotate_evaluations_with_textanswer_counts(semester.evaluations.all())
+    ).order_by()
+
+    in_evaluation = Q(state__gte=Evaluation.State.IN_EVALUATION)
+    not_new = ~Q(state=Evaluation.State.NEW)
+    aggregates = {
+        "num_enrollments_in_evaluation": Coalesce(Sum("num_participants", filter=in_evaluation), 0),
+        "num_votes": Coalesce(Sum("num_voters", filter=in_evaluation), 0),
+        "num_evaluations_evaluated": Count("pk", filter=Q(state__gte=Evaluation.State.EVALUATED)),
+        "num_evaluations": Count("pk", filter=not_new),
+        "num_textanswers": Coalesce(Sum("num_textanswers", filter=in_evaluation), 0),
+        "num_textanswers_reviewed": Coalesce(Sum("num_reviewed_textanswers", filter=in_evaluation), 0),
+        "first_start": Min("vote_start_datetime", filter=not_new),
+        "last_end": Max("vote_end_date", filter=not_new),
+    }
+
+    def to_stats(values: dict[str, Any]) -> SemesterStats:
+        if values["num_evaluations"] == 0:
+            # keep the defaults instead of the missing minimum and maximum
+            values = {**values, "first_start": SemesterStats.first_start, "last_end": SemesterStats.last_end}
+        return SemesterStats(**{name: values[name] for name in aggregates})
+
+    program_values = {
+        values["course__programs"]: values
+        for values in evaluations.filter(course__programs__isnull=False)
+        .values("course__programs")
+        .annotate(**aggregates)
+    }
+    program_stats: dict[Program | str, SemesterStats] = {
+        program: to_stats(program_values[program.pk])
+        for program in Program.objects.filter(pk__in=program_values.keys())
+    }
+    program_stats["total"] = to_stats(evaluations.aggregate(**aggregates))
+    return program_stats
+
+
+# The semester view filters and paginates the evaluations on the server if a semester has more evaluations than this
+SEMESTER_VIEW_MAX_CLIENT_SIDE_EVALUATIONS = 500
+SEMESTER_VIEW_PAGE_SIZE = 100
+
+_has_textanswers = Q(can_publish_text_results=True) & Q(
+    Exists(TextAnswer.objects.filter(contribution__evaluation=OuterRef("pk")))
+)
+_has_unreviewed_textanswers = Q(
+    Exists(
+        TextAnswer.objects.filter(
+            contribution__evaluation=OuterRef("pk"), review_decision=TextAnswer.ReviewDecision.UNDECIDED
+        )
+    )
+)
+# Server-side equivalents of the filter buttons of the semester view. The filters depending on the grading process
+# are only available client-side.
+SEMESTER_VIEW_FILTERS: dict[str, Q] = {
+    str(Evaluation.State.NEW.value): Q(state=Evaluation.State.NEW),
+    str(Evaluation.State.PREPARED.value): Q(state=Evaluation.State.PREPARED),
+    str(Evaluation.State.EDITOR_APPROVED.value): Q(state=Evaluation.State.EDITOR_APPROVED),
+    str(Evaluation.State.APPROVED.value): Q(state__gte=Evaluation.State.APPROVED),
+    "evaluation_not_yet_started": Q(state__lte=Evaluation.State.APPROVED),
+    "in_evaluation": Q(state=Evaluation.State.IN_EVALUATION),
+    "evaluated": Q(state__gte=Evaluation.State.EVALUATED),
+    "no_review": ~_has_textanswers | (_has_unreviewed_textanswers & Q(state__lt=Evaluation.State.EVALUATED)),
+    "unreviewed_textanswers": _has_textanswers & _has_unreviewed_textanswers & Q(state__gte=Evaluation.State.EVALUATED),
+    "textanswers_reviewed": _has_textanswers & ~_has_unreviewed_textanswers,
+    "evaluation_not_finished": Q(state__lt=Evaluation.State.REVIEWED),
+    "results_published": Q(state=Evaluation.State.PUBLISHED),
+}
+
+
+def get_evaluation_name_ordering() -> list[str]:
+    """Orders evaluations by their full name in the current language"""
+    language = get_language() or "en"
+    return [f"course__name_{language}", f"name_{language}", "pk"]
+
+
+def filter_semester_evaluations(evaluations, params: QueryDict):
+    """Applies the search term, program and course type given in the parameters of the semester view"""
+    try:
+        if program_id := params.get("program"):
+            evaluations = evaluations.filter(course__programs=int(program_id))
+        if course_type_id := params.get("course_type"):
+            evaluations = evaluations.filter(course__type=int(course_type_id))
+    except ValueError as err:
+        raise SuspiciousOperation("Invalid program or course type") from err
+
+    for word in params.get("search", "").split():
+        evaluations = evaluations.filter(
+            Q(course__name_de__icontains=word)
+            | Q(course__name_en__icontains=word)
+            | Q(name_de__icontains=word)
+            | Q(name_en__icontains=word)
+            | Exists(UserProfile.objects.filter(courses_responsible_for=OuterRef("course"), last_name__icontains=word))
+        )
+    return evaluations
+
+
+def get_evaluations_after(evaluations, evaluation: Evaluation):
+    """Keyset pagination: the evaluations following the given one in the order of get_evaluation_name_ordering"""
+    course_name_field, name_field, __ = get_evaluation_name_ordering()
+    course_name = getattr(evaluation.course, course_name_field.removeprefix("course__"))
+    name = getattr(evaluation, name_field)
+    return evaluations.filter(
+        Q(**{f"{course_name_field}__gt": course_name})
+        | Q(**{course_name_field: course_name, f"{name_field}__gt": name})
+        | Q(**{course_name_field: course_name, name_field: name, "pk__gt": evaluation.pk})
+    )
+
+
+def check_semester_view_access(request: HttpRequest, semester_id: int) -> Semester:
     semester = get_object_or_404(Semester, id=semester_id)
     if semester.results_are_archived and not request.user.is_manager:
         raise PermissionDenied
+    return semester
+
+
+@reviewer_required
+def semester_view(request, semester_id) -> HttpResponse:
+    semester = check_semester_view_access(request, semester_id)
     rewards_active = is_semester_activated(semester)
 
-    evaluations = get_evaluations_with_prefetched_data(semester)
-    evaluations = sorted(evaluations, key=lambda cr: cr.full_name)
+    num_evaluations = semester.evaluations.count()
+    server_side_evaluations = num_evaluations > SEMESTER_VIEW_MAX_CLIENT_SIDE_EVALUATIONS
+    if server_side_evaluations:
+        # the evaluations are loaded page by page from semester_evaluations
+        evaluations = []
+    else:
+        evaluations = sorted(get_evaluations_with_prefetched_data(semester), key=lambda cr: cr.full_name)
     courses = Course.objects.filter(semester=semester).prefetch_related(
         "type", "programs", "responsibles", "evaluations", "ignored_evaluations", "cms_course_links"
     )
 
-    # semester statistics (per program)
-    @dataclass
-    class Stats:
-        # pylint: disable=too-many-instance-attributes
-        num_enrollments_in_evaluation: int = 0
-        num_votes: int = 0
-        num_evaluations_evaluated: int = 0
-        num_evaluations: int = 0
-        num_textanswers: int = 0
-        num_textanswers_reviewed: int = 0
-        first_start: datetime = datetime(9999, 1, 1)
-        last_end: date = date(2000, 1, 1)
-
-    program_stats: dict[Program, Stats] = defaultdict(Stats)
-    total_stats = Stats()
-    for evaluation in evaluations:
-        programs = evaluation.course.programs.all()
-        stats_objects = [program_stats[program] for program in programs]
-        stats_objects += [total_stats]
-        for stats in stats_objects:
-            if evaluation.state >= Evaluation.State.IN_EVALUATION:
-                stats.num_enrollments_in_evaluation += evaluation.num_participants
-                stats.num_votes += evaluation.num_voters
-                stats.num_textanswers += evaluation.num_textanswers
-                stats.num_textanswers_reviewed += evaluation.num_reviewed_textanswers
-            if evaluation.state >= Evaluation.State.EVALUATED:
-                stats.num_evaluations_evaluated += 1
-            if evaluation.state != Evaluation.State.NEW:
-                stats.num_evaluations += 1
-                stats.first_start = min(stats.first_start, evaluation.vote_start_datetime)
-                stats.last_end = max(stats.last_end, evaluation.vote_end_date)
-    program_stats = OrderedDict(sorted(program_stats.items(), key=lambda x: x[0].order))
-
-    program_stats_with_total = cast("dict[Program | str, Stats]", program_stats)
-    program_stats_with_total["total"] = total_stats
-
     template_data = {
         "semester": semester,
         "evaluations": evaluations,
         "Evaluation": Evaluation,
         "rewards_active": rewards_active,
-        "num_evaluations": len(evaluations),
-        "program_stats": program_stats_with_total,
+        "num_evaluations": num_evaluations,
+        "program_stats": get_semester_stats(semester),
         "courses": courses,
         "approval_states": [
             Evaluation.State.NEW,
@@ -263,10 +380,58 @@ def semester_view(request, semester_id) -> HttpResponse:
             Evaluation.State.EDITOR_APPROVED,
             Evaluation.State.APPROVED,
         ],
+        "server_side_evaluations": server_side_evaluations,
     }
+    if server_side_evaluations:
+        template_data["programs"] = Program.objects.filter(courses__semester=semester).distinct()
+        template_data["course_types"] = CourseType.objects.filter(courses__semester=semester).distinct()
     return render(request, "staff_semester_view.html", template_data)
 
 
+@reviewer_required
+def semester_evaluations(request, semester_id) -> JsonResponse:
+    """
+    A page of the evaluations of the semester view as rendered table rows, ordered by name.
+    The page following an evaluation is requested with its id as "after" parameter. The first page also contains the
+    number of evaluations matched by each filter button.
+    """
+    semester = check_semester_view_access(request, semester_id)
+
+    evaluations = filter_semester_evaluations(semester.evaluations.all(), request.GET)
+    data: dict[str, Any] = {}
+    if "after" not in request.GET:
+        data["counts"] = evaluations.aggregate(
+            **{name: Count("pk", filter=filter_q) for name, filter_q in SEMESTER_VIEW_FILTERS.items()}
+        )
+
+    for filter_name in request.GET.getlist("filter"):
+        if filter_name not in SEMESTER_VIEW_FILTERS:
+            raise SuspiciousOperation(f"Unknown filter: {filter_name}")
+        evaluations = evaluations.filter(SEMESTER_VIEW_FILTERS[filter_name])
+    if after := request.GET.get("after"):
+        if not after.isdigit():
+            raise SuspiciousOperation("Invalid evaluation id")
+        evaluations = get_evaluations_after(
+            evaluations, get_object_or_404(semester.evaluations.select_related("course"), pk=after)
+        )
+
+    ordering = get_evaluation_name_ordering()
+    page_ids = list(evaluations.order_by(*ordering).values_list("pk", flat=True)[: SEMESTER_VIEW_PAGE_SIZE + 1])
+    page = list(
+        get_evaluations_with_prefetched_data(semester)
+        .filter(pk__in=page_ids[:SEMESTER_VIEW_PAGE_SIZE])
+        .order_by(*ordering)
+    )
+
+    context = {"semester": semester, "evaluations": page}
+    data["rows"] = render_to_string("staff_semester_view_evaluation_rows.html", context, request=request)
+    data["exam_creation_forms"] = render_to_string(
+        "staff_semester_view_exam_creation_forms.html", context, request=request
+    )
+    data["next"] = page[-1].pk if len(page_ids) > SEMESTER_VIEW_PAGE_SIZE else None
+    return JsonResponse(data)
+
+
 class EvaluationOperation:
     email_template_name: str | None = None
     email_template_contributor_name: str | None = None
@@ -776,13 +941,19 @@ def semester_export(request, semester_id):
 @manager_required
 def semester_raw_export(_request, semester_id):
     semester = get_object_or_404(Semester, id=semester_id)
+    evaluations = list(
+        Evaluation.annotate_with_participant_and_voter_counts(
+            semester.evaluations.select_related("course__type").prefetch_related("course__programs")
+        ).annotate(textanswer_count=EvaluationCounters.counts()["textanswer_count"])
+    )
+    evaluations.sort(key=lambda evaluation: evaluation.full_name)
+    # the grade summaries and cached results are fetched for all evaluations at once
+    annotate_distributions_and_grades(
+        evaluation for evaluation in evaluations if evaluation.can_staff_see_average_grade
+    )
 
-    filename = f"Evaluation-{semester.name}-{get_language()}_raw.csv"
-    response = AttachmentResponse(filename, content_type="text/csv")
-
-    writer = csv.writer(response, delimiter=";", lineterminator="\n")
-    writer.writerow(
-        [
+    def rows():
+        yield [
             _("Name"),
             _("Programs"),
             _("Type"),
@@ -792,43 +963,58 @@ def semester_raw_export(_request, semester_id):
             _("#Text answers"),
             _("Average grade"),
         ]
-    )
-    for evaluation in sorted(semester.evaluations.all(), key=lambda cr: cr.full_name):
-        programs = ", ".join([program.name for program in evaluation.course.programs.all()])
-        avg_grade = ""
-        if evaluation.can_staff_see_average_grade:
-            distribution = calculate_average_distribution(evaluation)
-            if distribution is not None:
-                avg_grade = f"{distribution_to_grade(distribution):.1f}"
-        writer.writerow(
-            [
+        for evaluation in evaluations:
+            avg_grade = ""
+            if evaluation.can_staff_see_average_grade and evaluation.distribution is not None:
+                avg_grade = f"{evaluation.avg_grade:.1f}"
+            yield [
                 evaluation.full_name,
-                programs,
+                ", ".join(program.name for program in evaluation.course.programs.all()),
                 evaluation.course.type.name,
                 evaluation.state_str,
                 evaluation.num_voters,
                 evaluation.num_participants,
-                evaluation.textanswer_set.count(),
+                evaluation.textanswer_count,
                 avg_grade,
             ]
-        )
 
-    return response
+    return csv_attachment_response(f"Evaluation-{semester.name}-{get_language()}_raw.csv", rows())
 
 
 @manager_required
 def semester_participation_export(_request, semester_id):
     semester = get_object_or_404(Semester, id=semester_id)
+
+    def evaluation_count(through_model, **filters):
+        evaluations = through_model.objects.filter(
+            userprofile=OuterRef("pk"), evaluation__course__semester=semester, **filters
+        )
+        return Coalesce(
+            Subquery(evaluations.order_by().values("userprofile").annotate(count=Count("pk")).values("count")), 0
+        )
+
+    participations = Evaluation.participants.through
+    votes = Evaluation.voters.through
+    grantings = RewardPointGranting.objects.filter(semester=semester, user_profile=OuterRef("pk"))
     participants = (
-        UserProfile.objects.filter(evaluations_participating_in__course__semester=semester).distinct().order_by("email")
+        UserProfile.objects.filter(
+            Exists(participations.objects.filter(userprofile=OuterRef("pk"), evaluation__course__semester=semester))
+        )
+        .annotate(
+            number_of_required_evaluations=evaluation_count(participations, evaluation__is_rewarded=True),
+            number_of_required_evaluations_voted_for=evaluation_count(votes, evaluation__is_rewarded=True),
+            number_of_optional_evaluations=evaluation_count(participations, evaluation__is_rewarded=False),
+            number_of_optional_evaluations_voted_for=evaluation_count(votes, evaluation__is_rewarded=False),
+            earned_reward_points=Coalesce(
+                Subquery(grantings.order_by().values("user_profile").annotate(sum=Sum("value")).values("sum")), 0
+            ),
+        )
+        .only("email", "is_proxy_user")
+        .order_by("email")
     )
 
-    filename = f"Evaluation-{semester.name}-{get_language()}_participation.csv"
-    response = AttachmentResponse(filename, content_type="text/csv")
-
-    writer = csv.writer(response, delimiter=";", lineterminator="\n")
-    writer.writerow(
-        [
+    def rows():
+        yield [
             _("Email"),
             _("Can use reward points"),
             _("#Required evaluations voted for"),
@@ -837,68 +1023,49 @@ def semester_participation_export(_request, semester_id):
             _("#Optional evaluations"),
             _("Earned reward points"),
         ]
-    )
-    for participant in participants:
-        number_of_required_evaluations = semester.evaluations.filter(participants=participant, is_rewarded=True).count()
-        number_of_required_evaluations_voted_for = semester.evaluations.filter(
-            voters=participant, is_rewarded=True
-        ).count()
-        number_of_optional_evaluations = semester.evaluations.filter(
-            participants=participant, is_rewarded=False
-        ).count()
-        number_of_optional_evaluations_voted_for = semester.evaluations.filter(
-            voters=participant, is_rewarded=False
-        ).count()
-        query = RewardPointGranting.objects.filter(semester=semester, user_profile=participant).aggregate(Sum("value"))
-        earned_reward_points = query["value__sum"] or 0
-        writer.writerow(
-            [
+        for participant in participants.iterator(chunk_size=2000):
+            yield [
                 participant.email,
-                can_reward_points_be_used_by(participant),
-                number_of_required_evaluations_voted_for,
-                number_of_required_evaluations,
-                number_of_optional_evaluations_voted_for,
-                number_of_optional_evaluations,
-                earned_reward_points,
+                # all exported users are participants, see `can_reward_points_be_used_by`
+                not participant.is_external,
+                participant.number_of_required_evaluations_voted_for,
+                participant.number_of_required_evaluations,
+                participant.number_of_optional_evaluations_voted_for,
+                participant.number_of_optional_evaluations,
+                participant.earned_reward_points,
             ]
-        )
 
-    return response
+    return csv_attachment_response(f"Evaluation-{semester.name}-{get_language()}_participation.csv", rows())
 
 
 @manager_required
 def vote_timestamps_export(_request, semester_id):
     semester = get_object_or_404(Semester, id=semester_id)
-    timestamps = VoteTimestamp.objects.filter(evaluation__course__semester=semester).prefetch_related(
-        "evaluation__course__programs"
+    evaluation_columns = {
+        evaluation.id: [
+            evaluation.id,
+            evaluation.course.type.name,
+            ", ".join(program.name for program in evaluation.course.programs.all()),
+            evaluation.vote_end_date,
+        ]
+        for evaluation in semester.evaluations.select_related("course__type").prefetch_related("course__programs")
+    }
+    timestamps = VoteTimestamp.objects.filter(evaluation__course__semester=semester).values_list(
+        "evaluation_id", "timestamp"
     )
 
-    filename = f"Voting-Timestamps-{semester.name}.csv"
-    response = AttachmentResponse(filename, content_type="text/csv")
-
-    writer = csv.writer(response, delimiter=";", lineterminator="\n")
-    writer.writerow(
-        [
+    def rows():
+        yield [
             _("Evaluation id"),
             _("Course type"),
             _("Course programs"),
             _("Vote end date"),
             _("Timestamp"),
         ]
-    )
+        for evaluation_id, timestamp in timestamps.iterator(chunk_size=2000):
+            yield [*evaluation_columns[evaluation_id], timestamp]
 
-    for timestamp in timestamps:
-        writer.writerow(
-            [
-                timestamp.evaluation.id,
-                timestamp.evaluation.course.type.name,
-                ", ".join([program.name for program in timestamp.evaluation.course.programs.all()]),
-                timestamp.evaluation.vote_end_date,
-                timestamp.timestamp,
-            ]
-        )
-
-    return response
+    return csv_attachment_response(f"Voting-Timestamps-{semester.name}.csv", rows())
 
 
 @manager_required
@@ -978,9 +1145,14 @@ def semester_preparation_reminder(request: HttpRequest, semester_id: int) -> Htt
 
     if request.method == "POST":
         template = EmailTemplate.objects.get(name=EmailTemplate.EDITOR_REVIEW_REMINDER)
-        for responsible, evaluations, __ in responsible_list:
-            body_params = {"user": responsible, "evaluations": evaluations}
-            template.send_to_user(responsible, subject_params={}, body_params=body_params, use_cc=True, request=request)
+        template.send_to_users(
+            [
+                (responsible, {}, {"user": responsible, "evaluations": evaluations})
+                for responsible, evaluations, __ in responsible_list
+            ],
+            use_cc=True,
+            request=request,
+        )
         messages.success(request, _("Successfully sent reminders to everyone."))
         return HttpResponse()
     mode = request.GET.get("mode", "interactive")
@@ -1344,6 +1516,7 @@ def helper_evaluation_edit(request, evaluation):
         with temporary_receiver(RewardPointGranting.granted_by_participation_removal, notify_reward_points):
             evaluation_form.save()
             formset.save()
+            invalidate_live_results(evaluation)
 
             if operation == "approve":
                 evaluation.manager_approve()
@@ -1754,6 +1927,8 @@ def evaluation_textanswers_update_publish(request):
 
     answer.review_decision = review_decision_for_action[action]
     answer.save()
+    EvaluationCounters.update_for([evaluation])
+    invalidate_live_results(evaluation)
 
     if evaluation.state == Evaluation.State.EVALUATED and evaluation.is_fully_reviewed:
         evaluation.end_review()
@@ -1791,6 +1966,8 @@ def evaluation_textanswer_edit(request, textanswer_id):
     view = request.GET.get("next-view")
     if form.is_valid():
         form.save()
+        EvaluationCounters.update_for([evaluation])
+        invalidate_live_results(evaluation)
         # jump to edited answer
         url = reverse(
             "staff:evaluation_textanswers",
@@ -2349,15 +2526,15 @@ def user_list(request):
 
 
 @manager_required
-def user_export(request):
-    response = AttachmentResponse("exported_users.csv")
-    writer = csv.writer(response, delimiter=";", lineterminator="\n")
-    header_row = (_("Title"), _("Last name"), _("First name"), _("Email"))
-    writer.writerow(header_row)
-    writer.writerows(
-        (user.title, user.last_name, user.first_name, user.email) for user in UserProfile.objects.iterator()
-    )
-    return response
+def user_export(_request):
+    users = UserProfile.objects.only("title", "last_name", "first_name_given", "first_name_chosen", "email")
+
+    def rows():
+        yield (_("Title"), _("Last name"), _("First name"), _("Email"))
+        for user in users.iterator(chunk_size=2000):
+            yield (user.title, user.last_name, user.first_name, user.email)
+
+    return csv_attachment_response("exported_users.csv", rows())
 
 
 @manager_required
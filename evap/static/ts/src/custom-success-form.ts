@@ -28,7 +28,7 @@ const makeCustomSuccessForm = (form: HTMLFormElement) => {
     });
 };
 
-const makeReloadOnSuccessForm = (form: HTMLFormElement) => {
+export const makeReloadOnSuccessForm = (form: HTMLFormElement) => {
     overrideSuccessfulSubmit(form, () => window.location.reload());
 };
 
@@ -1,8 +1,10 @@
 import { CSRF_HEADERS } from "./csrf-utils.js";
+import { makeReloadOnSuccessForm } from "./custom-success-form.js";
 import { RangeSlider, Range } from "./slider.js";
 import { assert, selectOrError } from "./utils.js";
 
 declare const Sortable: typeof import("sortablejs");
+declare const bootstrap: typeof import("bootstrap");
 
 interface Row {
     element: HTMLElement;
@@ -287,6 +289,14 @@ export class TableGrid extends DataGrid {
     }
 }
 
+function createBadgePill(count: number): HTMLElement {
+    const badgeClass = count === 0 ? "badge-btn-zero" : "badge-btn";
+    const pill = document.createElement("span");
+    pill.classList.add("badge", "rounded-pill", badgeClass);
+    pill.textContent = count.toString();
+    return pill;
+}
+
 interface EvaluationGridParameters extends TableGridParameters {
     filterButtons: HTMLButtonElement[];
 }
@@ -305,7 +315,7 @@ export class EvaluationGrid extends TableGrid {
             const count = this.rows.filter(row =>
                 row.filterValues.get("evaluationState")!.includes(button.dataset.filter!),
             ).length;
-            button.append(EvaluationGrid.createBadgePill(count));
+            button.append(createBadgePill(count));
 
             button.addEventListener("click", () => {
                 if (button.classList.contains("active")) {
@@ -322,14 +332,6 @@ export class EvaluationGrid extends TableGrid {
         });
     }
 
-    private static createBadgePill(count: number): HTMLElement {
-        const badgeClass = count === 0 ? "badge-btn-zero" : "badge-btn";
-        const pill = document.createElement("span");
-        pill.classList.add("badge", "rounded-pill", badgeClass);
-        pill.textContent = count.toString();
-        return pill;
-    }
-
     protected fetchRowFilterValues(row: HTMLElement): Map<string, string[]> {
         const evaluationState = [...row.querySelectorAll<HTMLElement>("[data-filter]")].map(
             element => element.dataset.filter!,
@@ -351,6 +353,212 @@ export class EvaluationGrid extends TableGrid {
     }
 }
 
+interface RemoteEvaluationGridParameters extends BaseParameters {
+    url: string;
+    table: HTMLTableElement;
+    filterButtons: HTMLButtonElement[];
+    filterSelects: Map<string, HTMLSelectElement>;
+    loadMoreButton: HTMLButtonElement;
+    examCreationForms: HTMLElement;
+}
+
+interface RemoteState {
+    filter: string | null;
+    search: string;
+    selects: Map<string, string>;
+}
+
+interface EvaluationPage {
+    rows: string;
+    exam_creation_forms: string;
+    next: number | null;
+    counts?: Record<string, number>;
+}
+
+// Evaluation grid which lets the server filter its rows and loads them page by page, used for large semesters
+export class RemoteEvaluationGrid {
+    private readonly storageKey: string;
+    private readonly url: string;
+    private readonly container: HTMLElement;
+    private readonly searchInput: HTMLInputElement;
+    private readonly resetSearch?: HTMLButtonElement;
+    private readonly filterButtons: HTMLButtonElement[];
+    private readonly filterSelects: Map<string, HTMLSelectElement>;
+    private readonly loadMoreButton: HTMLButtonElement;
+    private readonly examCreationForms: HTMLElement;
+    private state: RemoteState;
+    private next: number | null = null;
+    private delayTimer: number | undefined;
+    // responses to outdated requests are ignored
+    private latestRequest = 0;
+
+    constructor({
+        storageKey,
+        url,
+        table,
+        searchInput,
+        resetSearch,
+        filterButtons,
+        filterSelects,
+        loadMoreButton,
+        examCreationForms,
+    }: RemoteEvaluationGridParameters) {
+        this.storageKey = storageKey;
+        this.url = url;
+        this.container = selectOrError("tbody", table);
+        this.searchInput = searchInput;
+        this.resetSearch = resetSearch;
+        this.filterButtons = filterButtons;
+        this.filterSelects = filterSelects;
+        this.loadMoreButton = loadMoreButton;
+        this.examCreationForms = examCreationForms;
+        this.state = this.restoreStateFromStorage();
+    }
+
+    public init() {
+        this.reflectStateOnInputs();
+        this.bindEvents();
+        this.reload();
+    }
+
+    private bindEvents() {
+        this.searchInput.addEventListener("input", () => {
+            clearTimeout(this.delayTimer);
+            this.delayTimer = setTimeout(() => {
+                this.state.search = this.searchInput.value;
+                this.reload();
+            }, 200);
+        });
+        this.searchInput.addEventListener("keypress", event => {
+            // after enter, unfocus the search input to collapse the screen keyboard
+            if (event.key === "enter") {
+                this.searchInput.blur();
+            }
+        });
+        this.resetSearch?.addEventListener("click", () => {
+            this.state.search = "";
+            this.searchInput.value = "";
+            this.reload();
+        });
+        this.filterButtons.forEach(button => {
+            button.addEventListener("click", () => {
+                const isActive = button.classList.contains("active");
+                this.state.filter = isActive ? null : button.dataset.filter!;
+                this.reflectStateOnInputs();
+                this.reload();
+            });
+        });
+        for (const [name, select] of this.filterSelects) {
+            select.addEventListener("change", () => {
+                this.state.selects.set(name, select.value);
+                this.reload();
+            });
+        }
+        this.loadMoreButton.addEventListener("click", () => {
+            if (this.next !== null) {
+                this.load(this.next);
+            }
+        });
+    }
+
+    private reload() {
+        this.container.replaceChildren();
+        this.examCreationForms.replaceChildren();
+        this.load(null);
+    }
+
+    private load(after: number | null) {
+        const params = new URLSearchParams();
+        if (this.state.search) {
+            params.set("search", this.state.search);
+        }
+        if (this.state.filter !== null) {
+            params.set("filter", this.state.filter);
+        }
+        for (const [name, value] of this.state.selects) {
+            if (value) {
+                params.set(name, value);
+            }
+        }
+        if (after !== null) {
+            params.set("after", after.toString());
+        }
+        this.saveStateToStorage();
+
+        const request = ++this.latestRequest;
+        this.loadMoreButton.disabled = true;
+        fetch(`${this.url}?${params.toString()}`)
+            .then(response => {
+                assert(response.ok);
+                return response.json() as Promise<EvaluationPage>;
+            })
+            .then(page => {
+                if (request === this.latestRequest) {
+                    this.renderPage(page);
+                }
+            })
+            .catch((error: unknown) => {
+                console.error(error);
+                window.alert(window.gettext("The server is not responding."));
+            });
+    }
+
+    private renderPage(page: EvaluationPage) {
+        const rows = document.createElement("template");
+        rows.innerHTML = page.rows;
+        rows.content.querySelectorAll<HTMLElement>('[data-bs-toggle="tooltip"]').forEach(element => {
+            new bootstrap.Tooltip(element, { html: true, trigger: "hover" });
+        });
+        this.container.append(rows.content);
+
+        const forms = document.createElement("template");
+        forms.innerHTML = page.exam_creation_forms;
+        forms.content.querySelectorAll<HTMLFormElement>("form[reload-on-success]").forEach(makeReloadOnSuccessForm);
+        this.examCreationForms.append(forms.content);
+
+        if (page.counts !== undefined) {
+            const counts = page.counts;
+            this.filterButtons.forEach(button => {
+                button.querySelector(".badge")?.remove();
+                button.append(createBadgePill(counts[button.dataset.filter!]));
+            });
+        }
+        this.next = page.next;
+        this.loadMoreButton.disabled = false;
+        this.loadMoreButton.classList.toggle("d-none", page.next === null);
+    }
+
+    private restoreStateFromStorage(): RemoteState {
+        const stored = JSON.parse(localStorage.getItem(this.storageKey)!) ?? {};
+        return {
+            filter: stored.filter ?? null,
+            search: stored.search ?? "",
+            selects: new Map(stored.selects),
+        };
+    }
+
+    private saveStateToStorage() {
+        const stored = {
+            filter: this.state.filter,
+            search: this.state.search,
+            selects: [...this.state.selects],
+        };
+        localStorage.setItem(this.storageKey, JSON.stringify(stored));
+    }
+
+    private reflectStateOnInputs() {
+        this.searchInput.value = this.state.search;
+        this.filterButtons.forEach(button => {
+            button.classList.toggle("active", button.dataset.filter === this.state.filter);
+        });
+        for (const [name, select] of this.filterSelects) {
+            select.value = this.state.selects.get(name) ?? "";
+            // forget stored values which are no longer available, e.g. programs without evaluations
+            this.state.selects.set(name, select.value);
+        }
+    }
+}
+
 interface QuestionnaireParameters extends TableGridParameters {
     updateUrl: string;
 }
@@ -0,0 +1,51 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from evap.evaluation.management.commands.tools import log_exceptions
+from evap.student.tools import get_vote_queue_metrics, process_queued_votes
+
+logger = logging.getLogger(__name__)
+
+
+@log_exceptions
+class Command(BaseCommand):
+    help = "Adds queued votes to the results, see settings.VOTE_INGESTION_QUEUE."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Number of votes processed at once.")
+        parser.add_argument(
+            "--worker",
+            action="store_true",
+            help="Keep running and process new votes as they are queued instead of stopping once the queue is empty.",
+        )
+        parser.add_argument("--interval", type=float, default=1, help="Seconds to wait for new votes as a worker.")
+        parser.add_argument("--stats", action="store_true", help="Only print the queue depth and lag.")
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            self.write_metrics()
+            return
+
+        while True:
+            num_processed = process_queued_votes(batch_size=options["batch_size"])
+            if num_processed:
+                metrics = get_vote_queue_metrics()
+                logger.info(
+                    "Processed %d queued votes, %d votes remaining (lag: %s).",
+                    num_processed,
+                    metrics.depth,
+                    metrics.lag,
+                )
+            elif options["worker"]:
+                time.sleep(options["interval"])
+            else:
+                break
+
+        self.write_metrics()
+
+    def write_metrics(self):
+        metrics = get_vote_queue_metrics()
+        lag = f"{metrics.lag.total_seconds():.0f} seconds" if metrics.lag is not None else "none"
+        self.stdout.write(f"Queue depth: {metrics.depth} votes for {metrics.num_evaluations} evaluations, lag: {lag}")
@@ -0,0 +1,31 @@
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("evaluation", "0164_remove_questionnaire_questionnaire_visibility_choices_and_more"),
+        ("student", "0001_text_answer_warnings"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QueuedVote",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("rating_answers", models.JSONField(default=list)),
+                ("text_answers", models.JSONField(default=list)),
+                ("queued_at", models.DateTimeField()),
+                (
+                    "evaluation",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="queued_votes",
+                        to="evaluation.evaluation",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -1,7 +1,10 @@
+import uuid
+
 from django.contrib.postgres.fields import ArrayField
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from evap.evaluation.models import Evaluation
 from evap.evaluation.tools import translate
 
 
@@ -21,3 +24,22 @@ class TextAnswerWarning(models.Model):
 
     class Meta:
         ordering = ["order"]
+
+
+class QueuedVote(models.Model):
+    """
+    The answers of a vote that have not yet been added to the results, see settings.VOTE_INGESTION_QUEUE.
+    Queued votes have random ids, but unlike stored answers they are not anonymous (see #1384): each one is inserted
+    in the same transaction as its voter, so its system columns and queue time link the complete ballot, including
+    text answers, to the voter until process_vote_queue has added it to the answer counters and deleted it. Anyone
+    who can read the database, or a dump taken meanwhile, can see this link. The anonymity of processed votes is the
+    same as without the queue, as the answers of all votes of an evaluation are updated whenever they are stored.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    evaluation = models.ForeignKey(Evaluation, models.CASCADE, related_name="queued_votes")
+    # list of (contribution id, assignment id, answer, count)
+    rating_answers = models.JSONField(default=list)
+    # list of (contribution id, assignment id, answer)
+    text_answers = models.JSONField(default=list)
+    queued_at = models.DateTimeField()
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+from model_bakery import baker
+
+from evap.evaluation.models import (
+    Evaluation,
+    QuestionAssignment,
+    Questionnaire,
+    QuestionType,
+    RatingAnswerCounter,
+    TextAnswer,
+)
+from evap.evaluation.tests.tools import TestCase
+from evap.student.models import QueuedVote
+from evap.student.tools import AnswerWriter
+
+
+class TestProcessVoteQueueCommand(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.evaluation = baker.make(Evaluation, state=Evaluation.State.IN_EVALUATION)
+        cls.contribution = cls.evaluation.general_contribution
+        questionnaire = baker.make(Questionnaire)
+        cls.rating_assignment = baker.make(
+            QuestionAssignment, questionnaire=questionnaire, question__type=QuestionType.POSITIVE_LIKERT
+        )
+        cls.text_assignment = baker.make(
+            QuestionAssignment, questionnaire=questionnaire, question__type=QuestionType.TEXT
+        )
+        cls.contribution.questionnaires.set([questionnaire])
+
+    def queue_vote(self, answer, text):
+        answer_writer = AnswerWriter()
+        answer_writer.add_rating_answer(self.contribution, self.rating_assignment, answer)
+        answer_writer.add_text_answer(self.contribution, self.text_assignment, text)
+        with transaction.atomic():
+            answer_writer.queue(self.evaluation)
+
+    def test_processes_queued_votes(self):
+        self.queue_vote(1, "first")
+        self.queue_vote(1, "second")
+        self.queue_vote(3, "third")
+
+        output = StringIO()
+        call_command("process_vote_queue", "--batch-size=2", stdout=output)
+
+        self.assertFalse(QueuedVote.objects.exists())
+        self.assertEqual(
+            set(RatingAnswerCounter.objects.values_list("assignment", "answer", "count")),
+            {(self.rating_assignment.pk, 1, 2), (self.rating_assignment.pk, 3, 1)},
+        )
+        self.assertEqual(
+            set(TextAnswer.objects.filter(contribution=self.contribution).values_list("answer", flat=True)),
+            {"first", "second", "third"},
+        )
+        self.assertEqual(output.getvalue(), "Queue depth: 0 votes for 0 evaluations, lag: none\n")
+
+    def test_queueing_is_a_single_insert(self):
+        self.queue_vote(1, "first")
+        QueuedVote.objects.update(queued_at=datetime.now() - timedelta(minutes=5))
+
+        answer_writer = AnswerWriter()
+        answer_writer.add_rating_answer(self.contribution, self.rating_assignment, 2)
+        with transaction.atomic(), self.assertNumQueries(1):
+            answer_writer.queue(self.evaluation)
+
+        output = StringIO()
+        call_command("process_vote_queue", "--stats", stdout=output)
+        self.assertEqual(QueuedVote.objects.count(), 2)
+        self.assertRegex(output.getvalue(), r"^Queue depth: 2 votes for 1 evaluations, lag: 30\d seconds\n$")
+
+    def test_ending_evaluation_processes_queued_votes(self):
+        self.queue_vote(4, "text")
+
+        self.evaluation.end_evaluation()
+        self.evaluation.save()
+
+        self.assertFalse(QueuedVote.objects.exists())
+        self.assertEqual(RatingAnswerCounter.objects.get(assignment=self.rating_assignment).answer, 4)
+        self.assertEqual(TextAnswer.objects.get(assignment=self.text_assignment).answer, "text")
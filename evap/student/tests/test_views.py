@@ -3,8 +3,9 @@ from fractions import Fraction
 from functools import partial
 from unittest.mock import patch
 
+from django.db import connection
 from django.test import RequestFactory
-from django.test.utils import override_settings
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.urls import reverse
 from model_bakery import baker
 
@@ -23,7 +24,8 @@ from evap.evaluation.models import (
     VoteTimestamp,
 )
 from evap.evaluation.tests.tools import FuzzyInt, WebTest, WebTestWith200Check
-from evap.student.tools import answer_field_id, parse_answer_field_id
+from evap.student.models import QueuedVote
+from evap.student.tools import answer_field_id, parse_answer_field_id, process_queued_votes
 from evap.student.views import SUCCESS_MAGIC_STRING, get_vote_page_form_groups
 
 
@@ -401,7 +403,7 @@ class TestVoteView(WebTest):
         field_id = partial(answer_field_id, self.contribution2, self.contributor_questionnaire)
         self.assertEqual(form[field_id(self.contributor_text_assignment.question)].value, "some more text")
 
-    def help_test_answer(self):
+    def help_test_answer(self, queued=False):
         page = self.app.get(self.url, user=self.voting_user1, status=200)
         form = page.forms["student-vote-form"]
         self.fill_form(form)
@@ -414,6 +416,15 @@ class TestVoteView(WebTest):
         response = form.submit()
         self.assertEqual(SUCCESS_MAGIC_STRING, response.body.decode())
 
+        if queued:
+            self.assertEqual(set(self.evaluation.voters.all()), {self.voting_user1, self.voting_user2})
+            self.assertEqual(self.evaluation.queued_votes.count(), 2)
+            self.assertFalse(RatingAnswerCounter.objects.exists())
+            self.assertFalse(TextAnswer.objects.exists())
+
+            self.assertEqual(process_queued_votes(batch_size=10), 2)
+            self.assertFalse(QueuedVote.objects.exists())
+
         self.assertEqual(len(TextAnswer.objects.all()), 12)
         self.assertEqual(len(RatingAnswerCounter.objects.all()), 6)
 
@@ -504,6 +515,10 @@ class TestVoteView(WebTest):
     def test_answer(self):
         self.help_test_answer()
 
+    @override_settings(VOTE_INGESTION_QUEUE=True)
+    def test_answer_queued(self):
+        self.help_test_answer(queued=True)
+
     def test_vote_timestamp(self):
         time_before = datetime.datetime.now()
         timestamps_before = VoteTimestamp.objects.count()
@@ -635,6 +650,37 @@ class TestVoteView(WebTest):
         text_answer_xmins = [row.xmin for row in query]
         self.assertTrue(all(xmin == text_answer_xmins[0] for xmin in text_answer_xmins))
 
+    def test_num_queries_is_independent_of_number_of_answers(self):
+        def submit_vote(user, additional_assignments, **form_data):
+            page = self.app.get(self.url, user=user)
+            form = page.forms["student-vote-form"]
+            self.fill_form(form)
+            for assignment in additional_assignments:
+                form[
+                    answer_field_id(
+                        self.evaluation.general_contribution, self.top_general_questionnaire, assignment.question
+                    )
+                ] = 3
+            for key, value in form_data.items():
+                form[key] = value
+            with CaptureQueriesContext(connection) as context:
+                form.submit()
+            return len(context)
+
+        num_queries = submit_vote(self.voting_user1, [], text_results_publish_confirmation_top=True)
+
+        additional_assignments = baker.make(
+            QuestionAssignment,
+            questionnaire=self.top_general_questionnaire,
+            order=iter(range(10, 20)),
+            question__type=QuestionType.POSITIVE_LIKERT,
+            _quantity=5,
+        )
+        self.assertEqual(submit_vote(self.voting_user2, additional_assignments), num_queries)
+        self.assertEqual(
+            RatingAnswerCounter.objects.filter(assignment__in=additional_assignments, answer=3, count=1).count(), 5
+        )
+
     def test_main_language_does_not_use_gettext_lazy(self):
         request = RequestFactory().get(reverse("student:vote", args=[self.evaluation.id]))
         request.user = self.voting_user1
@@ -1,4 +1,30 @@
-from evap.evaluation.models import Contribution, Question, Questionnaire
+import operator
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import reduce
+from typing import TYPE_CHECKING
+
+from django.db import transaction
+from django.db.models import Count, F, Min, Q
+
+from evap.evaluation.models import (
+    Contribution,
+    Evaluation,
+    EvaluationCounters,
+    Question,
+    QuestionAssignment,
+    Questionnaire,
+    RatingAnswerCounter,
+    TextAnswer,
+)
+from evap.evaluation.tools import inside_transaction
+from evap.results.tools import invalidate_live_results
+from evap.student.models import QueuedVote
+from evap.tools import unordered_groupby
+
+if TYPE_CHECKING:
+    from evap.results.tools import RatingAnswerDeltas
 
 
 def answer_field_id(
@@ -24,3 +50,129 @@ def parse_answer_field_id(formfield_id: str) -> tuple[int, int, int, bool]:
         return *map(int, parts[1:4]), True  # type: ignore[return-value]
     assert len(parts) == 4
     return *map(int, parts[1:4]), False  # type: ignore[return-value]
+
+
+class AnswerWriter:
+    """
+    Collects the answers of one or more votes and stores them with a constant number of queries: Rating answers are
+    aggregated in memory and added to their counters with atomic increments, text answers are inserted in bulk.
+    """
+
+    def __init__(self) -> None:
+        # (contribution id, assignment id, answer) -> number of answers
+        self.rating_answer_counts: Counter[tuple[int, int, int]] = Counter()
+        self.rating_answer_deltas: RatingAnswerDeltas = Counter()
+        self.text_answers: list[TextAnswer] = []
+
+    def add_rating_answer(self, contribution: Contribution, assignment: QuestionAssignment, answer: int) -> None:
+        self.rating_answer_counts[contribution.id, assignment.id, answer] += 1
+        self.rating_answer_deltas[
+            contribution.contributor_id, assignment.questionnaire_id, assignment.question_id, answer
+        ] += 1
+
+    def add_text_answer(self, contribution: Contribution, assignment: QuestionAssignment, answer: str) -> None:
+        self.text_answers.append(TextAnswer(contribution=contribution, assignment=assignment, answer=answer))
+
+    def add_queued_vote(self, queued_vote: QueuedVote) -> None:
+        for contribution_id, assignment_id, answer, count in queued_vote.rating_answers:
+            self.rating_answer_counts[contribution_id, assignment_id, answer] += count
+        self.text_answers.extend(
+            TextAnswer(contribution_id=contribution_id, assignment_id=assignment_id, answer=answer)
+            for contribution_id, assignment_id, answer in queued_vote.text_answers
+        )
+
+    def queue(self, evaluation: Evaluation) -> None:
+        """
+        Puts the answers into the vote queue instead of saving them, see settings.VOTE_INGESTION_QUEUE. This is a
+        single insert that doesn't touch other queued votes, see QueuedVote for what this means for anonymity.
+        """
+        assert inside_transaction()
+
+        QueuedVote.objects.create(
+            evaluation=evaluation,
+            rating_answers=[[*key, count] for key, count in self.rating_answer_counts.items()],
+            text_answers=[
+                [text_answer.contribution_id, text_answer.assignment_id, text_answer.answer]
+                for text_answer in self.text_answers
+            ],
+            queued_at=datetime.now(),
+        )
+
+    def save(self, evaluation: Evaluation) -> None:
+        assert inside_transaction()
+
+        if self.rating_answer_counts:
+            # make sure all counters exist, so that all of them can be incremented atomically afterwards
+            RatingAnswerCounter.objects.bulk_create(
+                [
+                    RatingAnswerCounter(contribution_id=contribution_id, assignment_id=assignment_id, answer=answer)
+                    for contribution_id, assignment_id, answer in self.rating_answer_counts
+                ],
+                ignore_conflicts=True,
+            )
+            counters_per_increment = unordered_groupby(
+                (increment, Q(contribution_id=contribution_id, assignment_id=assignment_id, answer=answer))
+                for (contribution_id, assignment_id, answer), increment in self.rating_answer_counts.items()
+            )
+            for increment, counter_filters in counters_per_increment.items():
+                RatingAnswerCounter.objects.filter(reduce(operator.or_, counter_filters)).update(
+                    count=F("count") + increment
+                )
+
+        if self.text_answers:
+            TextAnswer.objects.bulk_create(self.text_answers)
+            EvaluationCounters.update_for([evaluation])
+
+        # Update all answer rows to make sure no system columns give away which one was last modified
+        # see https://github.com/e-valuation/EvaP/issues/1384
+        RatingAnswerCounter.objects.filter(contribution__evaluation=evaluation).update(id=F("id"))
+        TextAnswer.objects.filter(contribution__evaluation=evaluation).update(id=F("id"))
+
+
+def process_queued_votes(*, batch_size: int, evaluation: Evaluation | None = None) -> int:
+    """
+    Adds up to batch_size queued votes to the results and returns the number of processed votes.
+    Concurrent calls process different votes. If an evaluation is given, votes of it that are being processed by a
+    concurrent call are waited for instead of skipped, so that all of its votes are stored once no more are returned.
+    """
+    with transaction.atomic():
+        queued_votes = QueuedVote.objects.select_for_update(skip_locked=evaluation is None).select_related("evaluation")
+        if evaluation is not None:
+            queued_votes = queued_votes.filter(evaluation=evaluation)
+        # random ids, so this doesn't reveal the order of the votes
+        queued_votes = list(queued_votes.order_by("id")[:batch_size])
+
+        evaluations = {}
+        answer_writers: defaultdict[int, AnswerWriter] = defaultdict(AnswerWriter)
+        for queued_vote in queued_votes:
+            evaluations[queued_vote.evaluation_id] = queued_vote.evaluation
+            answer_writers[queued_vote.evaluation_id].add_queued_vote(queued_vote)
+
+        # the answers are locked in a fixed order of the evaluations to prevent deadlocks between concurrent calls
+        for evaluation_id, answer_writer in sorted(answer_writers.items()):
+            answer_writer.save(evaluations[evaluation_id])
+
+        QueuedVote.objects.filter(pk__in=[queued_vote.pk for queued_vote in queued_votes]).delete()
+
+    for queued_evaluation in evaluations.values():
+        invalidate_live_results(queued_evaluation)
+
+    return len(queued_votes)
+
+
+@dataclass
+class VoteQueueMetrics:
+    depth: int
+    num_evaluations: int
+    lag: timedelta | None  # time since the oldest queued vote was queued
+
+
+def get_vote_queue_metrics() -> VoteQueueMetrics:
+    metrics = QueuedVote.objects.aggregate(
+        depth=Count("pk"), num_evaluations=Count("evaluation", distinct=True), oldest=Min("queued_at")
+    )
+    return VoteQueueMetrics(
+        depth=metrics["depth"],
+        num_evaluations=metrics["num_evaluations"],
+        lag=datetime.now() - metrics["oldest"] if metrics["oldest"] is not None else None,
+    )
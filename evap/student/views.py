@@ -23,20 +23,20 @@ from evap.evaluation.models import (
     Contribution,
     Evaluation,
     Questionnaire,
-    RatingAnswerCounter,
     Semester,
-    TextAnswer,
     VoteTimestamp,
 )
 from evap.evaluation.tools import translate
 from evap.results.tools import (
     annotate_distributions_and_grades,
     get_evaluations_with_course_result_attributes,
+    get_live_results_version,
     textanswers_visible_to,
+    update_live_results,
 )
 from evap.student.forms import QuestionnaireVotingForm
 from evap.student.models import TextAnswerWarning
-from evap.student.tools import answer_field_id
+from evap.student.tools import AnswerWriter, answer_field_id
 
 SUCCESS_MAGIC_STRING = "vote submitted successfully"
 
@@ -263,7 +263,9 @@ def create_voting_forms(
 def get_vote_page_form_groups(
     request, evaluation: Evaluation, *, preview: bool, dropout: bool
 ) -> OrderedDict[Contribution, list[QuestionnaireVotingForm]]:
-    contributions_to_vote_on = evaluation.contributions.all()
+    contributions_to_vote_on = evaluation.contributions.prefetch_related(
+        "questionnaires__question_assignments__question"
+    )
     # prevent a user from voting on themselves
     if not preview:
         contributions_to_vote_on = contributions_to_vote_on.exclude(contributor=request.user)
@@ -271,7 +273,7 @@ def get_vote_page_form_groups(
     form_groups = OrderedDict()
     for contribution in contributions_to_vote_on:
         questionnaires = contribution.questionnaires.all()
-        if not questionnaires.exists():
+        if not questionnaires:
             continue
         form_groups[contribution] = create_voting_forms(request, contribution, questionnaires, dropout=dropout)
 
@@ -369,6 +371,31 @@ def vote(request: HttpRequest, evaluation_id: int, dropout: bool = False) -> Htt
     if not all(form.is_valid() for form_group in form_groups.values() for form in form_group):
         return render_vote_page(request, evaluation, preview=False, dropout=dropout)
 
+    answer_writer = AnswerWriter()
+    for contribution, form_group in form_groups.items():
+        for questionnaire_form in form_group:
+            questionnaire = questionnaire_form.questionnaire
+            for assignment in questionnaire.question_assignments.all():
+                question = assignment.question
+                if question.is_heading_question:
+                    continue
+
+                value = questionnaire_form.cleaned_data.get(answer_field_id(contribution, questionnaire, question))
+
+                if question.is_text_question:
+                    if value:
+                        answer_writer.add_text_answer(contribution, assignment, value)
+                else:
+                    if value != NO_ANSWER:
+                        answer_writer.add_rating_answer(contribution, assignment, value)
+                    if question.allows_additional_textanswers:
+                        textanswer_identifier = answer_field_id(
+                            contribution, questionnaire, question, additional_textanswer=True
+                        )
+                        textanswer_value = questionnaire_form.cleaned_data.get(textanswer_identifier)
+                        if textanswer_value:
+                            answer_writer.add_text_answer(contribution, assignment, textanswer_value)
+
     # all forms are valid, begin vote operation
     with transaction.atomic():
         # add user to evaluation.voters
@@ -378,44 +405,16 @@ def vote(request: HttpRequest, evaluation_id: int, dropout: bool = False) -> Htt
         if dropout:
             Evaluation.objects.filter(pk=evaluation.pk).update(dropout_count=F("dropout_count") + 1)
 
-        for contribution, form_group in form_groups.items():
-            for questionnaire_form in form_group:
-                questionnaire = questionnaire_form.questionnaire
-                for assignment in questionnaire.question_assignments.all().prefetch_related("question"):
-                    question = assignment.question
-                    if question.is_heading_question:
-                        continue
-
-                    value = questionnaire_form.cleaned_data.get(answer_field_id(contribution, questionnaire, question))
-
-                    if question.is_text_question:
-                        if value:
-                            question.answer_class.objects.create(
-                                contribution=contribution, assignment=assignment, answer=value
-                            )
-                    else:
-                        if value != NO_ANSWER:
-                            answer_counter, __ = question.answer_class.objects.get_or_create(
-                                contribution=contribution, assignment=assignment, answer=value
-                            )
-                            answer_counter.count += 1
-                            answer_counter.save()
-                        if question.allows_additional_textanswers:
-                            textanswer_identifier = answer_field_id(
-                                contribution, questionnaire, question, additional_textanswer=True
-                            )
-                            textanswer_value = questionnaire_form.cleaned_data.get(textanswer_identifier)
-                            if textanswer_value:
-                                TextAnswer.objects.create(
-                                    contribution=contribution, assignment=assignment, answer=textanswer_value
-                                )
+        if settings.VOTE_INGESTION_QUEUE:
+            answer_writer.queue(evaluation)
+        else:
+            answer_writer.save(evaluation)
 
         VoteTimestamp.objects.create(evaluation=evaluation)
 
-        # Update all answer rows to make sure no system columns give away which one was last modified
-        # see https://github.com/e-valuation/EvaP/issues/1384
-        RatingAnswerCounter.objects.filter(contribution__evaluation=evaluation).update(id=F("id"))
-        TextAnswer.objects.filter(contribution__evaluation=evaluation).update(id=F("id"))
+        if not settings.VOTE_INGESTION_QUEUE:
+            # counts the committed votes and this vote, see update_live_results
+            num_voters, num_queued_votes = get_live_results_version(evaluation)
 
     if not evaluation.can_publish_text_results:
         # enable text result publishing if first user confirmed that publishing is okay or second user voted
@@ -425,6 +424,10 @@ def vote(request: HttpRequest, evaluation_id: int, dropout: bool = False) -> Htt
             or evaluation.voters.count() >= 2
         ):
             Evaluation.objects.filter(pk=evaluation.pk).update(can_publish_text_results=True)
+            evaluation.can_publish_text_results = True
+
+    if not settings.VOTE_INGESTION_QUEUE:
+        update_live_results(evaluation, num_voters, num_queued_votes, answer_writer.rating_answer_deltas)
 
     evaluation.evaluation_evaluated.send(sender=Evaluation, request=request, semester=evaluation.course.semester)
 